@@ -1,7 +1,9 @@
 import unittest
 import json
 import io
+import random
 from check_bounding_boxes import get_bounding_box_messages
+from rect_sweep_test import rects_overlap
 
 
 # Currently this is not run automatically in CI; it's just for documentation and manual checking.
@@ -221,6 +223,36 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_many_fields_report_every_intersection(self):
+        """Test that fields spread over pages report intersections in field order"""
+        rng = random.Random(7)
+        fields = []
+        for i in range(60):
+            x, y = rng.randint(0, 500), rng.randint(0, 700)
+            fields.append({
+                "description": f"Field {i}",
+                "page_number": rng.randint(1, 3),
+                "label_bounding_box": [x, y, x + 40, y + 20],
+                "entry_bounding_box": [x + 40, y, x + 200, y + 20]
+            })
+        rects = []
+        for f in fields:
+            rects.append((f["label_bounding_box"], f))
+            rects.append((f["entry_bounding_box"], f))
+        expected = []
+        for i, (r1, f1) in enumerate(rects):
+            for r2, f2 in rects[i + 1:]:
+                if f1["page_number"] == f2["page_number"] and rects_overlap(r1, r2, 0):
+                    expected.append((f1["description"], f2["description"]))
+
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream)
+        failures = [msg for msg in messages if "FAILURE" in msg]
+        self.assertEqual(len(failures), min(len(expected), 19))
+        for msg, (first, second) in zip(failures, expected):
+            self.assertIn(f"`{first}`", msg)
+            self.assertIn(f"`{second}`", msg)
+
 
 if __name__ == '__main__':
     unittest.main()
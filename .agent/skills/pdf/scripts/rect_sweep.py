@@ -0,0 +1,40 @@
+import bisect
+import heapq
+import math
+
+
+# Sweep-line search for intersecting rectangles, shared by check_bounding_boxes.py
+# and the pptx skill's inventory.py, which imports it from here.
+
+
+# Returns index pairs (i, j), i < j, of [x0, y0, x1, y1] rects that may intersect: a
+# superset (by a rounding margin) of the pairs overlapping by more than `tolerance` on
+# both axes. Sweeps the rects left to right; the rects still reaching the sweep line are
+# grouped by height class (powers of two) and sorted by top, so each rect is only
+# compared with those within vertical reach instead of with every other rect.
+def find_intersection_candidates(rects, tolerance=0):
+    slack = 1e-9
+    order = sorted(range(len(rects)), key=lambda i: rects[i][0])
+    # Height class -> sorted [(top, index)] of active rects
+    active = {}
+    # (right, index, height class) of active rects, by right edge
+    rights = []
+    pairs = []
+    for j in order:
+        left, top, right, bottom = rects[j]
+        # Rects ending before this one starts can't intersect a later one either
+        while rights and rights[0][0] - left <= tolerance - slack:
+            _, i, height_class = heapq.heappop(rights)
+            tops = active[height_class]
+            del tops[bisect.bisect_left(tops, (rects[i][1], i))]
+        for height_class, tops in active.items():
+            reach = 0.0 if height_class is None else math.ldexp(1.0, height_class)
+            start = bisect.bisect_left(tops, (top + tolerance - reach - slack,))
+            stop = bisect.bisect_left(tops, (bottom - tolerance + slack,))
+            for _, i in tops[start:stop]:
+                pairs.append((i, j) if i < j else (j, i))
+        height = bottom - top
+        height_class = math.frexp(height)[1] if height > 0 else None
+        bisect.insort(active.setdefault(height_class, []), (top, j))
+        heapq.heappush(rights, (right, j, height_class))
+    return pairs
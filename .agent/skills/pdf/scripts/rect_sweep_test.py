@@ -0,0 +1,59 @@
+import unittest
+import random
+from rect_sweep import find_intersection_candidates
+
+
+def rects_overlap(r1, r2, tolerance):
+    """Brute-force reference: overlap by more than tolerance on both axes"""
+    overlap_x = min(r1[2], r2[2]) - max(r1[0], r2[0])
+    overlap_y = min(r1[3], r2[3]) - max(r1[1], r2[1])
+    return overlap_x > tolerance and overlap_y > tolerance
+
+
+class TestFindIntersectionCandidates(unittest.TestCase):
+
+    def random_rects(self, rng, count, integer):
+        rects = []
+        for _ in range(count):
+            # Mix of tiny, ordinary and very tall or wide rects, some degenerate
+            width = rng.choice([0, 1, 5, 20, 100, 600]) * rng.random()
+            height = rng.choice([0, 1, 5, 20, 100, 600]) * rng.random()
+            x, y = rng.uniform(0, 600), rng.uniform(0, 800)
+            rect = [x, y, x + width, y + height]
+            rects.append([round(v) for v in rect] if integer else rect)
+        return rects
+
+    def assert_matches_brute_force(self, rects, tolerance):
+        candidates = find_intersection_candidates(rects, tolerance)
+        self.assertEqual(len(candidates), len(set(candidates)))
+        self.assertTrue(all(i < j for i, j in candidates))
+        found = {(i, j) for i, j in candidates if rects_overlap(rects[i], rects[j], tolerance)}
+        expected = {
+            (i, j)
+            for i in range(len(rects))
+            for j in range(i + 1, len(rects))
+            if rects_overlap(rects[i], rects[j], tolerance)
+        }
+        self.assertEqual(found, expected)
+
+    def test_sweep_matches_brute_force(self):
+        """Test that the sweep finds exactly the pairs that comparing all pairs finds"""
+        rng = random.Random(1)
+        for trial in range(200):
+            with self.subTest(trial=trial):
+                rects = self.random_rects(rng, rng.randint(0, 60), integer=trial % 2 == 0)
+                self.assert_matches_brute_force(rects, rng.choice([0, 0, 0.05, 2]))
+
+    def test_touching_and_identical_rects(self):
+        """Test rects sharing edges, corners and coordinates"""
+        rects = [[0, 0, 10, 10], [10, 0, 20, 10], [0, 10, 10, 20], [10, 10, 20, 20],
+                 [0, 0, 10, 10], [5, 5, 5, 5], [5, 0, 15, 20], [0, 0, 0, 30]]
+        self.assert_matches_brute_force(rects, 0)
+
+    def test_empty_and_single(self):
+        self.assertEqual(find_intersection_candidates([]), [])
+        self.assertEqual(find_intersection_candidates([[0, 0, 1, 1]]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tool to validate and pack many unpacked Office documents in one process.
+
+Running validate.py and pack.py once per document pays interpreter startup,
+imports and schema compilation every time. This tool reads a manifest of jobs
+and runs them all with a pool of worker processes, each of which compiles a
+schema once and reuses it for every document it handles.
+
+The manifest is a JSON array (or, for a .jsonl file, one object per line) of
+jobs:
+    {"unpacked_dir": <dir>, "original": <file>, "output": <file>}
+"output" may be omitted to only validate. "unpacked_dir" may also be a packaged
+Office file, validated in place, but only in jobs without "output", since
+packing needs an unpacked directory. A job whose validation fails is not
+packed. One JSON result per job is written, in manifest order:
+    {"job": <index>, "unpacked_dir": ..., "original": ..., "output": ...,
+     "status": "passed" | "failed" | "error", "valid": <bool>,
+     "packed": <bool>, "messages": [<output lines>], "seconds": <float>}
+
+Example usage:
+    python batch.py <manifest.json> [--results <results.jsonl>] [--jobs N]
+        [--schema-cache <cache_dir>] [--baseline-cache <cache_dir>]
+        [--incremental] [--fast-xsd] [--force]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from pack import pack_document
+from validate import run_validators, validators_for
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate and pack a manifest of Office documents"
+    )
+    parser.add_argument("manifest", help="JSON or JSON Lines manifest of jobs")
+    parser.add_argument(
+        "--results",
+        metavar="FILE",
+        help="Write per-job JSON results to FILE instead of standard output",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run jobs in N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose validator output in the results",
+    )
+    parser.add_argument(
+        "--schema-cache",
+        metavar="DIR",
+        help="Directory for cached XSD results, reused across runs",
+    )
+    parser.add_argument(
+        "--baseline-cache",
+        metavar="DIR",
+        help="Directory for cached results about original files (their XSD "
+        "errors, paragraph counts and text fingerprints), reused across runs",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse results for unchanged parts from each job's .validation.json",
+    )
+    parser.add_argument(
+        "--fast-xsd",
+        action="store_true",
+        help="Confirm parts with precompiled structural models before full XSD",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Skip validating packed files with soffice",
+    )
+    args = parser.parse_args()
+
+    try:
+        jobs = read_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+
+    run = partial(
+        run_job,
+        verbose=args.verbose,
+        schema_cache_dir=args.schema_cache,
+        baseline_cache_dir=args.baseline_cache,
+        incremental=args.incremental,
+        fast_xsd=args.fast_xsd,
+        soffice_check=not args.force,
+    )
+    counts = {"passed": 0, "failed": 0, "error": 0}
+    with open(args.results, "w") if args.results else contextlib.nullcontext(
+        sys.stdout
+    ) as output:
+        for result in run_jobs(run, jobs, args.jobs):
+            counts[result["status"]] += 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+
+    print(
+        f"{len(jobs)} job(s): {counts['passed']} passed, {counts['failed']} failed, "
+        f"{counts['error']} error(s)",
+        file=sys.stderr,
+    )
+    sys.exit(0 if counts["passed"] == len(jobs) else 1)
+
+
+def read_manifest(manifest):
+    """Read and check the jobs of a manifest.
+
+    Returns:
+        list: Job dicts with "unpacked_dir", "original" and optional "output"
+
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    manifest = Path(manifest)
+    text = manifest.read_text(encoding="utf-8")
+    if manifest.suffix.lower() == ".jsonl":
+        jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        jobs = json.loads(text)
+    if not isinstance(jobs, list):
+        raise ValueError(f"{manifest} must contain a list of jobs")
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict) or not {"unpacked_dir", "original"} <= set(job):
+            raise ValueError(
+                f"Job {index} in {manifest} needs 'unpacked_dir' and 'original'"
+            )
+        if job.get("output") and Path(job["unpacked_dir"]).is_file():
+            raise ValueError(
+                f"Job {index} in {manifest} packs to 'output', so its "
+                "'unpacked_dir' must be a directory, not a packaged file"
+            )
+    return jobs
+
+
+def run_jobs(run, jobs, workers=1):
+    """Yield the result of each job in order, running them in worker processes.
+
+    Workers live for the whole batch, so the schemas and structural models
+    they load stay compiled for every later job.
+    """
+    indexed = list(enumerate(jobs))
+    if workers <= 1 or len(jobs) < 2:
+        for item in indexed:
+            yield run(item)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+        yield from executor.map(run, indexed)
+
+
+def run_job(
+    item,
+    verbose=False,
+    schema_cache_dir=None,
+    baseline_cache_dir=None,
+    incremental=False,
+    fast_xsd=False,
+    soffice_check=True,
+):
+    """Validate one document and, if it passes, pack it.
+
+    Args:
+        item: (index, job) pair from the manifest
+
+    Returns:
+        dict: The job's JSON result
+    """
+    index, job = item
+    result = {
+        "job": index,
+        "unpacked_dir": job["unpacked_dir"],
+        "original": job["original"],
+        "output": job.get("output"),
+        "status": "error",
+        "valid": False,
+        "packed": False,
+        "messages": [],
+        "seconds": 0.0,
+    }
+    start = time.perf_counter()
+    messages = io.StringIO()
+    try:
+        # Validators and pack_document report on stdout and stderr
+        with contextlib.redirect_stdout(messages), contextlib.redirect_stderr(messages):
+            unpacked_dir = Path(job["unpacked_dir"])
+            original_file = Path(job["original"])
+            if not (unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir)):
+                raise ValueError(f"{unpacked_dir} is not a directory or an Office file")
+            if not original_file.is_file():
+                raise ValueError(f"{original_file} is not a file")
+            validators = validators_for(original_file.suffix.lower())
+            if not validators:
+                raise ValueError(f"Validation not supported for {original_file}")
+
+            result["valid"] = run_validators(
+                validators,
+                unpacked_dir,
+                original_file,
+                verbose=verbose,
+                schema_cache_dir=schema_cache_dir,
+                baseline_cache_dir=baseline_cache_dir,
+                incremental=incremental,
+                fast_xsd=fast_xsd,
+            )
+            if result["valid"] and result["output"]:
+                result["packed"] = pack_document(
+                    unpacked_dir, result["output"], validate=soffice_check
+                )
+        ok = result["valid"] and (result["packed"] or not result["output"])
+        result["status"] = "passed" if ok else "failed"
+    except Exception as e:
+        messages.write(f"Error: {e}\n")
+    result["messages"] = messages.getvalue().splitlines()
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tool to precompile the structural models used by validate.py --fast-xsd.
+
+Each schema that parts are validated against is compiled into a gzipped JSON
+model under schemas/compiled/, mirroring the schema's path. Models record the
+digest of every schema they were built from, so a stale model is ignored (and
+compiled on the fly) until this tool is run again.
+
+Example usage:
+    python compile_schemas.py [--output <dir>]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+
+from validation import BaseSchemaValidator, compile_schema
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompile structural models of the OOXML schemas"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="DIR",
+        help="Directory for the compiled models (default: schemas/compiled)",
+    )
+    args = parser.parse_args()
+
+    schemas_dir = Path(__file__).parent.parent / "schemas"
+    output_dir = Path(args.output) if args.output else schemas_dir / "compiled"
+
+    try:
+        for schema in sorted(set(BaseSchemaValidator.SCHEMA_MAPPINGS.values())):
+            output_file = compile_schema_file(
+                schemas_dir / schema, output_dir / Path(schema).with_suffix(".json.gz")
+            )
+            print(f"Compiled {schema} -> {output_file}")
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+
+
+def compile_schema_file(schema_path, output_file):
+    """Compile a schema and write its structural model as gzipped JSON.
+
+    The output is byte-for-byte reproducible, so regenerated models only show
+    up as changed when the schemas did.
+
+    Args:
+        schema_path: Path to the root schema (e.g. pml.xsd)
+        output_file: Path of the .json.gz model to write
+
+    Returns:
+        Path: The written model file
+    """
+    output_file = Path(output_file)
+    model = compile_schema(schema_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(model, sort_keys=True, separators=(",", ":"))
+    with open(output_file, "wb") as f:
+        # mtime=0 and no file name keep the gzip header deterministic
+        with gzip.GzipFile(filename="", mode="wb", fileobj=f, mtime=0) as gz:
+            gz.write(content.encode("utf-8"))
+    return output_file
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,62 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N]
 """
 
 import argparse
-import shutil
+import io
+import os
+import re
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import defusedxml.sax
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from xml.sax.handler import ContentHandler, property_lexical_handler
+from xml.sax.saxutils import escape
+
+import soffice_service
+from unpack import complete_lazy_unpack
+
+# Characters escaped in attribute values, besides &, < and >, so the parser
+# reading the packed file sees exactly the same value
+ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#9;"}
+
+# Media formats that are compressed already; deflating them again only
+# costs time, so they are stored as they are
+PRECOMPRESSED_SUFFIXES = {
+    # Images
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".wdp",
+    # Audio and video
+    ".mp3",
+    ".m4a",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wma",
+    ".wmv",
+    # Fonts
+    ".woff",
+    ".woff2",
+    # Embedded packages
+    ".zip",
+    ".docx",
+    ".pptx",
+    ".xlsx",
+}
+
+# standalone pseudo-attribute of a part's XML declaration
+STANDALONE_PATTERN = re.compile(
+    rb"^\s*<\?xml[^>]*?\sstandalone\s*=\s*[\"'](yes|no)[\"']"
+)
 
 
 def main():
@@ -21,11 +66,22 @@ def main():
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Condense XML parts with N worker processes (default: 1)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +98,18 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, jobs=1):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    Each file is read once and written straight into the archive, in a
+    deterministic order: [Content_Types].xml first, then by path. Parts a
+    lazy unpack (unpack.py --lazy) left out are materialised first.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of worker processes condensing XML parts (default: 1)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +122,82 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    completed = complete_lazy_unpack(input_dir, jobs)
+    if completed:
+        print(f"Materialised {len(completed)} parts left out by a lazy unpack")
+
+    parts = sorted(
+        (
+            (f.relative_to(input_dir).as_posix(), f)
+            for f in input_dir.rglob("*")
+            if f.is_file()
+        ),
+        key=lambda part: (part[0] != "[Content_Types].xml", part[0]),
+    )
+    xml_files = [f for _, f in parts if _is_xml_part(f)]
+
+    # Create final Office file as zip archive. XML parts are condensed into
+    # their zip entries, so the input is never modified or copied.
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        with _condensed_parts(xml_files, jobs) as condensed:
+            for arcname, f in parts:
+                if not _is_xml_part(f):
+                    compress_type = (
+                        zipfile.ZIP_STORED
+                        if f.suffix.lower() in PRECOMPRESSED_SUFFIXES
+                        else zipfile.ZIP_DEFLATED
+                    )
+                    zf.write(f, arcname, compress_type=compress_type)
+                    continue
+
+                # Remove pretty-printing whitespace
+                info = zipfile.ZipInfo.from_file(f, arcname)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                if condensed is None:
+                    with zf.open(info, "w") as entry:
+                        condense_xml(f, entry)
+                else:
+                    zf.writestr(info, next(condensed))
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
+def _is_xml_part(path):
+    return path.name.endswith((".xml", ".rels"))
+
+
+@contextmanager
+def _condensed_parts(xml_files, jobs):
+    """Condense XML parts in worker processes, yielding their bytes in order.
+
+    With a single job the context value is None and callers condense each
+    part straight into its zip entry instead.
+    """
+    if jobs <= 1 or len(xml_files) < 2:
+        yield None
+        return
+    workers = min(jobs, len(xml_files))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield executor.map(
+            _condense_to_bytes,
+            xml_files,
+            chunksize=max(1, len(xml_files) // (workers * 4)),
+        )
+
+
+def _condense_to_bytes(xml_file):
+    output = io.BytesIO()
+    condense_xml(xml_file, output)
+    return output.getvalue()
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -99,6 +210,21 @@ def validate_document(doc_path):
             filter_name = "html:HTML (StarCalc)"
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        # A running soffice_service.py converts without a cold start
+        reply = soffice_service.submit(
+            {
+                "type": "convert",
+                "input": str(doc_path.absolute()),
+                "output_dir": temp_dir,
+                "convert_to": filter_name,
+            },
+            timeout=10,
+        )
+        if reply is not None:
+            if not reply["ok"]:
+                print(f"Validation error: {reply['error']}", file=sys.stderr)
+            return reply["ok"]
+
         try:
             result = subprocess.run(
                 [
@@ -130,29 +256,134 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+def condense_xml(xml_file, output=None):
+    """Strip unnecessary whitespace and remove comments.
+
+    The part is parsed and rewritten in a single streaming pass, so time and
+    memory stay linear in its size. Whitespace-only text and comments are
+    removed from every element except those ending in ':t', whose text is
+    content. The XML declaration is rewritten as UTF-8, keeping 'standalone'.
+
+    Args:
+        xml_file: Path to the XML file
+        output: Binary file object to write the condensed XML to; by default
+            xml_file is rewritten in place
+    """
+    xml_file = Path(xml_file)
+    if output is None:
+        fd, temp_name = tempfile.mkstemp(dir=xml_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                condense_xml(xml_file, f)
+            os.replace(temp_name, xml_file)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        return
+
+    with open(xml_file, "rb") as f:
+        match = STANDALONE_PATTERN.match(f.read(256))
+    declaration = '<?xml version="1.0" encoding="UTF-8"'
+    if match:
+        declaration += f' standalone="{match.group(1).decode()}"'
+    output.write(declaration.encode() + b"?>")
+
+    writer = _CondensingWriter(output)
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(writer)
+    parser.setProperty(property_lexical_handler, writer)
+    parser.parse(str(xml_file))
+    writer.flush()
+
+
+class _CondensingWriter(ContentHandler):
+    """SAX handler writing condensed XML, with prefixes exactly as in the source."""
+
+    def __init__(self, output):
+        super().__init__()
+        self.output = output
+        self.pieces = []
+        self.text = []
+        self.open_elements = []  # qualified names, innermost last
+        self.start_tag_open = False  # '<name attrs' written, '>' still pending
+
+    def write(self, piece):
+        self.pieces.append(piece)
+        if len(self.pieces) >= 4096:
+            self.flush()
+
+    def flush(self):
+        self.output.write("".join(self.pieces).encode("utf-8"))
+        self.pieces = []
+
+    def close_start_tag(self):
+        if self.start_tag_open:
+            self.write(">")
+            self.start_tag_open = False
+
+    def keeps_markup(self):
+        # Direct children of *:t elements are content and are left alone
+        return self.open_elements and self.open_elements[-1].endswith(":t")
+
+    def end_text(self):
+        """Write or drop the text run that just ended at a node boundary."""
+        if not self.text:
+            return
+        text = "".join(self.text)
+        self.text = []
+        if text.strip() == "" and not self.keeps_markup():
+            return
+        self.close_start_tag()
+        self.write(escape(text))
+
+    def startElement(self, name, attrs):
+        self.end_text()
+        self.close_start_tag()
+        self.write(f"<{name}")
+        for attr, value in attrs.items():
+            self.write(f' {attr}="{escape(value, ATTRIBUTE_ENTITIES)}"')
+        self.start_tag_open = True
+        self.open_elements.append(name)
+
+    def endElement(self, name):
+        self.end_text()
+        if self.start_tag_open:
+            self.write("/>")
+            self.start_tag_open = False
+        else:
+            self.write(f"</{name}>")
+        self.open_elements.pop()
+
+    def characters(self, content):
+        self.text.append(content)
+
+    def ignorableWhitespace(self, whitespace):
+        self.text.append(whitespace)
+
+    def processingInstruction(self, target, data):
+        self.end_text()
+        self.close_start_tag()
+        self.write(f"<?{target} {data}?>" if data else f"<?{target}?>")
+
+    # Lexical events
+
+    def comment(self, content):
+        self.end_text()
+        if not self.open_elements or self.keeps_markup():
+            self.close_start_tag()
+            self.write(f"<!--{content}-->")
+
+    def startCDATA(self):
+        pass
+
+    def endCDATA(self):
+        pass
+
+    def startDTD(self, name, public_id, system_id):
+        pass
+
+    def endDTD(self):
+        pass
 
 
 if __name__ == "__main__":
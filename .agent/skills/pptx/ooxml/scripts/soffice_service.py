@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Local conversion service keeping LibreOffice instances warm between jobs.
+
+Starting soffice takes several seconds, which dominates converting or
+recalculating many documents one at a time. This service starts one or more
+headless LibreOffice instances once, drives them over UNO and accepts jobs on
+a local socket. pack.py, thumbnail.py and recalc.py send their jobs here
+whenever the service is running and fall back to a cold soffice otherwise.
+
+Instances are recycled after a number of jobs, and restarted when they crash
+or a job times out.
+
+The server needs LibreOffice's Python bindings (the uno module, e.g. the
+python3-uno package); clients import submit() from this file. The xlsx skill
+is installed on its own, so xlsx/recalc.py carries a copy of submit() that
+must be kept in step with it.
+
+Only the user running the service can connect to its socket, and clients
+ignore a socket owned by another user.
+
+Protocol: a client connects to the Unix socket, sends one JSON job on a
+single line and reads one JSON reply line. Jobs are
+    {"type": "convert", "input": <path>, "output_dir": <dir>,
+     "convert_to": "pdf" or "<ext>:<FilterName>", "timeout": <seconds>}
+    {"type": "recalc", "input": <path>, "timeout": <seconds>}
+and replies are {"ok": true, ...} or {"ok": false, "error": <message>}.
+Paths must be absolute.
+
+Example usage:
+    python soffice_service.py [--instances N] [--max-jobs N] [--socket <path>]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Environment variable overriding the socket path, for clients and server
+SOCKET_ENV = "SOFFICE_SERVICE_SOCKET"
+
+# Seconds a job may take when the client does not say
+DEFAULT_TIMEOUT = 60
+
+# Seconds to wait for a new instance to accept UNO connections
+STARTUP_TIMEOUT = 60
+
+# PDF export filters by input document type, for convert_to="pdf"
+PDF_FILTERS = {
+    ".pptx": "impress_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+    ".docx": "writer_pdf_Export",
+    ".doc": "writer_pdf_Export",
+    ".odt": "writer_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+    ".xls": "calc_pdf_Export",
+    ".ods": "calc_pdf_Export",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep warm LibreOffice instances for conversion jobs"
+    )
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of LibreOffice instances working in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=50,
+        metavar="N",
+        help="Restart an instance after N jobs (default: 50)",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help=f"Socket to listen on (default: ${SOCKET_ENV} or {default_socket_path()})",
+    )
+    args = parser.parse_args()
+
+    try:
+        serve(
+            Path(args.socket) if args.socket else socket_path(),
+            instances=args.instances,
+            max_jobs=args.max_jobs,
+        )
+    except (RuntimeError, ImportError) as e:
+        sys.exit(f"Error: {e}")
+
+
+def default_socket_path():
+    """Return the per-user socket path used when SOFFICE_SERVICE_SOCKET is unset.
+
+    The socket lives in $XDG_RUNTIME_DIR when it is set, else in a directory
+    of the temporary directory that only its owner can access.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "soffice-service.sock"
+    return _private_dir() / "service.sock"
+
+
+def _private_dir():
+    return Path(tempfile.gettempdir()) / f"soffice-service-{os.getuid()}"
+
+
+def socket_path():
+    """Return the socket path clients and the server agree on."""
+    return Path(os.environ.get(SOCKET_ENV) or default_socket_path())
+
+
+def submit(job, timeout=DEFAULT_TIMEOUT):
+    """Run a job on the running service.
+
+    Args:
+        job: Job dict as described in the module docstring (without timeout)
+        timeout: Seconds the job may take
+
+    Returns:
+        dict or None: The service's reply, or None if no service is running,
+            in which case the caller should do the work itself
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = socket_path()
+    try:
+        owner = path.stat().st_uid
+    except OSError:
+        return None
+    if owner != os.getuid():
+        return None  # Not our service: never send it jobs or trust its replies
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            # Jobs wait for a free instance first, so allow some slack
+            sock.settimeout(timeout * 2 + STARTUP_TIMEOUT)
+            sock.connect(str(path))
+            sock.sendall(json.dumps({**job, "timeout": timeout}).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None  # Stale socket left behind by a service that is gone
+    except OSError as e:
+        return {"ok": False, "error": f"Conversion service failed: {e}"}
+    if not line:
+        return {"ok": False, "error": "Conversion service closed the connection"}
+    return json.loads(line)
+
+
+def serve(path, instances=1, max_jobs=50):
+    """Run the service on a Unix socket until interrupted.
+
+    Args:
+        path: Socket path to listen on
+        instances: Number of LibreOffice instances
+        max_jobs: Jobs an instance runs before it is restarted
+    """
+    import uno  # noqa: F401 - fail early, before starting anything
+
+    path = Path(path)
+    if path.parent == _private_dir():
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        stat = path.parent.stat()
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+            raise RuntimeError(f"{path.parent} must be a directory only you can access")
+    if path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(str(path))
+            except OSError:
+                path.unlink()  # Left behind by a service that is gone
+            else:
+                raise RuntimeError(f"A service is already listening on {path}")
+
+    profile_root = Path(tempfile.mkdtemp(prefix="soffice-service-"))
+    pool = _InstancePool(instances, max_jobs, profile_root)
+    server = _ServiceServer(str(path), _JobHandler)
+    server.pool = pool
+    # SIGTERM stops the service like Ctrl-C does
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        pool.start()
+        print(f"Serving {instances} LibreOffice instance(s) on {path}", flush=True)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        pool.stop()
+        shutil.rmtree(profile_root, ignore_errors=True)
+
+
+class _ServiceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        super().server_bind()
+        # Jobs write files as this user, so no other user may connect
+        os.chmod(self.server_address, 0o600)
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            job = json.loads(self.rfile.readline())
+            job_type = job["type"]
+        except (ValueError, KeyError, TypeError):
+            self._reply({"ok": False, "error": "Malformed job"})
+            return
+        if job_type not in ("convert", "recalc"):
+            self._reply({"ok": False, "error": f"Unknown job type {job_type!r}"})
+            return
+
+        with self.server.pool.instance() as instance:
+            self._reply(instance.run(job))
+
+    def _reply(self, reply):
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+        self.wfile.flush()
+
+
+class _InstancePool:
+    """Instances handed out one job at a time, recycled when worn out or broken."""
+
+    def __init__(self, count, max_jobs, profile_root):
+        self.max_jobs = max(1, max_jobs)
+        self.instances = [
+            _OfficeInstance(profile_root / f"instance{index}")
+            for index in range(max(1, count))
+        ]
+        self.idle = queue.Queue()
+
+    def start(self):
+        for instance in self.instances:
+            instance.start()
+            self.idle.put(instance)
+
+    def stop(self):
+        for instance in self.instances:
+            instance.stop()
+
+    @contextlib.contextmanager
+    def instance(self):
+        """Borrow an idle, running instance for one job."""
+        instance = self.idle.get()
+        try:
+            if not instance.alive():
+                instance.restart()
+            yield instance
+        finally:
+            # Recycling happens after the reply is sent, off the job's clock
+            try:
+                if instance.broken or instance.jobs >= self.max_jobs:
+                    instance.restart()
+            finally:
+                self.idle.put(instance)
+
+
+class _OfficeInstance:
+    """A headless LibreOffice process with its own profile, driven over UNO."""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.pipe_name = f"soffice-service-{os.getpid()}-{profile.name}"
+        self.process = None
+        self.desktop = None
+        self.jobs = 0
+        self.broken = False
+
+    def start(self):
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        self.process = subprocess.Popen(
+            [
+                "soffice",
+                f"-env:UserInstallation={self.profile.as_uri()}",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except NoConnectException:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.kill()
+                    raise RuntimeError("LibreOffice did not start")
+                time.sleep(0.2)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        self.jobs = 0
+        self.broken = False
+
+    def stop(self):
+        if self.process is None:
+            return
+        with contextlib.suppress(Exception):
+            self.desktop.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.kill()
+        self.process = None
+        self.desktop = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def kill(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, job):
+        """Run a job and return the reply; a failed job marks the instance broken."""
+        timeout = job.get("timeout") or DEFAULT_TIMEOUT
+        # A stuck conversion can only be stopped by killing the instance
+        watchdog = threading.Timer(timeout, self.kill)
+        watchdog.start()
+        try:
+            if job["type"] == "convert":
+                reply = {"ok": True, "output": self._convert(job)}
+            else:
+                self._recalc(job)
+                reply = {"ok": True}
+        except Exception as e:
+            self.broken = True
+            if not watchdog.is_alive():
+                return {"ok": False, "error": "Timeout during conversion"}
+            return {"ok": False, "error": str(e) or type(e).__name__}
+        finally:
+            watchdog.cancel()
+            self.jobs += 1
+        return reply
+
+    def _load(self, input_path):
+        document = self.desktop.loadComponentFromURL(
+            Path(input_path).as_uri(), "_blank", 0, _properties(Hidden=True)
+        )
+        if document is None:
+            raise RuntimeError("source file could not be loaded")
+        return document
+
+    def _convert(self, job):
+        input_path = Path(job["input"])
+        extension, _, filter_name = job["convert_to"].partition(":")
+        if not filter_name:
+            filter_name = PDF_FILTERS.get(input_path.suffix.lower())
+            if extension != "pdf" or filter_name is None:
+                raise ValueError(f"No export filter for {job['convert_to']!r}")
+        output_path = Path(job["output_dir"]) / f"{input_path.stem}.{extension}"
+
+        document = self._load(input_path)
+        try:
+            document.storeToURL(
+                output_path.as_uri(),
+                _properties(FilterName=filter_name, Overwrite=True),
+            )
+        finally:
+            document.close(True)
+        return str(output_path)
+
+    def _recalc(self, job):
+        document = self._load(job["input"])
+        try:
+            document.calculateAll()
+            document.store()
+        finally:
+            document.close(True)
+
+
+def _properties(**values):
+    """Return a tuple of UNO PropertyValues."""
+    import uno
+
+    properties = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import soffice_service
+
+
+class TestSocket(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.path = self.root / "service.sock"
+        self.env = mock.patch.dict(os.environ, {soffice_service.SOCKET_ENV: str(self.path)})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.temp_dir.cleanup()
+
+    def listen(self, reply):
+        """Serve one connection, answering any job with reply."""
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(self.path))
+        server.listen()
+        self.addCleanup(server.close)
+        received = []
+
+        def serve():
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return  # Closed by the test without a client connecting
+            with connection, connection.makefile("rwb") as f:
+                received.append(json.loads(f.readline()))
+                f.write(json.dumps(reply).encode() + b"\n")
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        return received
+
+    def test_submit_sends_job_with_timeout(self):
+        received = self.listen({"ok": True})
+        reply = soffice_service.submit({"type": "recalc", "input": "/a.xlsx"}, timeout=5)
+        self.assertEqual(reply, {"ok": True})
+        self.assertEqual(received, [{"type": "recalc", "input": "/a.xlsx", "timeout": 5}])
+
+    def test_submit_ignores_socket_of_another_user(self):
+        received = self.listen({"ok": True})
+        with mock.patch.object(os, "getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(soffice_service.submit({"type": "recalc", "input": "/a"}))
+        self.assertEqual(received, [])
+
+    def test_submit_without_service(self):
+        self.assertIsNone(soffice_service.submit({"type": "recalc", "input": "/a"}))
+
+    def test_server_socket_is_private(self):
+        old_umask = os.umask(0)
+        try:
+            server = soffice_service._ServiceServer(
+                str(self.path), socketserver.BaseRequestHandler
+            )
+        finally:
+            os.umask(old_umask)
+        self.addCleanup(server.server_close)
+        self.assertEqual(stat.S_IMODE(self.path.stat().st_mode), 0o600)
+
+    def test_default_socket_path(self):
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(self.root)}):
+            self.assertEqual(
+                soffice_service.default_socket_path(), self.root / "soffice-service.sock"
+            )
+        with mock.patch.dict(os.environ), mock.patch.object(
+            tempfile, "gettempdir", return_value=str(self.root)
+        ):
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+            self.assertEqual(
+                soffice_service.default_socket_path(),
+                self.root / f"soffice-service-{os.getuid()}" / "service.sock",
+            )
+
+    def test_serve_refuses_shared_directory(self):
+        shared = self.root / f"soffice-service-{os.getuid()}"
+        shared.mkdir(mode=0o777)
+        shared.chmod(0o777)
+        with mock.patch.object(
+            tempfile, "gettempdir", return_value=str(self.root)
+        ), mock.patch.dict(sys.modules, {"uno": object()}):
+            with self.assertRaises(RuntimeError):
+                soffice_service.serve(shared / "service.sock")
+        self.assertFalse((shared / "service.sock").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
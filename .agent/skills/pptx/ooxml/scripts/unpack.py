@@ -1,29 +1,438 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage:
+    python unpack.py <office_file> <output_dir> [--jobs N] [--lazy PART [PART ...]]
+
+With --lazy only the named parts are unpacked; run again with more parts as
+they are needed. While parts are missing, <output_dir>.lazy-unpack.json
+beside the directory records the file it is unpacked from, and pack.py
+materialises the missing parts (keeping edited ones) before packing.
+"""
+
+import argparse
+import fnmatch
+import json
 import random
+import shutil
 import sys
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from xml.sax.handler import ContentHandler, property_lexical_handler
+
+import defusedxml.sax
+
+# Indentation per nesting level of pretty-printed parts
+INDENT = "  "
+
+# Suffix of the file recording an incomplete lazy unpack, beside its directory
+LAZY_MARKER_SUFFIX = ".lazy-unpack.json"
+
+# Archives opened by this process, keyed by path; workers reuse them for
+# every member they unpack
+_archives = {}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML parts"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Unpack and format parts with N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--lazy",
+        nargs="+",
+        metavar="PART",
+        help="Only materialise parts matching these names or glob patterns "
+        "(e.g. 'ppt/slides/slide3.xml'); parts already unpacked are left as they "
+        "are, so later runs can add parts to the same directory",
+    )
+    args = parser.parse_args()
+
+    try:
+        document = LazyUnpack(args.office_file, args.output_dir)
+        if args.lazy is None:
+            document.materialize(jobs=args.jobs, overwrite=True)
+        else:
+            names = document.matching(args.lazy)
+            if not names:
+                sys.exit(f"Error: No parts match {' '.join(args.lazy)}")
+            unpacked = document.materialize(names, jobs=args.jobs)
+            print(f"Materialised {len(unpacked)} of {len(document.names())} parts")
+    except (ValueError, zipfile.BadZipFile) as e:
+        sys.exit(f"Error: {e}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=1):
+    """Unpack an Office file, pretty-printing its XML and .rels parts.
+
+    Args:
+        input_file: Path to the Office file
+        output_dir: Directory to unpack into; existing files are overwritten
+        jobs: Number of worker processes unpacking parts (default: 1)
+    """
+    LazyUnpack(input_file, output_dir).materialize(jobs=jobs, overwrite=True)
+
+
+class LazyUnpack:
+    """An Office file unpacked part by part, as parts are first needed.
+
+    path(name) materialises a single part (pretty-printed if it is XML) the
+    first time it is asked for; materialize() unpacks many at once. Parts
+    already present in output_dir are never overwritten unless asked to, so
+    edits survive later calls.
+    """
+
+    def __init__(self, input_file, output_dir):
+        self.input_file = Path(input_file)
+        self.output_dir = Path(output_dir)
+        if not zipfile.is_zipfile(self.input_file):
+            raise ValueError(f"{self.input_file} is not an Office file")
+        self._names = None
+
+    def names(self):
+        """Return the part names in archive order."""
+        if self._names is None:
+            self._names = [
+                info.filename
+                for info in _archive(self.input_file).infolist()
+                if not info.is_dir()
+            ]
+        return self._names
+
+    def matching(self, patterns):
+        """Return the part names matching any of the given names or glob patterns.
+
+        A pattern equal to a part name matches it literally, so names such
+        as '[Content_Types].xml' are not read as glob character classes.
+        """
+        return [
+            name
+            for name in self.names()
+            if any(
+                name == pattern or fnmatch.fnmatchcase(name, pattern)
+                for pattern in patterns
+            )
+        ]
+
+    def path(self, name):
+        """Return the path of a part, materialising it on first access."""
+        target = _member_path(self.output_dir, name)
+        if not target.exists():
+            _unpack_member(self.input_file, name, self.output_dir)
+            self._record_progress()
+        return target
+
+    def materialize(self, names=None, jobs=1, overwrite=False):
+        """Unpack parts (all parts by default) that are not unpacked yet.
+
+        Args:
+            names: Part names to unpack; None for every part
+            jobs: Number of worker processes (default: 1)
+            overwrite: If True, parts already in output_dir are unpacked again
+
+        Returns:
+            list: Names of the parts that were unpacked
+        """
+        names = self.names() if names is None else list(names)
+        if not overwrite:
+            names = [
+                name
+                for name in names
+                if not _member_path(self.output_dir, name).exists()
+            ]
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if jobs <= 1 or len(names) < 2:
+            for name in names:
+                _unpack_member(self.input_file, name, self.output_dir)
+            self._record_progress()
+            return names
+
+        workers = min(jobs, len(names))
+        # Forked workers must not share the parent's open archive (and its
+        # file offset), so each opens its own
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_archives.clear
+        ) as executor:
+            list(
+                executor.map(
+                    _unpack_member,
+                    [self.input_file] * len(names),
+                    names,
+                    [self.output_dir] * len(names),
+                    chunksize=max(1, len(names) // (workers * 4)),
+                )
+            )
+        self._record_progress()
+        return names
+
+    def _record_progress(self):
+        """Record beside output_dir whether parts are still missing from it.
+
+        The marker names the Office file and its size and mtime, so the
+        unpack can be completed later (see complete_lazy_unpack); it is
+        removed once every part is present.
+        """
+        marker = lazy_marker_path(self.output_dir)
+        if all(_member_path(self.output_dir, name).exists() for name in self.names()):
+            marker.unlink(missing_ok=True)
+            return
+        stat = self.input_file.stat()
+        marker.write_text(
+            json.dumps(
+                {
+                    "office_file": str(self.input_file.resolve()),
+                    "signature": [stat.st_size, stat.st_mtime_ns],
+                }
+            ),
+            encoding="utf-8",
+        )
+
+
+def lazy_marker_path(output_dir):
+    """Return the file recording an incomplete lazy unpack of output_dir."""
+    output_dir = Path(output_dir)
+    return output_dir.with_name(f"{output_dir.name}{LAZY_MARKER_SUFFIX}")
+
+
+def complete_lazy_unpack(output_dir, jobs=1):
+    """Materialise the parts a lazy unpack left out of output_dir, if any.
+
+    Parts already present, edited or not, are kept.
+
+    Args:
+        output_dir: Unpacked Office document directory
+        jobs: Number of worker processes (default: 1)
+
+    Returns:
+        list: Names of the parts that were unpacked; empty if output_dir was
+            not unpacked lazily or is complete
+
+    Raises:
+        ValueError: If the Office file it is unpacked from is gone or changed
+    """
+    marker = lazy_marker_path(output_dir)
+    try:
+        data = json.loads(marker.read_text(encoding="utf-8"))
+        office_file = Path(data["office_file"])
+        signature = data["signature"]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, KeyError, TypeError):
+        raise ValueError(f"Unreadable lazy unpack record {marker}") from None
+
+    try:
+        stat = office_file.stat()
+    except OSError:
+        stat = None
+    if stat is None or [stat.st_size, stat.st_mtime_ns] != signature:
+        raise ValueError(
+            f"{output_dir} is missing parts of {office_file}, which is gone or "
+            "changed since; unpack it again"
+        )
+    return LazyUnpack(office_file, output_dir).materialize(jobs=jobs)
+
+
+def _archive(input_file):
+    input_file = Path(input_file)
+    archive = _archives.get(input_file)
+    if archive is None:
+        archive = _archives[input_file] = zipfile.ZipFile(input_file)
+    return archive
+
+
+def _member_path(output_dir, name):
+    """Return where a member is unpacked, refusing names that escape output_dir."""
+    parts = Path(name).parts
+    if not parts or Path(name).is_absolute() or ".." in parts:
+        raise ValueError(f"Refusing to unpack unsafe part name {name!r}")
+    return Path(output_dir) / name
+
+
+def _unpack_member(input_file, name, output_dir):
+    """Unpack one member, streaming it out of the archive."""
+    target = _member_path(output_dir, name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with _archive(input_file).open(name) as source, open(target, "wb") as output:
+        if name.endswith((".xml", ".rels")):
+            pretty_print_xml(source, output)
+        else:
+            # Binary parts are copied as they are
+            shutil.copyfileobj(source, output, 1024 * 1024)
+
+
+def pretty_print_xml(source, output):
+    """Pretty-print XML from a binary file object to another, in one streaming pass.
+
+    The output is ASCII with two-space indentation, byte-for-byte what
+    minidom's toprettyxml(indent="  ", encoding="ascii") produces.
+
+    Args:
+        source: Binary file object reading the XML
+        output: Binary file object to write the formatted XML to
+    """
+    writer = _PrettyWriter(output)
+    writer.write('<?xml version="1.0" encoding="ascii"?>\n')
+    parser = defusedxml.sax.make_parser()
+    parser.setContentHandler(writer)
+    parser.setProperty(property_lexical_handler, writer)
+    parser.parse(source)
+    writer.flush()
+
+
+class _PrettyWriter(ContentHandler):
+    """SAX handler writing indented XML with minidom's layout rules.
+
+    An element whose only child is a text node is written on one line;
+    every other child goes on its own line. Namespace declarations come
+    before other attributes.
+    """
+
+    def __init__(self, output):
+        super().__init__()
+        self.output = output
+        self.pieces = []
+        self.text = []
+        self.in_cdata = False
+        # Open elements as [name, state, held text node]; state is 'empty',
+        # 'held' (one text node so far, possibly written inline) or 'block'
+        self.open_elements = []
+
+    def write(self, piece):
+        self.pieces.append(piece)
+        if len(self.pieces) >= 4096:
+            self.flush()
+
+    def flush(self):
+        self.output.write(
+            "".join(self.pieces).encode("ascii", errors="xmlcharrefreplace")
+        )
+        self.pieces = []
+
+    def end_text(self):
+        """Turn the text collected since the last markup into a text node."""
+        if not self.text:
+            return
+        data = "".join(self.text)
+        self.text = []
+        self.add_child(("cdata" if self.in_cdata else "text", data))
+
+    def add_child(self, node):
+        if not self.open_elements:
+            # Outside the root only comments and processing instructions occur
+            self.write_node(node, "")
+            return
+        parent = self.open_elements[-1]
+        if parent[1] == "empty" and node[0] in ("text", "cdata"):
+            parent[1] = "held"
+            parent[2] = node
+            return
+        self.to_block(parent)
+        self.write_node(node, INDENT * len(self.open_elements))
+
+    def to_block(self, element):
+        """Put an element's children on their own lines from now on."""
+        if element[1] == "block":
+            return
+        self.write(">\n")
+        if element[1] == "held":
+            self.write_node(element[2], INDENT * len(self.open_elements))
+            element[2] = None
+        element[1] = "block"
+
+    def write_node(self, node, indent, inline=False):
+        kind, data = node
+        if kind == "text":
+            self.write(_escape(data if inline else f"{indent}{data}\n"))
+        elif kind == "cdata":
+            self.write(f"<![CDATA[{data}]]>")
+        elif kind == "comment":
+            self.write(f"{indent}<!--{data}-->\n")
+        else:
+            self.write(f"{indent}<?{data[0]} {data[1]}?>\n")
+
+    def startElement(self, name, attrs):
+        self.end_text()
+        if self.open_elements:
+            self.to_block(self.open_elements[-1])
+        self.write(f"{INDENT * len(self.open_elements)}<{name}")
+        items = list(attrs.items())
+        for attr, value in sorted(
+            items, key=lambda item: not _is_namespace_declaration(item[0])
+        ):
+            self.write(f' {attr}="{_escape(value)}"')
+        self.open_elements.append([name, "empty", None])
+
+    def endElement(self, name):
+        self.end_text()
+        _, state, held = self.open_elements.pop()
+        if state == "empty":
+            self.write("/>\n")
+        elif state == "held":
+            self.write(">")
+            self.write_node(held, "", inline=True)
+            self.write(f"</{name}>\n")
+        else:
+            self.write(f"{INDENT * len(self.open_elements)}</{name}>\n")
+
+    def characters(self, content):
+        self.text.append(content)
+
+    def ignorableWhitespace(self, whitespace):
+        self.text.append(whitespace)
+
+    def processingInstruction(self, target, data):
+        self.end_text()
+        self.add_child(("pi", (target, data)))
+
+    # Lexical events
+
+    def comment(self, content):
+        self.end_text()
+        self.add_child(("comment", content))
+
+    def startCDATA(self):
+        self.end_text()
+        self.in_cdata = True
+
+    def endCDATA(self):
+        self.end_text()
+        self.in_cdata = False
+
+    def startDTD(self, name, public_id, system_id):
+        pass
+
+    def endDTD(self):
+        pass
+
+
+def _is_namespace_declaration(attr):
+    return attr == "xmlns" or attr.startswith("xmlns:")
+
+
+def _escape(data):
+    return (
+        data.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace('"', "&quot;")
+        .replace(">", "&gt;")
+    )
+
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+if __name__ == "__main__":
+    main()
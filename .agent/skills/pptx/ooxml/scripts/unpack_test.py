@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from pack import pack_document
+from unpack import LazyUnpack, complete_lazy_unpack, lazy_marker_path
+
+PARTS = {
+    "[Content_Types].xml": '<Types xmlns="urn:t"><Default Extension="xml"/></Types>',
+    "_rels/.rels": '<Relationships xmlns="urn:r"/>',
+    "ppt/slides/slide1.xml": "<sld><t>one</t></sld>",
+    "ppt/slides/slide2.xml": "<sld><t>two</t></sld>",
+}
+
+
+class TestLazyUnpack(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.office_file = self.root / "deck.pptx"
+        with zipfile.ZipFile(self.office_file, "w") as zf:
+            for name, content in PARTS.items():
+                zf.writestr(name, content)
+        self.output_dir = self.root / "deck"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_names_match_literally_before_globs(self):
+        document = LazyUnpack(self.office_file, self.output_dir)
+        self.assertEqual(document.matching(["[Content_Types].xml"]), ["[Content_Types].xml"])
+        self.assertEqual(
+            document.matching(["ppt/slides/*.xml"]),
+            ["ppt/slides/slide1.xml", "ppt/slides/slide2.xml"],
+        )
+
+    def test_marker_records_missing_parts(self):
+        document = LazyUnpack(self.office_file, self.output_dir)
+        document.materialize(["ppt/slides/slide1.xml"])
+        self.assertTrue(lazy_marker_path(self.output_dir).exists())
+        document.materialize()
+        self.assertFalse(lazy_marker_path(self.output_dir).exists())
+
+    def test_pack_completes_lazy_unpack(self):
+        LazyUnpack(self.office_file, self.output_dir).materialize(
+            ["ppt/slides/slide1.xml"]
+        )
+        edited = self.output_dir / "ppt" / "slides" / "slide1.xml"
+        edited.write_text("<sld><t>edited</t></sld>", encoding="utf-8")
+
+        output_file = self.root / "out.pptx"
+        self.assertTrue(pack_document(self.output_dir, output_file))
+        with zipfile.ZipFile(output_file) as zf:
+            self.assertEqual(sorted(zf.namelist()), sorted(PARTS))
+            self.assertIn(b"edited", zf.read("ppt/slides/slide1.xml"))
+        self.assertFalse(lazy_marker_path(self.output_dir).exists())
+
+    def test_changed_original_is_refused(self):
+        LazyUnpack(self.office_file, self.output_dir).materialize(
+            ["ppt/slides/slide1.xml"]
+        )
+        with zipfile.ZipFile(self.office_file, "a") as zf:
+            zf.writestr("ppt/slides/slide3.xml", "<sld/>")
+        with self.assertRaises(ValueError):
+            complete_lazy_unpack(self.output_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
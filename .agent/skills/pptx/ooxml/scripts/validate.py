@@ -3,21 +3,33 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir_or_file> --original <original_file> [--schema-cache <cache_dir>] [--jobs N]
+        [--baseline-cache <cache_dir>] [--incremental] [--fast-xsd] [--profile <out.json>] [--profile-top N]
+        [--profile-memory]
 """
 
 import argparse
 import sys
+import zipfile
+from contextlib import nullcontext
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationProfiler,
+)
+from unpack import complete_lazy_unpack
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, or a packaged "
+        "Office file to validate in place without extracting it",
     )
     parser.add_argument(
         "--original",
@@ -30,34 +42,98 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--schema-cache",
+        metavar="DIR",
+        help="Directory for cached XSD results, reused across runs",
+    )
+    parser.add_argument(
+        "--baseline-cache",
+        metavar="DIR",
+        help="Directory for cached results about original files (their XSD "
+        "errors, paragraph counts and text fingerprints), reused across runs",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Validate parts against XSD schemas with N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse results for unchanged parts from <dir_or_file>.validation.json",
+    )
+    parser.add_argument(
+        "--fast-xsd",
+        action="store_true",
+        help="Confirm parts with precompiled structural models first and run "
+        "full XSD validation only on parts they cannot confirm",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Write wall/CPU time, bytes parsed and peak memory per check, "
+        "part and phase to FILE as JSON, and print a summary",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of entries per section in the profile summary (default: 10)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also record peak traced Python memory per entry (slows checks down)",
+    )
     args = parser.parse_args()
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or an Office file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
 
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    validators = validators_for(file_extension)
+    if not validators:
+        print(f"Error: Validation not supported for file type {file_extension}")
+        sys.exit(1)
 
     # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    profiler = (
+        ValidationProfiler(track_memory=args.profile_memory) if args.profile else None
+    )
+    try:
+        success = run_validators(
+            validators,
+            unpacked_dir,
+            original_file,
+            verbose=args.verbose,
+            schema_cache_dir=args.schema_cache,
+            baseline_cache_dir=args.baseline_cache,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            fast_xsd=args.fast_xsd,
+            profiler=profiler,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if profiler:
+        profiler.close()
+        profiler.write(args.profile)
+        profiler.print_summary(args.profile_top)
 
     if success:
         print("All validations PASSED!")
@@ -65,5 +141,62 @@ def main():
     sys.exit(0 if success else 1)
 
 
+def validators_for(file_extension):
+    """Return the validator classes for a document type, empty if unsupported."""
+    match file_extension:
+        case ".docx":
+            return [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            return [PPTXSchemaValidator]
+        case _:
+            return []
+
+
+def run_validators(
+    validators, unpacked_dir, original_file, verbose=False, profiler=None, **options
+):
+    """Run validators over a document, saving each schema validator's manifest.
+
+    Args:
+        validators: Validator classes, as returned by validators_for
+        unpacked_dir: Document to validate (directory or packaged file)
+        original_file: Path to the original Office file
+        verbose: Enable verbose output
+        profiler: Optional ValidationProfiler measuring each validator
+        **options: Options for the schema validators (schema_cache_dir,
+            baseline_cache_dir, jobs, incremental, fast_xsd); the redlining
+            validator uses baseline_cache_dir
+
+    A directory left incomplete by a lazy unpack is completed first, as
+    pack_document does, so the checks see every part of the document.
+
+    Returns:
+        bool: True if every validator passed
+
+    Raises:
+        ValueError: If a lazy unpack cannot be completed
+    """
+    if Path(unpacked_dir).is_dir():
+        completed = complete_lazy_unpack(unpacked_dir, options.get("jobs", 1))
+        if completed:
+            print(f"Materialised {len(completed)} parts left out by a lazy unpack")
+
+    success = True
+    for V in validators:
+        kwargs = {}
+        if issubclass(V, BaseSchemaValidator):
+            kwargs = dict(options, profiler=profiler)
+        elif issubclass(V, RedliningValidator):
+            kwargs = {"baseline_cache_dir": options.get("baseline_cache_dir")}
+        measure = profiler.measure("validator", V.__name__) if profiler else None
+        with measure or nullcontext():
+            validator = V(unpacked_dir, original_file, verbose=verbose, **kwargs)
+            if not validator.validate():
+                success = False
+        if isinstance(validator, BaseSchemaValidator):
+            validator.save_manifest()
+    return success
+
+
 if __name__ == "__main__":
     main()
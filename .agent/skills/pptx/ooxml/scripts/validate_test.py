@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from unpack import LazyUnpack, lazy_marker_path
+from validate import run_validators
+
+PARTS = {
+    "[Content_Types].xml": '<Types xmlns="urn:t"><Default Extension="xml"/></Types>',
+    "_rels/.rels": '<Relationships xmlns="urn:r"/>',
+    "ppt/slides/slide1.xml": "<sld><t>one</t></sld>",
+    "ppt/slides/slide2.xml": "<sld><t>two</t></sld>",
+}
+
+
+class PartListingValidator:
+    """Stand-in validator recording the parts present when it is created."""
+
+    seen = None
+
+    def __init__(self, unpacked_dir, original_file, verbose=False):
+        PartListingValidator.seen = sorted(
+            f.relative_to(unpacked_dir).as_posix()
+            for f in Path(unpacked_dir).rglob("*")
+            if f.is_file()
+        )
+
+    def validate(self):
+        return True
+
+
+class TestRunValidators(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.office_file = self.root / "deck.pptx"
+        with zipfile.ZipFile(self.office_file, "w") as zf:
+            for name, content in PARTS.items():
+                zf.writestr(name, content)
+        self.output_dir = self.root / "deck"
+        PartListingValidator.seen = None
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lazy_unpack_is_completed_before_validating(self):
+        LazyUnpack(self.office_file, self.output_dir).materialize(
+            ["[Content_Types].xml", "ppt/slides/slide1.xml"]
+        )
+        self.assertTrue(
+            run_validators([PartListingValidator], self.output_dir, self.office_file)
+        )
+        self.assertEqual(PartListingValidator.seen, sorted(PARTS))
+        self.assertFalse(lazy_marker_path(self.output_dir).exists())
+
+    def test_changed_original_is_refused(self):
+        LazyUnpack(self.office_file, self.output_dir).materialize(
+            ["ppt/slides/slide1.xml"]
+        )
+        with zipfile.ZipFile(self.office_file, "a") as zf:
+            zf.writestr("ppt/slides/slide3.xml", "<sld/>")
+        with self.assertRaises(ValueError):
+            run_validators([PartListingValidator], self.output_dir, self.office_file)
+        self.assertIsNone(PartListingValidator.seen)
+
+
+if __name__ == "__main__":
+    unittest.main()
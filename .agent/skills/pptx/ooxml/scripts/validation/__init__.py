@@ -4,12 +4,27 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .graph import PackageGraph, Relationship
+from .package import DirectoryPackage, MappingPackage, ZipPackage, open_package
 from .pptx import PPTXSchemaValidator
+from .profiling import ValidationProfiler
 from .redlining import RedliningValidator
+from .rules import DocumentRule
+from .structure import StructureModel, compile_schema
 
 __all__ = [
     "BaseSchemaValidator",
+    "DirectoryPackage",
+    "DocumentRule",
     "DOCXSchemaValidator",
+    "MappingPackage",
+    "PackageGraph",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "Relationship",
+    "StructureModel",
+    "ValidationProfiler",
+    "ZipPackage",
+    "compile_schema",
+    "open_package",
 ]
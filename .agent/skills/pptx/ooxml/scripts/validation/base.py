@@ -2,11 +2,73 @@
 Base validator with common validation logic for document files.
 """
 
+import hashlib
+import io
+import json
+import os
+import posixpath
 import re
-from pathlib import Path
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path, PurePosixPath
 
 import lxml.etree
 
+from .baseline import BaselineCache
+from .graph import PackageGraph
+from .manifest import ValidationManifest
+from .package import ZipPackage, open_package
+from .profiling import ValidationProfiler
+from .scan import scan_part
+from .structure import StructureModel
+
+# Compiled XSD schemas shared by every validator in this process, keyed by the
+# resolved schema path. pml.xsd/wml.xsd import most of the schemas tree, so
+# each schema is compiled once instead of once per validated part.
+_compiled_schemas = {}
+
+# Structural models of schemas for the fast XSD path, keyed by the resolved
+# schema path, loaded once per process like _compiled_schemas
+_structure_models = {}
+
+# Content digests of schema directories, keyed by resolved directory path
+_schema_fingerprints = {}
+
+# Validator owned by an XSD worker process, created by _init_xsd_worker. Each
+# worker keeps its own compiled schemas and original-file baseline errors.
+_xsd_worker = None
+
+
+def _init_xsd_worker(
+    validator_class,
+    package,
+    original_file,
+    schema_cache_dir,
+    baseline_cache_dir,
+    fast_xsd,
+    profile,
+):
+    # profile is None when not profiling, else whether to track memory
+    global _xsd_worker
+    _xsd_worker = validator_class(
+        package,
+        original_file,
+        schema_cache_dir=schema_cache_dir,
+        baseline_cache_dir=baseline_cache_dir,
+        fast_xsd=fast_xsd,
+        profiler=None if profile is None else ValidationProfiler(profile),
+    )
+
+
+def _validate_file_in_worker(xml_file):
+    # Measurements travel back with the result, to be merged by the parent
+    result = _xsd_worker._profiled_xsd_result(xml_file)
+    if _xsd_worker.profiler is None:
+        return result, []
+    return result, _xsd_worker.profiler.pop_records()
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -81,6 +143,12 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Bump when the format or semantics of on-disk XSD cache entries change
+    XSD_CACHE_VERSION = 1
+
+    # Parsed trees kept for reuse by later checks; least recently used go first
+    XML_TREE_CACHE_SIZE = 32
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -103,45 +171,292 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        schema_cache_dir=None,
+        jobs=1,
+        incremental=False,
+        fast_xsd=False,
+        profiler=None,
+        baseline_cache_dir=None,
+    ):
+        """
+        Args:
+            unpacked_dir: Document to validate: an unpacked directory, a
+                packaged .docx/.pptx/.xlsx file, a mapping of part name to
+                bytes, or a package from validation.package. Packaged and
+                in-memory documents are read in place, never extracted.
+            original_file: Path to the original Office file
+            fast_xsd: If True, parts are first checked against precompiled
+                structural models and only parts they cannot confirm are
+                validated with the full XSD schema
+            profiler: Optional ValidationProfiler recording the cost of each
+                check, part and expensive phase
+            baseline_cache_dir: Optional directory keeping results about
+                original files (their XSD errors, paragraph counts) across
+                runs, keyed by the original's SHA-256
+        """
+        # Parts are addressed as paths under unpacked_dir, which for a zip or
+        # in-memory package is a virtual root that never touches the disk
+        self.package = open_package(unpacked_dir)
+        self.unpacked_dir = self.package.root
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Number of worker processes for per-part XSD validation
+        self.jobs = max(1, jobs or 1)
+
+        # Confirm parts with structural models before full XSD validation
+        self.fast_xsd = fast_xsd
+
+        # Optional cost measurements of checks, parts and phases
+        self.profiler = profiler
+
+        # Optional on-disk cache of XSD results, so repeated runs over
+        # unchanged parts skip both validation and schema compilation
+        self.schema_cache_dir = Path(schema_cache_dir) if schema_cache_dir else None
+
+        # Optional on-disk cache of baseline results about the original file,
+        # opened on first use by baseline_cache
+        self.baseline_cache_dir = (
+            Path(baseline_cache_dir) if baseline_cache_dir else None
+        )
+        self._baseline_cache = None
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
         # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
+        patterns = [".xml", ".rels"]
         self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
+            self.unpacked_dir / name
+            for pattern in patterns
+            for name in self.package.names()
+            if name.endswith(pattern)
         ]
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Recently parsed trees, filled lazily by _parse_xml and bounded by
+        # XML_TREE_CACHE_SIZE: path -> (version, tree)
+        self._xml_trees = OrderedDict()
+
+        # Streaming scans, filled lazily by _scan_xml: path -> (version, scan)
+        self._scans = {}
+
+        # Relationship graph, built on first use by the relationship checks
+        self._package_graph = None
+
+        # Original package, opened on first use, and its XSD errors per part
+        self._original_package = None
+        self._original_errors = {}
+
+        # Content hashes computed during this run, by path
+        self._digests = {}
+
+        # Results of earlier runs, reused for unchanged parts when incremental.
+        # In-memory packages have nowhere to keep a manifest.
+        self.manifest = None
+        if incremental and self.package.path is not None:
+            self.manifest = ValidationManifest.for_unpacked_dir(
+                self.unpacked_dir, self._manifest_scope()
+            )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    def _measure(self, kind, name):
+        """Return a context manager recording the cost of a block when profiling."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(kind, name)
+
+    def _count_bytes(self, count):
+        """Attribute parsed bytes to the current measurement when profiling."""
+        if self.profiler is not None:
+            self.profiler.add_bytes(count)
+
+    def _check(self, check):
+        """Run a check method (e.g. self.validate_xml) and return its result."""
+        with self._measure("check", check.__name__):
+            return check()
+
+    def _manifest_scope(self):
+        """Describe everything besides part content that check results depend on."""
+        return {
+            **self._code_scope(),
+            "original": self._file_digest(self.original_file),
+        }
+
+    def _code_scope(self):
+        """Describe the validator, its code and schemas, which every cached result depends on."""
+        code = hashlib.sha256()
+        for source in sorted(Path(__file__).parent.glob("*.py")):
+            code.update(source.read_bytes())
+        return {
+            "validator": type(self).__name__,
+            "code": code.hexdigest(),
+            "schemas": self._schemas_fingerprint(),
+        }
+
+    @property
+    def baseline_cache(self):
+        """The BaselineCache of the original file, or None if not caching baselines."""
+        if self._baseline_cache is None and self.baseline_cache_dir:
+            original_digest = self._file_digest(self.original_file)
+            if original_digest is not None:
+                self._baseline_cache = BaselineCache(
+                    self.baseline_cache_dir, original_digest, self._code_scope()
+                )
+        return self._baseline_cache
+
+    def _file_digest(self, path):
+        """Return the SHA-256 of a part's or file's content (None if missing), once per run."""
+        path = Path(path)
+        if path not in self._digests:
+            try:
+                if path != self.unpacked_dir and path.is_relative_to(self.unpacked_dir):
+                    content = self.package.read(self._part_name(path))
+                else:
+                    content = path.read_bytes()
+                self._digests[path] = hashlib.sha256(content).hexdigest()
+            except (OSError, KeyError):
+                self._digests[path] = None
+        return self._digests[path]
+
+    def _part_name(self, xml_file):
+        """Return the package part name of a file, e.g. 'ppt/slides/slide1.xml'."""
+        return Path(xml_file).relative_to(self.unpacked_dir).as_posix()
+
+    def _part_path(self, xml_file):
+        """Return a part's path under unpacked_dir, resolving symlinks for directories."""
+        xml_file = Path(xml_file)
+        if xml_file.is_relative_to(self.unpacked_dir):
+            return xml_file
+        return xml_file.resolve()
+
+    def _folder_parts(self, folder, suffix):
+        """Return the paths of parts directly inside a package folder with a suffix.
+
+        Equivalent to globbing unpacked_dir / folder / f"*{suffix}", for any
+        kind of package.
+        """
+        return [
+            self.unpacked_dir / name
+            for name in self.package.names()
+            if posixpath.dirname(name) == folder and name.endswith(suffix)
+        ]
+
+    def _part_result(self, check, xml_file, compute, depends_on=()):
+        """Return compute() for a part, reusing the manifest result if its inputs are unchanged.
+
+        compute must return JSON-serialisable data (lists rather than tuples or
+        sets) so fresh and reused results look the same. depends_on lists other
+        files the result depends on, such as the part's .rels file.
+        """
+        name = self._part_name(xml_file)
+        with self._measure("part", name):
+            if self.manifest is None:
+                return compute()
+
+            sha256 = self._file_digest(xml_file)
+            inputs = [self._file_digest(path) for path in depends_on]
+            found, result = self.manifest.lookup(name, sha256, check, inputs)
+            if not found:
+                result = compute()
+                self.manifest.store(name, sha256, check, inputs, result)
+            return result
+
+    def save_manifest(self):
+        """Persist results for the next incremental run (no-op unless incremental)."""
+        if self.manifest is None:
+            return
+        self.manifest.save(self._part_name(f) for f in self.xml_files)
+        if self.verbose:
+            print(
+                f"Incremental: reused {self.manifest.reused} check results, "
+                f"computed {self.manifest.computed}"
+            )
+
+    def _parse_xml(self, xml_file):
+        """Return the parsed tree for an XML file, reusing a recent parse.
+
+        Trees are cached by path and part version (modification time for
+        directories), so checks share a parse. Only the XML_TREE_CACHE_SIZE
+        most recently used trees are kept, so memory stays bounded on large
+        documents at the cost of parsing some parts again. The returned tree
+        is shared and must not be modified; checks that mutate the tree work
+        on their own copy of it.
+        """
+        xml_file = Path(xml_file)
+        name = self._part_name(xml_file)
+        version = self.package.version(name)
+        cached = self._xml_trees.get(xml_file)
+        if cached is not None and cached[0] == version:
+            self._xml_trees.move_to_end(xml_file)
+            return cached[1]
+
+        with self.package.open(name) as f:
+            tree = lxml.etree.parse(f)
+        self._count_bytes(self.package.size(name))
+        self._xml_trees[xml_file] = (version, tree)
+        self._xml_trees.move_to_end(xml_file)
+        if len(self._xml_trees) > self.XML_TREE_CACHE_SIZE:
+            self._xml_trees.popitem(last=False)
+        return tree
+
+    def _scan_xml(self, xml_file):
+        """Return the streaming scan of an XML file, scanning it at most once.
+
+        The scan covers well-formedness, Ignorable namespaces, unique IDs,
+        r:id references and UUID-like IDs in one pass without keeping a tree,
+        so those checks never need to parse the part fully.
+        """
+        xml_file = Path(xml_file)
+        name = self._part_name(xml_file)
+        version = self.package.version(name)
+        cached = self._scans.get(xml_file)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self.package.open(name) as f:
+            scan = scan_part(f, self.UNIQUE_ID_REQUIREMENTS)
+        self._count_bytes(self.package.size(name))
+        self._scans[xml_file] = (version, scan)
+        return scan
+
+    @property
+    def package_graph(self):
+        """The PackageGraph of the document, built once."""
+        if self._package_graph is None:
+            with self._measure("phase", "package_graph"):
+                self._package_graph = PackageGraph.from_package(
+                    self.package, parse=self._parse_xml
+                )
+        return self._package_graph
+
+    @property
+    def original_package(self):
+        """The original Office file, read in place without extracting it."""
+        if self._original_package is None:
+            self._original_package = ZipPackage(self.original_file)
+        return self._original_package
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
+            errors.extend(
+                self._part_result(
+                    "xml", xml_file, lambda: self._well_formed_errors(xml_file)
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -153,26 +468,31 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _well_formed_errors(self, xml_file):
+        """Return well-formedness errors for a single XML file."""
+        error = self._scan_xml(xml_file).error
+        if isinstance(error, lxml.etree.XMLSyntaxError):
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Line {error.lineno}: {error.msg}"
+            ]
+        elif error is not None:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(error)}"
+            ]
+        return []
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+            errors.extend(
+                self._part_result(
+                    "namespaces", xml_file, lambda: self._namespace_errors(xml_file)
+                )
+            )
 
         if errors:
             print(f"FAILED - {len(errors)} namespace issues:")
@@ -183,86 +503,48 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _namespace_errors(self, xml_file):
+        """Return undeclared Ignorable namespace prefixes in a single XML file."""
+        scan = self._scan_xml(xml_file)
+        if isinstance(scan.error, lxml.etree.XMLSyntaxError):
+            return []
+
+        undeclared = set(scan.ignorable) - scan.declared_prefixes
+        return [
+            f"  {xml_file.relative_to(self.unpacked_dir)}: "
+            f"Namespace '{ns}' in Ignorable but not declared"
+            for ns in undeclared
+        ]
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            # File-scope errors are final; global IDs are checked across files here
+            entries = self._part_result(
+                "ids", xml_file, lambda: self._unique_id_entries(xml_file)
+            )
+            for entry in entries:
+                if entry[0] != "global":
+                    errors.append(entry[1])
+                    continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+                _, id_value, line, tag = entry
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {line}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,99 +556,102 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _unique_id_entries(self, xml_file):
+        """Check file-scope ID uniqueness in a single XML file.
+
+        Returns a list in document order of ["error", message] entries and
+        ["global", id_value, line, tag] entries for globally scoped IDs, which
+        validate_unique_ids checks across all files. IDs inside
+        mc:AlternateContent are ignored.
+        """
+        entries = []
+        scan = self._scan_xml(xml_file)
+        file_ids = {}  # Track IDs that must be unique within this file
+
+        for scope, tag, attr_name, id_value, line in scan.ids:
+            if scope == "global":
+                entries.append(["global", id_value, line, tag])
+            elif scope == "file":
+                # Check file-level uniqueness
+                key = (tag, attr_name)
+                if key not in file_ids:
+                    file_ids[key] = {}
+
+                if id_value in file_ids[key]:
+                    prev_line = file_ids[key][id_value]
+                    entries.append(
+                        [
+                            "error",
+                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                            f"Line {line}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                            f"(first occurrence at line {prev_line})",
+                        ]
+                    )
+                else:
+                    file_ids[key][id_value] = line
+
+        if scan.error is not None:
+            entries.append(
+                [
+                    "error",
+                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {scan.error}",
+                ]
+            )
+        return entries
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        graph = self.package_graph
 
-        # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
-
-        if not rels_files:
+        if not graph.rels_parts:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Get all parts in the package (excluding reference files)
+        all_parts = [
+            name
+            for name in graph.parts
+            if PurePosixPath(name).name != "[Content_Types].xml"
+            and not name.endswith(".rels")
+        ]  # These parts are not referenced by .rels
 
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        # Track all parts that are referenced by any .rels file
+        all_referenced_parts = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(graph.rels_parts)} .rels files and {len(all_parts)} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
+        for rels_part in graph.rels_parts:
+            if rels_part in graph.rels_errors:
+                errors.append(
+                    f"  Error parsing {rels_part}: {graph.rels_errors[rels_part]}"
+                )
+                continue
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+            for rel in graph.relationships_in(rels_part):
+                # Skip external URLs
+                if not rel.target or rel.target.startswith(("http", "mailto:")):
+                    continue
 
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                if rel.part is not None and graph.has_part(rel.part):
+                    all_referenced_parts.add(rel.part)
+                else:
+                    errors.append(
+                        f"  {rels_part}: Line {rel.line}: Broken reference to {rel.target}"
+                    )
 
-        # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
+        # Check for unreferenced parts (parts that exist but are not referenced anywhere)
+        unreferenced_parts = set(all_parts) - all_referenced_parts
 
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        for unref_part in sorted(unreferenced_parts, key=PurePosixPath):
+            errors.append(f"  Unreferenced file: {unref_part}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,8 +675,6 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -402,75 +685,20 @@ class BaseSchemaValidator:
 
             # Determine the corresponding .rels file
             # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            rels_part = PackageGraph.rels_part_for(self._part_name(xml_file))
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self.package_graph.has_part(rels_part):
                 continue
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+            errors.extend(
+                self._part_result(
+                    "relationship_ids",
+                    xml_file,
+                    lambda: self._relationship_id_errors(xml_file, rels_part),
+                    depends_on=[self.unpacked_dir / rels_part],
+                )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -483,6 +711,65 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _relationship_id_errors(self, xml_file, rels_part):
+        """Return r:id reference errors for a single XML file and its .rels part."""
+        errors = []
+        graph = self.package_graph
+
+        try:
+            # Collect valid relationship IDs and their types from the .rels part
+            if rels_part in graph.rels_errors:
+                raise graph.rels_errors[rels_part]
+            rid_to_type = {}
+
+            for rel in graph.relationships_in(rels_part):
+                rid = rel.id
+                if rid:
+                    # Check for duplicate rIds
+                    if rid in rid_to_type:
+                        errors.append(
+                            f"  {rels_part}: Line {rel.line}: "
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                        )
+                    # Extract just the type name from the full URL
+                    type_name = (
+                        rel.type.split("/")[-1] if "/" in rel.type else rel.type
+                    )
+                    rid_to_type[rid] = type_name
+
+            # Scan the XML file for all r:id references
+            scan = self._scan_xml(xml_file)
+            if scan.error is not None:
+                raise scan.error
+
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            for elem_name, rid_attr, line in scan.relationship_refs:
+                # Check if the ID exists
+                if rid_attr not in rid_to_type:
+                    errors.append(
+                        f"  {xml_rel_path}: Line {line}: "
+                        f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                        f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                    )
+                # Check if we have type expectations for this element
+                elif self.ELEMENT_RELATIONSHIP_TYPES:
+                    expected_type = self._get_expected_relationship_type(elem_name)
+                    if expected_type:
+                        actual_type = rid_to_type[rid_attr]
+                        # Check if the actual type matches or contains the expected type
+                        if expected_type not in actual_type.lower():
+                            errors.append(
+                                f"  {xml_rel_path}: Line {line}: "
+                                f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                f"but should point to a '{expected_type}' relationship"
+                            )
+
+        except Exception as e:
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            errors.append(f"  Error processing {xml_rel_path}: {e}")
+
+        return errors
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -524,32 +811,17 @@ class BaseSchemaValidator:
         errors = []
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        graph = self.package_graph
+        if not graph.has_part("[Content_Types].xml"):
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Get all declared parts (Override) and extensions (Default)
+            if graph.content_types_error is not None:
+                raise graph.content_types_error
+            declared_parts = set(graph.content_type_overrides)
+            declared_extensions = set(graph.content_type_defaults)
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +847,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -592,35 +860,34 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
+                root_name = self._part_result(
+                    "root", xml_file, lambda: self._root_name(xml_file)
+                )
+                if root_name is None:
                     continue  # Skip unparseable files
 
-            # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
+
+            # Check all non-XML parts for Default extension declarations
+            for part_name in graph.parts:
+                part_path = PurePosixPath(part_name)
                 # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
+                if part_path.suffix.lower() in {".xml", ".rels"}:
                     continue
-                if file_path.name == "[Content_Types].xml":
+                if part_path.name == "[Content_Types].xml":
                     continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                if "_rels" in part_path.parts or "docProps" in part_path.parts:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
+                extension = part_path.suffix.lstrip(".").lower()
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            f'  {part_name}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
 
         except Exception as e:
@@ -638,6 +905,14 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _root_name(self, xml_file):
+        """Return the local name of a file's root element, or None if unparseable."""
+        scan = self._scan_xml(xml_file)
+        if scan.error is not None:
+            return None
+        root_tag = scan.root_tag
+        return root_tag.split("}")[-1] if "}" in root_tag else root_tag
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -648,9 +923,9 @@ class BaseSchemaValidator:
         Returns:
             tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
         """
-        # Resolve both paths to handle symlinks
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
+        # Resolve symlinked paths into unpacked_dir
+        xml_file = self._part_path(xml_file)
+        unpacked_dir = self.unpacked_dir
 
         # Validate current file
         is_valid, current_errors = self._validate_single_file_xsd(
@@ -673,7 +948,7 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
             return False, new_errors
@@ -692,11 +967,9 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd()
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -712,7 +985,7 @@ class BaseSchemaValidator:
 
             # Has new errors
             new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
+            for error in sorted(new_file_errors)[:3]:  # Show first 3 errors
                 new_errors.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
@@ -738,6 +1011,84 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self):
+        """Return validate_file_against_xsd results for all XML files, in file order.
+
+        Parts with a reusable manifest result are not revalidated. With
+        jobs > 1 the remaining parts are spread across a process pool; results
+        are still returned in self.xml_files order so the report is stable.
+        """
+        results = {}
+        pending = []
+        for xml_file in self.xml_files:
+            cached = self._cached_xsd_result(xml_file)
+            if cached is None:
+                pending.append(xml_file)
+            else:
+                results[xml_file] = cached
+
+        if self.jobs == 1 or len(pending) < 2:
+            computed = [self._profiled_xsd_result(xml_file) for xml_file in pending]
+        else:
+            workers = min(self.jobs, len(pending))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_xsd_worker,
+                initargs=(
+                    type(self),
+                    self.package,
+                    self.original_file,
+                    self.schema_cache_dir,
+                    self.baseline_cache_dir,
+                    self.fast_xsd,
+                    None if self.profiler is None else self.profiler.track_memory,
+                ),
+            ) as executor:
+                computed = []
+                for result, records in executor.map(
+                    _validate_file_in_worker,
+                    pending,
+                    chunksize=max(1, len(pending) // (workers * 4)),
+                ):
+                    if self.profiler is not None:
+                        self.profiler.merge(records)
+                    computed.append(result)
+
+        for xml_file, result in zip(pending, computed):
+            self._store_xsd_result(xml_file, result)
+            results[xml_file] = result
+        return [results[xml_file] for xml_file in self.xml_files]
+
+    def _profiled_xsd_result(self, xml_file):
+        """Return validate_file_against_xsd for a part, measured as a part when profiling."""
+        with self._measure("part", self._part_name(xml_file)):
+            return self.validate_file_against_xsd(xml_file, verbose=False)
+
+    def _cached_xsd_result(self, xml_file):
+        """Return the manifest's XSD result for an unchanged part, or None."""
+        if self.manifest is None:
+            return None
+        found, result = self.manifest.lookup(
+            self._part_name(xml_file), self._file_digest(xml_file), "xsd", []
+        )
+        if not found:
+            return None
+        is_valid, errors = result
+        return is_valid, set(errors)
+
+    def _store_xsd_result(self, xml_file, result):
+        """Record a part's XSD result and schema in the manifest."""
+        if self.manifest is None:
+            return
+        name = self._part_name(xml_file)
+        sha256 = self._file_digest(xml_file)
+        schema_path = self._get_schema_path(xml_file)
+        if schema_path:
+            schema_path = Path(schema_path).relative_to(self.schemas_dir).as_posix()
+        self.manifest.set_schema(name, sha256, schema_path)
+        is_valid, errors = result
+        self.manifest.store(name, sha256, "xsd", [], [is_valid, sorted(errors)])
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -823,30 +1174,165 @@ class BaseSchemaValidator:
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+    def _load_schema(self, schema_path):
+        """Return the compiled XMLSchema for a schema path, compiling it once per process."""
+        schema_path = Path(schema_path).resolve()
+        schema = _compiled_schemas.get(schema_path)
+        if schema is None:
+            with self._measure("phase", f"compile_schema:{schema_path.name}"):
+                with open(schema_path, "rb") as xsd_file:
+                    parser = lxml.etree.XMLParser()
+                    xsd_doc = lxml.etree.parse(
+                        xsd_file, parser=parser, base_url=str(schema_path)
+                    )
+                    schema = lxml.etree.XMLSchema(xsd_doc)
+            _compiled_schemas[schema_path] = schema
+        return schema
+
+    def _load_structure_model(self, schema_path):
+        """Return the StructureModel for a schema path, loading it once per process.
+
+        Models precompiled by compile_schemas.py are read from
+        schemas/compiled; a missing or stale model is compiled on the fly.
+        """
+        schema_path = Path(schema_path).resolve()
+        model = _structure_models.get(schema_path)
+        if model is None:
+            relative = schema_path.relative_to(self.schemas_dir.resolve())
+            compiled_path = self.schemas_dir / "compiled" / relative.with_suffix(
+                ".json.gz"
+            )
+            with self._measure("phase", f"load_structure_model:{schema_path.name}"):
+                model = StructureModel.for_schema(schema_path, compiled_path)
+            _structure_models[schema_path] = model
+        return model
+
+    def _conforms_structurally(self, xml_file, relative_path, schema_path, content):
+        """Return True if a part's structural model confirms it is schema-valid.
+
+        The structural check is conservative: False only means the part needs
+        full XSD validation, never that it is invalid.
+        """
+        # Foreign namespaces are removed before XSD validation in these folders
+        allowed_namespaces = None
+        if relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS:
+            allowed_namespaces = self.OOXML_NAMESPACES
+        try:
+            model = self._load_structure_model(schema_path)
+            if content is None:
+                name = self._part_name(xml_file)
+                with self.package.open(name) as source:
+                    violation = model.find_violation(source, allowed_namespaces)
+                self._count_bytes(self.package.size(name))
+            else:
+                violation = model.find_violation(
+                    io.BytesIO(content), allowed_namespaces
+                )
+                self._count_bytes(len(content))
+        except Exception:
+            return False
+        return violation is None
+
+    def _schemas_fingerprint(self):
+        """Return a digest of every schema file, computed once per process."""
+        schemas_dir = self.schemas_dir.resolve()
+        fingerprint = _schema_fingerprints.get(schemas_dir)
+        if fingerprint is None:
+            digest = hashlib.sha256()
+            for xsd_file in sorted(schemas_dir.rglob("*.xsd")):
+                digest.update(str(xsd_file.relative_to(schemas_dir)).encode())
+                digest.update(xsd_file.read_bytes())
+            fingerprint = digest.hexdigest()
+            _schema_fingerprints[schemas_dir] = fingerprint
+        return fingerprint
+
+    def _xsd_cache_path(self, relative_path, schema_path, content):
+        """Return the on-disk cache entry for validating a part against schema_path."""
+        digest = hashlib.sha256()
+        for part in (
+            str(self.XSD_CACHE_VERSION),
+            self._schemas_fingerprint(),
+            str(Path(schema_path).resolve().relative_to(self.schemas_dir.resolve())),
+            relative_path.as_posix(),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(content)
+        key = digest.hexdigest()
+        return self.schema_cache_dir / key[:2] / f"{key}.json"
+
+    def _read_xsd_cache(self, cache_path):
+        """Return a cached (is_valid, errors_set) result, or None on a miss."""
+        try:
+            entry = json.loads(cache_path.read_text(encoding="utf-8"))
+            return entry["valid"], set(entry["errors"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_xsd_cache(self, cache_path, is_valid, errors):
+        """Store an XSD result; cache write failures never fail validation."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"valid": is_valid, "errors": sorted(errors)}, f)
+            os.replace(temp_name, cache_path)
+        except OSError:
+            pass
+
+    def _validate_single_file_xsd(self, xml_file, base_path, content=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        When content is given, xml_file only names the part and the XML is
+        parsed from those bytes instead of being read from disk.
+        """
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  # Skip file
 
+        relative_path = xml_file.relative_to(base_path)
+        cache_path = None
+        if self.schema_cache_dir:
+            try:
+                if content is None:
+                    content = self.package.read(self._part_name(xml_file))
+                cache_path = self._xsd_cache_path(relative_path, schema_path, content)
+            except (OSError, KeyError):
+                cache_path = None
+            if cache_path:
+                cached = self._read_xsd_cache(cache_path)
+                if cached is not None:
+                    return cached
+
+        if self.fast_xsd and self._conforms_structurally(
+            xml_file, relative_path, schema_path, content
+        ):
+            is_valid, errors = True, set()
+        else:
+            is_valid, errors = self._run_single_file_xsd(
+                xml_file, relative_path, schema_path, content
+            )
+
+        if cache_path:
+            self._write_xsd_cache(cache_path, is_valid, errors)
+        return is_valid, errors
+
+    def _run_single_file_xsd(self, xml_file, relative_path, schema_path, content):
+        """Validate a single XML file against a known schema. Returns (is_valid, errors_set)."""
         try:
             # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
-
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+            schema = self._load_schema(schema_path)
 
+            # Load and preprocess XML (template removal works on a copy)
+            if content is None:
+                xml_doc = self._parse_xml(xml_file)
+            else:
+                xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(content))
+                self._count_bytes(len(content))
             xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
             xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
 
             # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
             if (
                 relative_path.parts
                 and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
@@ -869,39 +1355,44 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The part is read straight from the original package and its errors
+        are computed once per validator, however often they are requested.
+        With a baseline cache they are computed once per original file.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
-        # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
-        unpacked_dir = self.unpacked_dir.resolve()
+        # Resolve symlinked paths (e.g., /var vs /private/var on macOS)
+        xml_file = self._part_path(xml_file)
+        unpacked_dir = self.unpacked_dir
         relative_path = xml_file.relative_to(unpacked_dir)
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
+        part_name = relative_path.as_posix()
+
+        if part_name not in self._original_errors:
+            cache = self.baseline_cache
+            cached = cache.get("errors", part_name) if cache else None
+            if cached is not None:
+                errors = set(cached)
+            elif not self.original_package.exists(part_name):
                 # File didn't exist in original, so no original errors
-                return set()
+                errors = set()
+            else:
+                # Validate the specific file in original
+                with self._measure("phase", "original_baseline"):
+                    is_valid, errors = self._validate_single_file_xsd(
+                        unpacked_dir / relative_path,
+                        unpacked_dir,
+                        content=self.original_package.read(part_name),
+                    )
+            errors = errors if errors else set()
+            if cache and cached is None:
+                cache.put("errors", part_name, sorted(errors))
+            self._original_errors[part_name] = errors
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+        return self._original_errors[part_name]
 
     def _remove_template_tags_from_text_nodes(self, xml_doc):
         """Remove template tags from XML text nodes and collect warnings.
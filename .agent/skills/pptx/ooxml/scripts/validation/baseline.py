@@ -0,0 +1,121 @@
+"""
+Persistent baseline facts about original documents, shared across runs.
+
+Validating an edit compares it with its original: the XSD errors each part of
+the original already had, structural statistics such as its paragraph count,
+and the text fingerprint the redlining check compares with. These depend only on the original's content, so they are stored under
+the SHA-256 of the original package and reused by every later run against
+it. The cache directory is kept under a size bound by evicting the least
+recently used originals.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+# Default bound on the total size of a baseline cache directory
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class BaselineCache:
+    """Baseline results of one original document, stored by its digest.
+
+    Entries live in <cache_dir>/<digest[:2]>/<digest>/, one small JSON file
+    each, written atomically so parallel workers can share the cache. Every
+    entry records the scope it was computed under (validator, its code and
+    the schemas) and is ignored under any other scope.
+    """
+
+    def __init__(self, cache_dir, original_digest, scope, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Root directory of the cache
+            original_digest: SHA-256 hex digest of the original package
+            scope: JSON-serialisable description of what results depend on
+                besides the original
+            max_bytes: Size the cache directory is trimmed to after writes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.directory = self.cache_dir / original_digest[:2] / original_digest
+        self.scope = hashlib.sha256(
+            json.dumps(scope, sort_keys=True).encode()
+        ).hexdigest()
+        self.max_bytes = max_bytes
+        self._used = False
+        self._evicted = False
+
+    def get(self, kind, name):
+        """Return the cached value of an entry, or None on a miss.
+
+        Args:
+            kind: Kind of entry, e.g. 'errors' or 'stats'
+            name: Entry name within its kind, e.g. a part name
+        """
+        self._mark_used()
+        try:
+            entry = json.loads(self._entry_path(kind, name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("scope") != self.scope:
+            return None
+        return entry.get("value")
+
+    def put(self, kind, name, value):
+        """Store a JSON-serialisable value; cache write failures never fail validation."""
+        path = self._entry_path(kind, name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"scope": self.scope, "name": name, "value": value}, f)
+            os.replace(temp_name, path)
+        except OSError:
+            return
+        if not self._evicted:
+            self._evicted = True
+            self.evict()
+
+    def evict(self):
+        """Remove least recently used originals until the cache fits max_bytes.
+
+        The original this cache belongs to is never removed.
+        """
+        originals = []
+        total = 0
+        for directory in self.cache_dir.glob("??/*"):
+            try:
+                size = sum(f.stat().st_size for f in directory.iterdir())
+                used = directory.stat().st_mtime
+            except OSError:
+                continue  # Removed concurrently
+            originals.append((used, size, directory))
+            total += size
+
+        for used, size, directory in sorted(originals):
+            if total <= self.max_bytes:
+                break
+            if directory == self.directory:
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+            total -= size
+
+    def _mark_used(self):
+        """Record this original as recently used, once per run."""
+        if self._used:
+            return
+        self._used = True
+        try:
+            os.utime(self.directory)
+        except OSError:
+            pass  # Nothing cached for it yet
+
+    def _entry_path(self, kind, name):
+        key = hashlib.sha256(name.encode()).hexdigest()[:32]
+        return self.directory / f"{kind}-{key}.json"
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
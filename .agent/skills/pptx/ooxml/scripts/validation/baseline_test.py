@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from validation.baseline import BaselineCache
+
+SCOPE = {"validator": "DOCXSchemaValidator", "code": "abc"}
+DIGEST_A = "a" * 64
+DIGEST_B = "b" * 64
+
+
+class TestBaselineCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def cache(self, digest=DIGEST_A, scope=SCOPE, max_bytes=1 << 20):
+        return BaselineCache(self.cache_dir, digest, scope, max_bytes)
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache().get("errors", "word/document.xml"))
+        self.cache().put("errors", "word/document.xml", ["error"])
+        self.cache().put("stats", "paragraphs", 12)
+        self.assertEqual(self.cache().get("errors", "word/document.xml"), ["error"])
+        self.assertEqual(self.cache().get("stats", "paragraphs"), 12)
+        self.assertIsNone(self.cache().get("stats", "word/document.xml"))
+
+    def test_entries_are_per_original_and_scope(self):
+        self.cache().put("stats", "paragraphs", 12)
+        self.assertIsNone(self.cache(DIGEST_B).get("stats", "paragraphs"))
+        self.assertIsNone(
+            self.cache(scope=dict(SCOPE, code="def")).get("stats", "paragraphs")
+        )
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = self.cache()
+        cache.put("stats", "paragraphs", 12)
+        cache._entry_path("stats", "paragraphs").write_text("{", encoding="utf-8")
+        self.assertIsNone(self.cache().get("stats", "paragraphs"))
+
+    def test_eviction_keeps_recent_originals(self):
+        old = self.cache(DIGEST_B)
+        old.put("errors", "part", ["x" * 4000])
+        os.utime(old.directory, (1, 1))
+
+        cache = self.cache(max_bytes=6000)
+        cache.put("errors", "part", ["y" * 4000])
+        self.assertFalse(old.directory.exists())
+        self.assertEqual(cache.get("errors", "part"), ["y" * 4000])
+
+    def test_own_original_is_never_evicted(self):
+        cache = self.cache(max_bytes=10)
+        cache.put("errors", "part", ["y" * 4000])
+        self.assertEqual(self.cache(max_bytes=10).get("errors", "part"), ["y" * 4000])
+
+    def test_unwritable_cache_is_ignored(self):
+        blocker = self.cache_dir / "file"
+        blocker.write_text("", encoding="utf-8")
+        cache = BaselineCache(blocker, DIGEST_A, SCOPE)
+        cache.put("stats", "paragraphs", 12)
+        self.assertIsNone(cache.get("stats", "paragraphs"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,13 +2,16 @@
 Validator for Word document XML files against XSD schemas.
 """
 
-import re
-import tempfile
-import zipfile
-
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .rules import (
+    DeletionRule,
+    InsertionRule,
+    ParagraphCountRule,
+    WhitespaceRule,
+    run_document_rules,
+)
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,51 +24,59 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    # Checks of document.xml content that share one traversal
+    DOCUMENT_RULES = (WhitespaceRule, DeletionRule, InsertionRule, ParagraphCountRule)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Results of DOCUMENT_RULES by document.xml path: (version, results)
+        self._document_rule_results = {}
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._check(self.validate_file_references):
             all_valid = False
 
         # Test 4: Content type declarations
-        if not self.validate_content_types():
+        if not self._check(self.validate_content_types):
             all_valid = False
 
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._check(self.validate_against_xsd):
             all_valid = False
 
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
+        if not self._check(self.validate_whitespace_preservation):
             all_valid = False
 
         # Test 7: Deletion validation
-        if not self.validate_deletions():
+        if not self._check(self.validate_deletions):
             all_valid = False
 
         # Test 8: Insertion validation
-        if not self.validate_insertions():
+        if not self._check(self.validate_insertions):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Count and compare paragraphs
-        self.compare_paragraph_counts()
+        self._check(self.compare_paragraph_counts)
 
         return all_valid
 
@@ -80,36 +91,11 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            errors.extend(
+                self._part_result(
+                    "whitespace", xml_file, lambda: self._whitespace_errors(xml_file)
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -121,6 +107,10 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All whitespace is properly preserved")
             return True
 
+    def _whitespace_errors(self, xml_file):
+        """Return w:t elements with unpreserved whitespace in a single document.xml."""
+        return self._rule_errors(xml_file, "whitespace")
+
     def validate_deletions(self):
         """
         Validate that w:t elements are not within w:del elements.
@@ -133,32 +123,11 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            errors.extend(
+                self._part_result(
+                    "deletions", xml_file, lambda: self._deletion_errors(xml_file)
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -170,6 +139,10 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No w:t elements found within w:del elements")
             return True
 
+    def _deletion_errors(self, xml_file):
+        """Return w:t elements within w:del elements in a single document.xml."""
+        return self._rule_errors(xml_file, "deletions")
+
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
         count = 0
@@ -179,34 +152,42 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-            except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
+            count = self._part_result(
+                "paragraphs", xml_file, lambda: self._count_paragraphs(xml_file)
+            )
 
         return count
 
+    def _count_paragraphs(self, xml_file):
+        """Count the w:p elements in a single document.xml."""
+        try:
+            return self._rule_results(xml_file)["paragraphs"]
+        except Exception as e:
+            print(f"Error counting paragraphs in unpacked document: {e}")
+            return 0
+
     def count_paragraphs_in_original(self):
         """Count the number of paragraphs in the original docx file."""
         count = 0
 
+        cache = self.baseline_cache
+        if cache:
+            cached = cache.get("stats", "paragraphs")
+            if cached is not None:
+                return cached
+
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original package
+            root = lxml.etree.fromstring(
+                self.original_package.read("word/document.xml")
+            )
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            if cache:
+                cache.put("stats", "paragraphs", count)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -224,31 +205,11 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            errors.extend(
+                self._part_result(
+                    "insertions", xml_file, lambda: self._insertion_errors(xml_file)
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
@@ -260,6 +221,32 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No w:delText elements within w:ins elements")
             return True
 
+    def _insertion_errors(self, xml_file):
+        """Return w:delText elements within w:ins elements in a single document.xml."""
+        return self._rule_errors(xml_file, "insertions")
+
+    def _rule_errors(self, xml_file, name):
+        """Return the error lines of one document rule for a single document.xml."""
+        try:
+            return self._rule_results(xml_file)[name]
+        except Exception as e:
+            return [f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"]
+
+    def _rule_results(self, xml_file):
+        """Return the results of all DOCUMENT_RULES for a document.xml.
+
+        The rules share one traversal of the shared parsed tree, run at most
+        once per part version however many of their checks ask.
+        """
+        name = self._part_name(xml_file)
+        version = self.package.version(name)
+        cached = self._document_rule_results.get(xml_file)
+        if cached is None or cached[0] != version:
+            root = self._parse_xml(xml_file).getroot()
+            results = run_document_rules(root, self.DOCUMENT_RULES, name)
+            cached = self._document_rule_results[xml_file] = (version, results)
+        return cached[1]
+
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
         original_count = self.count_paragraphs_in_original()
@@ -0,0 +1,207 @@
+"""
+Relationship graph of an Office package, built once and queried by the checks.
+"""
+
+import posixpath
+from collections import namedtuple
+from pathlib import PurePosixPath
+
+import lxml.etree
+
+from .package import DirectoryPackage
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+# A single <Relationship> from a .rels part.
+#   source: Part the relationship belongs to ("" for the package itself)
+#   rels_part: The .rels part declaring it
+#   id, type, target, target_mode: The raw attribute values (id may be None)
+#   part: Resolved target part name, or None for external targets
+#   line: Line of the <Relationship> element in rels_part
+Relationship = namedtuple(
+    "Relationship",
+    ["source", "rels_part", "id", "type", "target", "target_mode", "part", "line"],
+)
+
+
+class PackageGraph:
+    """Index of the parts, relationships and content types of an Office package.
+
+    Part names are package-relative POSIX paths such as 'ppt/slides/slide1.xml'.
+    Every .rels part and [Content_Types].xml is parsed once when the graph is
+    built; afterwards relationship and content type lookups are dictionary
+    lookups. Parse errors are recorded in rels_errors and content_types_error
+    rather than raised.
+    """
+
+    def __init__(self, part_names, load_tree):
+        """
+        Args:
+            part_names: Names of all parts in the package, in listing order
+            load_tree: Callable returning the parsed lxml tree of a part name
+        """
+        self.parts = list(part_names)
+        self._part_set = set(self.parts)
+        self.rels_parts = [name for name in self.parts if name.endswith(".rels")]
+
+        self.rels_errors = {}  # rels part -> exception raised while parsing it
+        self._by_rels_part = {}  # rels part -> [Relationship] in document order
+        self._by_source = {}  # source part -> [Relationship] in document order
+        self._references = {}  # target part -> [Relationship] pointing at it
+
+        for rels_part in self.rels_parts:
+            try:
+                root = load_tree(rels_part).getroot()
+            except Exception as e:
+                self.rels_errors[rels_part] = e
+                continue
+            relationships = self._read_relationships(rels_part, root)
+            self._by_rels_part[rels_part] = relationships
+            for rel in relationships:
+                self._by_source.setdefault(rel.source, []).append(rel)
+                if rel.part is not None:
+                    self._references.setdefault(rel.part, []).append(rel)
+
+        self.content_type_defaults = {}  # lowercase extension -> content type
+        self.content_type_overrides = {}  # part name -> content type
+        self.content_types_error = None
+        if CONTENT_TYPES_PART in self._part_set:
+            try:
+                self._read_content_types(load_tree(CONTENT_TYPES_PART).getroot())
+            except Exception as e:
+                self.content_types_error = e
+
+    @classmethod
+    def from_package(cls, package, parse=None):
+        """Build the graph of a package (see validation.package).
+
+        Args:
+            package: DirectoryPackage, ZipPackage or MappingPackage
+            parse: Optional callable taking a part path under package.root and
+                returning its lxml tree, e.g. to share a cache of parsed trees
+        """
+        if parse is not None:
+            return cls(package.names(), lambda name: parse(package.root / name))
+
+        def load_tree(name):
+            with package.open(name) as f:
+                return lxml.etree.parse(f)
+
+        return cls(package.names(), load_tree)
+
+    @classmethod
+    def from_directory(cls, unpacked_dir, parse=None):
+        """Build the graph of an unpacked package directory.
+
+        Args:
+            unpacked_dir: Path to the unpacked Office document
+            parse: Optional callable taking a file path and returning its lxml
+                tree, e.g. to share a cache of parsed trees
+        """
+        return cls.from_package(DirectoryPackage(unpacked_dir), parse=parse)
+
+    @staticmethod
+    def rels_part_for(source):
+        """Return the .rels part name holding the relationships of a source part."""
+        directory, name = posixpath.split(source)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def source_for(rels_part):
+        """Return the part whose relationships a .rels part holds ("" for the package)."""
+        rels_dir, name = posixpath.split(rels_part)
+        if name == ".rels":
+            return ""
+        return posixpath.join(posixpath.dirname(rels_dir), name[: -len(".rels")])
+
+    @staticmethod
+    def resolve_target(rels_part, target):
+        """Resolve a relationship target to a part name, or None if outside the package."""
+        if target.startswith("/"):
+            resolved = posixpath.normpath(target.lstrip("/"))
+        else:
+            rels_dir, name = posixpath.split(rels_part)
+            # A .rels file's targets are relative to its source part's folder;
+            # a bare .rels file's are relative to the package root
+            base = "" if name == ".rels" else posixpath.dirname(rels_dir)
+            resolved = posixpath.normpath(posixpath.join(base, target))
+        if resolved == "." or resolved.startswith("../"):
+            return None
+        return resolved
+
+    def _read_relationships(self, rels_part, root):
+        source = self.source_for(rels_part)
+        relationships = []
+        for rel in root.findall(f".//{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+            target = rel.get("Target")
+            target_mode = rel.get("TargetMode", "Internal")
+            part = None
+            if target and target_mode != "External":
+                part = self.resolve_target(rels_part, target)
+            relationships.append(
+                Relationship(
+                    source,
+                    rels_part,
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    target,
+                    target_mode,
+                    part,
+                    rel.sourceline,
+                )
+            )
+        return relationships
+
+    def _read_content_types(self, root):
+        for override in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                self.content_type_overrides[part_name.lstrip("/")] = override.get(
+                    "ContentType"
+                )
+        for default in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                self.content_type_defaults[extension.lower()] = default.get(
+                    "ContentType"
+                )
+
+    def has_part(self, name):
+        """Return True if the package contains a part with this name."""
+        return name in self._part_set
+
+    def relationships_in(self, rels_part):
+        """Return the relationships declared in a .rels part, in document order."""
+        return self._by_rels_part.get(rels_part, [])
+
+    def relationships_from(self, source, type_name=None):
+        """Return the relationships of a source part, optionally filtered by type.
+
+        type_name matches the last segment of the relationship type URI,
+        e.g. 'slideLayout' or 'notesSlide'.
+        """
+        relationships = self._by_source.get(source, [])
+        if type_name is None:
+            return relationships
+        return [
+            rel for rel in relationships if rel.type.rsplit("/", 1)[-1] == type_name
+        ]
+
+    def references_to(self, part):
+        """Return the relationships whose target resolves to a part."""
+        return self._references.get(part, [])
+
+    def content_type(self, part):
+        """Return the declared content type of a part, or None if undeclared."""
+        if part in self.content_type_overrides:
+            return self.content_type_overrides[part]
+        extension = PurePosixPath(part).suffix.lstrip(".").lower()
+        return self.content_type_defaults.get(extension)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,102 @@
+"""
+Persistent per-part validation results for incremental validation runs.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+class ValidationManifest:
+    """Validation results of an unpacked document, stored next to it.
+
+    Each part records its content hash, the schema it validates against and
+    the last result of every check that ran on it. A check result is keyed by
+    the hashes of any other files it depends on (e.g. the part's .rels file)
+    and is reused until the part or one of those files changes.
+
+    The scope describes everything else the results depend on (validator,
+    validator code, schemas, original file). A manifest written under a
+    different scope is ignored.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, scope):
+        self.path = Path(path)
+        self.scope = scope
+        self.parts = {}
+        self.reused = 0
+        self.computed = 0
+        self._load()
+
+    @classmethod
+    def for_unpacked_dir(cls, unpacked_dir, scope):
+        """Return the manifest stored beside unpacked_dir as <name>.validation.json."""
+        unpacked_dir = Path(unpacked_dir)
+        return cls(
+            unpacked_dir.with_name(f"{unpacked_dir.name}.validation.json"), scope
+        )
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == self.VERSION
+            and data.get("scope") == self.scope
+        ):
+            self.parts = data.get("parts", {})
+
+    def _part(self, name, sha256):
+        """Return the entry for a part, resetting it if the part's content changed."""
+        entry = self.parts.get(name)
+        if entry is None or entry.get("sha256") != sha256:
+            entry = {"sha256": sha256, "schema": None, "checks": {}}
+            self.parts[name] = entry
+        return entry
+
+    def lookup(self, name, sha256, check, inputs):
+        """Return (True, result) for a reusable result, otherwise (False, None)."""
+        cached = self._part(name, sha256)["checks"].get(check)
+        if cached is not None and cached.get("inputs") == inputs:
+            self.reused += 1
+            return True, cached["result"]
+        return False, None
+
+    def store(self, name, sha256, check, inputs, result):
+        """Record the JSON-serialisable result of a check on a part."""
+        self.computed += 1
+        self._part(name, sha256)["checks"][check] = {
+            "inputs": inputs,
+            "result": result,
+        }
+
+    def set_schema(self, name, sha256, schema):
+        """Record the schema a part validates against."""
+        self._part(name, sha256)["schema"] = schema
+
+    def save(self, names):
+        """Write the manifest, keeping only the given (still existing) parts."""
+        names = set(names)
+        data = {
+            "version": self.VERSION,
+            "scope": self.scope,
+            "parts": {
+                name: entry for name, entry in self.parts.items() if name in names
+            },
+        }
+        try:
+            fd, temp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(temp_name, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write validation manifest {self.path}: {e}")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from validation.manifest import ValidationManifest
+
+SCOPE = {"validator": "PPTXSchemaValidator", "code": "abc", "original": "123"}
+
+
+class TestValidationManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.unpacked_dir = Path(self.temp_dir.name) / "deck"
+        self.unpacked_dir.mkdir()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def manifest(self, scope=SCOPE):
+        return ValidationManifest.for_unpacked_dir(self.unpacked_dir, scope)
+
+    def test_stored_beside_unpacked_dir(self):
+        self.assertEqual(
+            self.manifest().path, Path(self.temp_dir.name) / "deck.validation.json"
+        )
+
+    def test_results_survive_save(self):
+        manifest = self.manifest()
+        self.assertEqual(manifest.lookup("a.xml", "h1", "xsd", {}), (False, None))
+        manifest.store("a.xml", "h1", "xsd", {"rels": "r1"}, ["error"])
+        manifest.set_schema("a.xml", "h1", "pml.xsd")
+        manifest.save(["a.xml"])
+
+        reloaded = self.manifest()
+        self.assertEqual(
+            reloaded.lookup("a.xml", "h1", "xsd", {"rels": "r1"}), (True, ["error"])
+        )
+        self.assertEqual(reloaded.parts["a.xml"]["schema"], "pml.xsd")
+        self.assertEqual((reloaded.reused, reloaded.computed), (1, 0))
+
+    def test_changed_part_or_inputs_miss(self):
+        manifest = self.manifest()
+        manifest.store("a.xml", "h1", "xsd", {"rels": "r1"}, [])
+        manifest.store("a.xml", "h1", "ids", {}, [])
+        self.assertEqual(manifest.lookup("a.xml", "h1", "xsd", {"rels": "r2"}), (False, None))
+        # New content drops every result recorded for the old content
+        self.assertEqual(manifest.lookup("a.xml", "h2", "ids", {}), (False, None))
+        self.assertEqual(manifest.lookup("a.xml", "h1", "ids", {}), (False, None))
+
+    def test_other_scope_is_ignored(self):
+        manifest = self.manifest()
+        manifest.store("a.xml", "h1", "xsd", {}, [])
+        manifest.save(["a.xml"])
+        other = self.manifest(dict(SCOPE, code="def"))
+        self.assertEqual(other.lookup("a.xml", "h1", "xsd", {}), (False, None))
+
+    def test_save_drops_removed_parts(self):
+        manifest = self.manifest()
+        manifest.store("a.xml", "h1", "xsd", {}, [])
+        manifest.store("b.xml", "h2", "xsd", {}, [])
+        manifest.save(["b.xml"])
+        self.assertEqual(list(self.manifest().parts), ["b.xml"])
+
+    def test_corrupt_manifest_is_ignored(self):
+        self.manifest().path.write_text("{", encoding="utf-8")
+        self.assertEqual(self.manifest().parts, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,208 @@
+"""
+Read-only access to the parts of an Office document, wherever they live.
+
+A package source is an unpacked directory, a packaged .docx/.pptx/.xlsx file
+or an in-memory mapping of part name to bytes. All three expose the same
+interface, so validators can check a document without extracting it.
+"""
+
+import io
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+
+
+class DirectoryPackage:
+    """Read-only view of an unpacked Office document directory."""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        # Part paths are expressed as root / part name
+        self.root = self.path
+        self._names = None
+        self._name_set = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def names(self):
+        """Return the part names (e.g. 'word/document.xml') in listing order."""
+        if self._names is None:
+            self._names = [
+                path.relative_to(self.path).as_posix()
+                for path in self.path.rglob("*")
+                if path.is_file()
+            ]
+        return self._names
+
+    def exists(self, name):
+        """Return True if the package contains a part with this name."""
+        if self._name_set is None:
+            self._name_set = set(self.names())
+        return name in self._name_set
+
+    def open(self, name):
+        """Return a binary file object reading a part."""
+        return open(self.path / name, "rb")
+
+    def read(self, name):
+        """Return the raw bytes of a part."""
+        return (self.path / name).read_bytes()
+
+    def size(self, name):
+        """Return the size of a part in bytes."""
+        return (self.path / name).stat().st_size
+
+    def version(self, name):
+        """Return a token that changes whenever the part's content may have changed."""
+        return (self.path / name).stat().st_mtime_ns
+
+    def close(self):
+        pass
+
+
+class ZipPackage:
+    """Read-only view of an Office file that reads parts straight from the zip.
+
+    The archive is opened once, on first use, and members are read into
+    memory on demand, so nothing is ever extracted to disk.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        # Part paths are expressed as root / part name, e.g. deck.pptx/ppt/...
+        self.root = self.path.resolve()
+        self._zip = None
+        self._names = None
+        self._name_set = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __getstate__(self):
+        # Open archives cannot be pickled; worker processes reopen it lazily
+        state = self.__dict__.copy()
+        state["_zip"] = None
+        return state
+
+    def _archive(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.path, "r")
+        return self._zip
+
+    def names(self):
+        """Return the part names (e.g. 'word/document.xml') in archive order."""
+        if self._names is None:
+            self._names = [
+                info.filename
+                for info in self._archive().infolist()
+                if not info.is_dir()
+            ]
+        return self._names
+
+    def exists(self, name):
+        """Return True if the package contains a part with this name."""
+        if self._name_set is None:
+            self._name_set = set(self.names())
+        return name in self._name_set
+
+    def open(self, name):
+        """Return a binary file object streaming a part out of the archive."""
+        return self._archive().open(name)
+
+    def read(self, name):
+        """Return the raw bytes of a part."""
+        return self._archive().read(name)
+
+    def size(self, name):
+        """Return the uncompressed size of a part in bytes."""
+        return self._archive().getinfo(name).file_size
+
+    def version(self, name):
+        """Return a token for the part's content; archive members never change."""
+        return 0
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class MappingPackage:
+    """Read-only view of a document held in memory as {part name: bytes}.
+
+    Useful for validating generated documents before they are ever written.
+    The package has no location on disk (path is None).
+    """
+
+    def __init__(self, parts, name="<memory>"):
+        self.parts = dict(parts)
+        self.path = None
+        # Part paths are expressed as root / part name
+        self.root = Path(name).absolute()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def names(self):
+        """Return the part names (e.g. 'word/document.xml') in insertion order."""
+        return list(self.parts)
+
+    def exists(self, name):
+        """Return True if the package contains a part with this name."""
+        return name in self.parts
+
+    def open(self, name):
+        """Return a binary file object reading a part."""
+        return io.BytesIO(self.parts[name])
+
+    def read(self, name):
+        """Return the raw bytes of a part."""
+        return self.parts[name]
+
+    def size(self, name):
+        """Return the size of a part in bytes."""
+        return len(self.parts[name])
+
+    def version(self, name):
+        """Return a token for the part's content; mapped parts never change."""
+        return 0
+
+    def close(self):
+        pass
+
+
+def open_package(source):
+    """Return the package for a source, which may already be a package.
+
+    Args:
+        source: Unpacked directory path, path to a packaged Office file,
+            mapping of part name to bytes, or a package object
+
+    Raises:
+        ValueError: If a path is neither a directory nor a zip file
+    """
+    if isinstance(source, (DirectoryPackage, ZipPackage, MappingPackage)):
+        return source
+    if isinstance(source, Mapping):
+        return MappingPackage(source)
+
+    path = Path(source)
+    if path.is_dir():
+        return DirectoryPackage(path)
+    if zipfile.is_zipfile(path):
+        return ZipPackage(path)
+    raise ValueError(f"{path} is neither a directory nor an Office file")
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
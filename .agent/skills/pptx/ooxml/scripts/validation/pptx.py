@@ -2,8 +2,6 @@
 Validator for PowerPoint presentation XML files against XSD schemas.
 """
 
-import re
-
 from .base import BaseSchemaValidator
 
 
@@ -28,85 +26,62 @@ class PPTXSchemaValidator(BaseSchemaValidator):
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
-        if not self.validate_xml():
+        if not self._check(self.validate_xml):
             return False
 
         # Test 1: Namespace declarations
         all_valid = True
-        if not self.validate_namespaces():
+        if not self._check(self.validate_namespaces):
             all_valid = False
 
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
+        if not self._check(self.validate_unique_ids):
             all_valid = False
 
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
+        if not self._check(self.validate_uuid_ids):
             all_valid = False
 
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
+        if not self._check(self.validate_file_references):
             all_valid = False
 
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
+        if not self._check(self.validate_slide_layout_ids):
             all_valid = False
 
         # Test 6: Content type declarations
-        if not self.validate_content_types():
+        if not self._check(self.validate_content_types):
             all_valid = False
 
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
+        if not self._check(self.validate_against_xsd):
             all_valid = False
 
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
+        if not self._check(self.validate_notes_slide_references):
             all_valid = False
 
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
+        if not self._check(self.validate_all_relationship_ids):
             all_valid = False
 
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
+        if not self._check(self.validate_no_duplicate_slide_layouts):
             all_valid = False
 
         return all_valid
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
-        import lxml.etree
-
         errors = []
-        # UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
-        uuid_pattern = re.compile(
-            r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
-        )
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
-                                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+            errors.extend(
+                self._part_result(
+                    "uuid_ids", xml_file, lambda: self._uuid_id_errors(xml_file)
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
@@ -118,21 +93,27 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All UUID-like IDs contain valid hex values")
             return True
 
-    def _looks_like_uuid(self, value):
-        """Check if a value has the general structure of a UUID."""
-        # Remove common UUID delimiters
-        clean_value = value.strip("{}()").replace("-", "")
-        # Check if it's 32 hex-like characters (could include invalid hex chars)
-        return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
+    def _uuid_id_errors(self, xml_file):
+        """Return UUID-like ID attributes with invalid hex values in a single XML file."""
+        scan = self._scan_xml(xml_file)
+
+        errors = [
+            f"  {xml_file.relative_to(self.unpacked_dir)}: "
+            f"Line {line}: ID '{value}' appears to be a UUID but contains invalid hex characters"
+            for value, line in scan.invalid_uuids
+        ]
+        if scan.error is not None:
+            errors.append(
+                f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {scan.error}"
+            )
+        return errors
 
     def validate_slide_layout_ids(self):
         """Validate that sldLayoutId elements in slide masters reference valid slide layouts."""
-        import lxml.etree
-
         errors = []
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = self._folder_parts("ppt/slideMasters", ".xml")
 
         if not slide_masters:
             if self.verbose:
@@ -140,52 +121,16 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             return True
 
         for slide_master in slide_masters:
-            try:
-                # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
-
-                # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
-
-                if not rels_file.exists():
-                    errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
-                    )
-                    continue
-
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
-
-                # Find all sldLayoutId elements in the slide master
-                for sld_layout_id in root.findall(
-                    f".//{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
-                ):
-                    r_id = sld_layout_id.get(
-                        f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
-                    )
-                    layout_id = sld_layout_id.get("id")
-
-                    if r_id and r_id not in valid_layout_rids:
-                        errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
+            # Find the corresponding _rels file for this slide master
+            rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+            errors.extend(
+                self._part_result(
+                    "slide_layout_ids",
+                    slide_master,
+                    lambda: self._slide_layout_id_errors(slide_master, rels_file),
+                    depends_on=[rels_file],
                 )
+            )
 
         if errors:
             print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
@@ -200,35 +145,68 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All slide layout IDs reference valid slide layouts")
             return True
 
-    def validate_no_duplicate_slide_layouts(self):
-        """Validate that each slide has exactly one slideLayout reference."""
+    def _slide_layout_id_errors(self, slide_master, rels_file):
+        """Return invalid sldLayoutId references in a single slide master."""
         import lxml.etree
 
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
-
-        for rels_file in slide_rels_files:
-            try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Find all slideLayout relationships
-                layout_rels = [
-                    rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
-                ]
-
-                if len(layout_rels) > 1:
+        try:
+            # Parse the slide master file
+            root = self._parse_xml(slide_master).getroot()
+
+            # Look up the slide master's relationships in the package graph
+            graph = self.package_graph
+            rels_part = self._part_name(rels_file)
+            if not graph.has_part(rels_part):
+                errors.append(
+                    f"  {slide_master.relative_to(self.unpacked_dir)}: "
+                    f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                )
+                return errors
+            if rels_part in graph.rels_errors:
+                raise graph.rels_errors[rels_part]
+
+            # Build a set of valid relationship IDs that point to slide layouts
+            valid_layout_rids = {
+                rel.id
+                for rel in graph.relationships_in(rels_part)
+                if "slideLayout" in rel.type
+            }
+
+            # Find all sldLayoutId elements in the slide master
+            for sld_layout_id in root.findall(
+                f".//{{{self.PRESENTATIONML_NAMESPACE}}}sldLayoutId"
+            ):
+                r_id = sld_layout_id.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
+                layout_id = sld_layout_id.get("id")
+
+                if r_id and r_id not in valid_layout_rids:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
+                        f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
+                        f"references r:id='{r_id}' which is not found in slide layout relationships"
                     )
 
-            except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            errors.append(
+                f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
+            )
+
+        return errors
+
+    def validate_no_duplicate_slide_layouts(self):
+        """Validate that each slide has exactly one slideLayout reference."""
+        errors = []
+        slide_rels_files = self._folder_parts("ppt/slides/_rels", ".xml.rels")
+
+        for rels_file in slide_rels_files:
+            errors.extend(
+                self._part_result(
+                    "slide_layouts",
+                    rels_file,
+                    lambda: self._duplicate_slide_layout_errors(rels_file),
                 )
+            )
 
         if errors:
             print("FAILED - Found slides with duplicate slideLayout references:")
@@ -240,15 +218,38 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All slides have exactly one slideLayout reference")
             return True
 
+    def _duplicate_slide_layout_errors(self, rels_file):
+        """Return an error if a slide's .rels file has more than one slideLayout."""
+        graph = self.package_graph
+        rels_part = self._part_name(rels_file)
+        try:
+            if rels_part in graph.rels_errors:
+                raise graph.rels_errors[rels_part]
+
+            # Find all slideLayout relationships
+            layout_rels = [
+                rel
+                for rel in graph.relationships_in(rels_part)
+                if "slideLayout" in rel.type
+            ]
+
+            if len(layout_rels) > 1:
+                return [
+                    f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                ]
+
+        except Exception as e:
+            return [f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"]
+
+        return []
+
     def validate_notes_slide_references(self):
         """Validate that each notesSlide file is referenced by only one slide."""
-        import lxml.etree
-
         errors = []
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = self._folder_parts("ppt/slides/_rels", ".xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -256,36 +257,21 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             return True
 
         for rels_file in slide_rels_files:
-            try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
-                        if target:
-                            # Normalize the target path to handle relative paths
-                            normalized_target = target.replace("../", "")
-
-                            # Track which slide references this notesSlide
-                            slide_name = rels_file.stem.replace(
-                                ".xml", ""
-                            )  # e.g., "slide1"
-
-                            if normalized_target not in notes_slide_references:
-                                notes_slide_references[normalized_target] = []
-                            notes_slide_references[normalized_target].append(
-                                (slide_name, rels_file)
-                            )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+            # Per-file targets are cached; duplicates are found across files here
+            entries = self._part_result(
+                "notes_slides", rels_file, lambda: self._notes_slide_targets(rels_file)
+            )
+            for kind, value in entries:
+                if kind == "error":
+                    errors.append(value)
+                    continue
+
+                # Track which slide references this notesSlide
+                slide_name = rels_file.stem.replace(".xml", "")  # e.g., "slide1"
+
+                if value not in notes_slide_references:
+                    notes_slide_references[value] = []
+                notes_slide_references[value].append((slide_name, rels_file))
 
         # Check for duplicate references
         for target, references in notes_slide_references.items():
@@ -310,6 +296,32 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All notes slide references are unique")
             return True
 
+    def _notes_slide_targets(self, rels_file):
+        """Return the notesSlide targets of a slide's .rels file.
+
+        Returns a list of ["target", normalized_target] and ["error", message]
+        entries in document order.
+        """
+        graph = self.package_graph
+        rels_part = self._part_name(rels_file)
+        if rels_part in graph.rels_errors:
+            return [
+                [
+                    "error",
+                    f"  {rels_file.relative_to(self.unpacked_dir)}: "
+                    f"Error: {graph.rels_errors[rels_part]}",
+                ]
+            ]
+
+        # Find all notesSlide relationships
+        entries = []
+        for rel in graph.relationships_in(rels_part):
+            if "notesSlide" in rel.type and rel.target:
+                # Normalize the target path to handle relative paths
+                entries.append(["target", rel.target.replace("../", "")])
+
+        return entries
+
 
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,183 @@
+"""
+Timing and memory instrumentation for validation runs.
+
+A ValidationProfiler records wall time, CPU time, bytes parsed and optionally
+peak traced memory for nested measurements: validators, the checks they run,
+the parts each check visits and expensive phases such as schema compilation.
+Records are written as JSON and summarised as a top-N table.
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Bump when the layout of the JSON report changes
+PROFILE_VERSION = 1
+
+
+class ValidationProfiler:
+    """Collects nested cost measurements of a validation run."""
+
+    def __init__(self, track_memory=False):
+        """
+        Args:
+            track_memory: If True, trace Python allocations to report peak
+                memory per measurement. Tracing slows Python code down several
+                times and does not see libxml2's own allocations, so it is off
+                by default; the report always includes the process peak RSS.
+        """
+        self.records = []
+        self._stack = []
+        self._started_tracing = False
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def measure(self, kind, name):
+        """Record the cost of the enclosed block.
+
+        Args:
+            kind: 'validator', 'check', 'part' or 'phase'
+            name: Validator class, check method, part name or phase name
+        """
+        record = {
+            "kind": kind,
+            "name": name,
+            "check": self._enclosing("check"),
+            "part": self._enclosing("part"),
+            "wall": 0.0,
+            "cpu": 0.0,
+            "bytes": 0,
+            "peak_memory": None,
+        }
+        if self.track_memory:
+            # The enclosing measurement keeps the peak reached so far
+            if self._stack:
+                self._note_peak(self._stack[-1])
+            tracemalloc.reset_peak()
+            record["peak_memory"] = 0
+        self._stack.append(record)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall"] = time.perf_counter() - wall
+            record["cpu"] = time.process_time() - cpu
+            self._stack.pop()
+            if self.track_memory:
+                self._note_peak(record)
+                tracemalloc.reset_peak()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["bytes"] += record["bytes"]
+                if self.track_memory:
+                    parent["peak_memory"] = max(
+                        parent["peak_memory"], record["peak_memory"]
+                    )
+            self.records.append(record)
+
+    def add_bytes(self, count):
+        """Attribute count parsed bytes to the innermost measurement."""
+        if self._stack:
+            self._stack[-1]["bytes"] += count
+
+    def merge(self, records):
+        """Add records measured elsewhere (e.g. in a worker process) under the current measurement."""
+        check = self._enclosing("check")
+        part = self._enclosing("part")
+        for record in records:
+            record = dict(record)
+            record["check"] = record["check"] or check
+            record["part"] = record["part"] or part
+            if self._stack and record["kind"] == "part":
+                self._stack[-1]["bytes"] += record["bytes"]
+            self.records.append(record)
+
+    def pop_records(self):
+        """Return and forget the records collected so far."""
+        records, self.records = self.records, []
+        return records
+
+    def close(self):
+        """Stop tracing allocations if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def write(self, path):
+        """Write all records as a JSON report."""
+        report = {
+            "version": PROFILE_VERSION,
+            "memory_tracked": self.track_memory,
+            "max_rss": _max_rss(),
+            "records": self.records,
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    def print_summary(self, top=10):
+        """Print the most expensive checks, parts and phases by wall time."""
+        print(f"Profile (top {top} by wall time):")
+        for kind, title in (
+            ("check", "Checks"),
+            ("part", "Parts"),
+            ("phase", "Phases"),
+        ):
+            records = sorted(
+                (r for r in self.records if r["kind"] == kind),
+                key=lambda r: r["wall"],
+                reverse=True,
+            )[:top]
+            if not records:
+                continue
+            print(f"  {title}:")
+            for record in records:
+                print(f"    {_format_record(record)}")
+        max_rss = _max_rss()
+        if max_rss is not None:
+            print(f"  Peak RSS: {max_rss / 1048576:.1f} MiB")
+
+    def _enclosing(self, kind):
+        for record in reversed(self._stack):
+            if record["kind"] == kind:
+                return record["name"]
+        return None
+
+    def _note_peak(self, record):
+        record["peak_memory"] = max(
+            record["peak_memory"], tracemalloc.get_traced_memory()[1]
+        )
+
+
+def _max_rss():
+    """Return the peak resident set size of this process in bytes, if known."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _format_record(record):
+    columns = [
+        f"{record['wall'] * 1000:9.1f} ms wall",
+        f"{record['cpu'] * 1000:9.1f} ms cpu",
+        f"{record['bytes'] / 1024:9.1f} KiB parsed",
+    ]
+    if record["peak_memory"] is not None:
+        columns.append(f"{record['peak_memory'] / 1048576:7.1f} MiB peak")
+    label = record["name"]
+    if record["kind"] != "check" and record["check"]:
+        label += f" ({record['check']})"
+    return "  ".join(columns) + f"  {label}"
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -2,19 +2,59 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
+import hashlib
+import io
+from collections import OrderedDict, namedtuple
 from pathlib import Path
+from xml.sax import SAXParseException
+from xml.sax.handler import ContentHandler, feature_namespaces
+
+import defusedxml.sax
+
+from .baseline import BaselineCache
+from .package import ZipPackage, open_package
+from .worddiff import MAX_DIFF_LINES, changed_paragraphs, format_changes
+
+# Per-paragraph digests of a document's text once an author's tracked changes
+# are removed:
+#   digests: blake2b digest of each non-empty paragraph, in document order
+#   ordinals: Position of each of those paragraphs among all w:p elements
+#   has_author_changes: Whether the document has tracked changes by the author
+TextFingerprint = namedtuple(
+    "TextFingerprint", ["digests", "ordinals", "has_author_changes"]
+)
+
+# Fingerprints of recently used original documents, keyed by resolved path,
+# with the (mtime, size) they were computed for. Validating many edits of one
+# original in a process (e.g. with batch.py) parses it once.
+_original_fingerprints = OrderedDict()
+
+# Originals whose fingerprints are kept in _original_fingerprints
+ORIGINAL_FINGERPRINT_CACHE_SIZE = 16
 
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+    def __init__(
+        self, unpacked_dir, original_docx, verbose=False, baseline_cache_dir=None
+    ):
+        """
+        Args:
+            unpacked_dir: Document to validate: an unpacked directory, a
+                packaged .docx or an in-memory package
+            original_docx: Path to the original .docx
+            verbose: Enable verbose output
+            baseline_cache_dir: Optional directory keeping the fingerprint of
+                the original across runs (see validation.baseline)
+        """
+        self.package = open_package(unpacked_dir)
+        self.unpacked_dir = self.package.root
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.baseline_cache_dir = (
+            Path(baseline_cache_dir) if baseline_cache_dir else None
+        )
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -23,96 +63,53 @@ class RedliningValidator:
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
+        if not self.package.exists("word/document.xml"):
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
+        modified_content = self.package.read("word/document.xml")
 
-        # First, check if there are any tracked changes by Claude to validate
+        # Fingerprint the text that remains once Claude's tracked changes are
+        # removed, in one streaming pass that also tells whether there are
+        # any changes by Claude
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
+            modified = self._fingerprint(modified_content)
+        except SAXParseException as e:
+            parse_error = e
+        else:
+            parse_error = None
             # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
+            if not modified.has_author_changes:
                 if self.verbose:
                     print("PASSED - No tracked changes by Claude found.")
                 return True
 
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        try:
+            if parse_error:
+                # Reported after the original has been checked, as before
+                self._original_content()
+                raise parse_error
+            original = self._original_fingerprint()
+        except SAXParseException as e:
+            print(
+                f"FAILED - Error parsing XML files: {e.getMessage()}: "
+                f"line {e.getLineNumber()}, column {e.getColumnNumber()}"
+            )
+            return False
+        except _OriginalUnavailable as e:
+            print(f"FAILED - {e}")
+            return False
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+        # Paragraph text is only materialised for mismatching paragraphs
+        if modified.digests != original.digests:
+            print(self._generate_detailed_diff(original, modified, modified_content))
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+    def _generate_detailed_diff(self, original, modified, modified_content):
+        """Generate detailed character-level differences of the changed paragraphs."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,152 +124,227 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        # Re-read the text of the changed paragraphs that will be shown
+        changes = changed_paragraphs(original.digests, modified.digests)
+        shown = changes[:MAX_DIFF_LINES]
+        original_texts = self._paragraph_texts(
+            self._original_content(), original, {i for i, _ in shown if i is not None}
+        )
+        modified_texts = self._paragraph_texts(
+            modified_content, modified, {j for _, j in shown if j is not None}
+        )
+
+        # Show a character-level diff of the changed paragraphs
+        error_parts.extend(
+            [
+                "Differences:",
+                "============",
+                format_changes(changes, original_texts, modified_texts),
+            ]
+        )
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
+    def _original_content(self):
+        """Read the original document.xml straight from the docx."""
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
+            with ZipPackage(self.original_docx) as package:
+                content = None
+                if package.exists("word/document.xml"):
+                    content = package.read("word/document.xml")
+        except Exception as e:
+            raise _OriginalUnavailable(f"Error reading original docx: {e}")
+        if content is None:
+            raise _OriginalUnavailable(
+                f"Original document.xml not found in {self.original_docx}"
+            )
+        return content
+
+    def _original_fingerprint(self):
+        """Return the original's fingerprint, reusing it while the docx is unchanged.
+
+        Fingerprints are kept in process for recently used originals and, with
+        a baseline cache, stored under the SHA-256 of the original docx.
+        """
+        path = self.original_docx.resolve()
+        try:
+            stat = path.stat()
+        except OSError as e:
+            raise _OriginalUnavailable(f"Error reading original docx: {e}")
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = _original_fingerprints.get(path)
+        if cached is not None and cached[0] == stamp:
+            _original_fingerprints.move_to_end(path)
+            return cached[1]
+
+        cache = self._baseline_cache(path)
+        stored = cache.get("fingerprint", "word/document.xml") if cache else None
+        if stored is not None:
+            fingerprint = TextFingerprint(
+                [bytes.fromhex(digest) for digest in stored["digests"]],
+                stored["ordinals"],
+                stored["has_author_changes"],
+            )
+        else:
+            fingerprint = self._fingerprint(self._original_content())
+            if cache:
+                cache.put(
+                    "fingerprint",
+                    "word/document.xml",
+                    {
+                        "digests": [digest.hex() for digest in fingerprint.digests],
+                        "ordinals": fingerprint.ordinals,
+                        "has_author_changes": fingerprint.has_author_changes,
+                    },
                 )
 
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
+        _original_fingerprints[path] = (stamp, fingerprint)
+        if len(_original_fingerprints) > ORIGINAL_FINGERPRINT_CACHE_SIZE:
+            _original_fingerprints.popitem(last=False)
+        return fingerprint
 
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
+    def _baseline_cache(self, path):
+        """Return the BaselineCache of the original, or None if not caching baselines."""
+        if not self.baseline_cache_dir:
+            return None
+        try:
+            original_digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError as e:
+            raise _OriginalUnavailable(f"Error reading original docx: {e}")
+        # Fingerprints depend on the original and on how this module computes them
+        code = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+        return BaselineCache(
+            self.baseline_cache_dir,
+            original_digest,
+            {"validator": type(self).__name__, "code": code},
+        )
+
+    def _fingerprint(self, content):
+        """Return the paragraph fingerprint of a document without Claude's tracked changes.
+
+        In a single streaming pass, Claude's w:ins elements are dropped and
+        the content of Claude's w:del elements is kept, w:delText counting as
+        w:t. Empty paragraphs are skipped to avoid false positives when
+        tracked insertions add only structural elements without text content.
+
+        Args:
+            content: The bytes of word/document.xml
+
+        Returns:
+            TextFingerprint: Digests of the remaining non-empty paragraphs
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        handler = self._parse(content)
+        paragraphs = [p for p in handler.paragraphs if p.length]
+        return TextFingerprint(
+            [p.hash.digest() for p in paragraphs],
+            [p.ordinal for p in paragraphs],
+            handler.found,
+        )
+
+    def _paragraph_texts(self, content, fingerprint, indices):
+        """Return {index: text} for the given paragraphs of a fingerprinted document."""
+        ordinals = {fingerprint.ordinals[i]: i for i in indices}
+        handler = self._parse(content, keep_text=ordinals.keys())
+        return {
+            ordinals[p.ordinal]: "".join(p.parts)
+            for p in handler.paragraphs
+            if p.ordinal in ordinals
+        }
+
+    def _parse(self, content, keep_text=()):
+        handler = _AcceptedTextHandler(self.namespaces["w"], "Claude", keep_text)
+        parser = defusedxml.sax.make_parser()
+        parser.setFeature(feature_namespaces, True)
+        parser.setContentHandler(handler)
+        parser.parse(io.BytesIO(content))
+        return handler
+
+
+class _OriginalUnavailable(Exception):
+    """The original document.xml could not be read."""
+
+
+class _Paragraph:
+    """Digest, and optionally text, of one paragraph being streamed."""
+
+    def __init__(self, ordinal, keep_text):
+        self.ordinal = ordinal
+        self.hash = hashlib.blake2b(digest_size=16)
+        self.length = 0
+        self.parts = [] if keep_text else None
+
+
+class _AcceptedTextHandler(ContentHandler):
+    """SAX handler fingerprinting paragraph text without one author's changes.
+
+    The text of a paragraph is that of every w:t (and, inside the author's
+    w:del, w:delText) up to its first child element, including paragraphs
+    nested in it, so each text run is added to all open paragraphs. Text is
+    hashed as it streams by and only kept for the paragraphs asked for.
+    """
+
+    def __init__(self, namespace, author, keep_text=()):
+        super().__init__()
+        self.namespace = namespace
+        self.author_attr = (namespace, "author")
+        self.author = author
+        self.keep_text = keep_text
+        self.found = False
+        # Every paragraph, in document order
+        self.paragraphs = []
+        self.open_paragraphs = []
+        # What each open element is: 'p', 'del' (the author's), or None
+        self.open_elements = []
+        # Depth inside the author's w:ins, whose content is dropped
+        self.skip_depth = 0
+        self.del_depth = 0
+        self.collecting = False
+
+    def startElementNS(self, name, qname, attrs):
+        self.collecting = False
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+        uri, local = name
+        kind = None
+        if uri == self.namespace:
+            if local in ("ins", "del") and attrs.get(self.author_attr) == self.author:
+                self.found = True
+                if local == "ins":
+                    self.skip_depth = 1
+                    return
+                kind = "del"
+                self.del_depth += 1
+            elif local == "p":
+                kind = "p"
+                ordinal = len(self.paragraphs)
+                paragraph = _Paragraph(ordinal, ordinal in self.keep_text)
+                self.paragraphs.append(paragraph)
+                self.open_paragraphs.append(paragraph)
+            elif local == "t" or (local == "delText" and self.del_depth):
+                self.collecting = True
+        self.open_elements.append(kind)
+
+    def endElementNS(self, name, qname):
+        self.collecting = False
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        kind = self.open_elements.pop()
+        if kind == "p":
+            self.open_paragraphs.pop()
+        elif kind == "del":
+            self.del_depth -= 1
+
+    def characters(self, content):
+        if not self.collecting or not content:
+            return
+        data = content.encode()
+        for paragraph in self.open_paragraphs:
+            paragraph.hash.update(data)
+            paragraph.length += len(content)
+            if paragraph.parts is not None:
+                paragraph.parts.append(content)
 
 
 if __name__ == "__main__":
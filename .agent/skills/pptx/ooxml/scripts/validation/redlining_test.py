@@ -0,0 +1,95 @@
+import contextlib
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from validation import redlining
+from validation.redlining import RedliningValidator
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+ORIGINAL = (
+    f'<w:document xmlns:w="{W}"><w:body>'
+    "<w:p><w:r><w:t>The cat sat</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>on the mat</w:t></w:r></w:p>"
+    "</w:body></w:document>"
+)
+# Tracked insertion by Claude, so the text without it matches the original
+TRACKED = ORIGINAL.replace(
+    "<w:t>on the mat</w:t></w:r>",
+    '<w:t>on the mat</w:t></w:r><w:ins w:id="1" w:author="Claude">'
+    "<w:r><w:t> today</w:t></w:r></w:ins>",
+)
+# The same insertion, plus an untracked change
+UNTRACKED = TRACKED.replace("The cat sat", "The dog sat")
+
+
+class TestOriginalFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.original = self.root / "original.docx"
+        with zipfile.ZipFile(self.original, "w") as zf:
+            zf.writestr("word/document.xml", ORIGINAL)
+        self.cache_dir = self.root / "cache"
+        redlining._original_fingerprints.clear()
+        self.addCleanup(redlining._original_fingerprints.clear)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def validate(self, document, cache_dir=None):
+        """Validate an in-memory edit; returns (passed, original parses)."""
+        validator = RedliningValidator(
+            {"word/document.xml": document.encode()},
+            self.original,
+            baseline_cache_dir=cache_dir,
+        )
+        with mock.patch.object(
+            RedliningValidator,
+            "_original_content",
+            autospec=True,
+            side_effect=RedliningValidator._original_content,
+        ) as read, contextlib.redirect_stdout(io.StringIO()):
+            passed = validator.validate()
+        return passed, read.call_count
+
+    def test_fingerprint_is_stored_in_baseline_cache(self):
+        self.assertEqual(self.validate(TRACKED, self.cache_dir), (True, 1))
+        # A new process: nothing is kept in memory, the cache dir remains
+        redlining._original_fingerprints.clear()
+        self.assertEqual(self.validate(TRACKED, self.cache_dir), (True, 0))
+
+    def test_cached_fingerprint_still_detects_untracked_changes(self):
+        self.validate(TRACKED, self.cache_dir)
+        redlining._original_fingerprints.clear()
+        passed, _ = self.validate(UNTRACKED, self.cache_dir)
+        self.assertFalse(passed)
+
+    def test_without_cache_dir_fingerprint_is_kept_in_process(self):
+        self.assertEqual(self.validate(TRACKED), (True, 1))
+        self.assertEqual(self.validate(TRACKED), (True, 0))
+        redlining._original_fingerprints.clear()
+        self.assertEqual(self.validate(TRACKED), (True, 1))
+
+    def test_in_process_cache_is_bounded(self):
+        originals = []
+        for i in range(redlining.ORIGINAL_FINGERPRINT_CACHE_SIZE + 3):
+            original = self.root / f"original-{i}.docx"
+            with zipfile.ZipFile(original, "w") as zf:
+                zf.writestr("word/document.xml", ORIGINAL)
+            originals.append(original)
+            self.original = original
+            self.validate(TRACKED)
+        self.assertEqual(
+            len(redlining._original_fingerprints),
+            redlining.ORIGINAL_FINGERPRINT_CACHE_SIZE,
+        )
+        self.assertNotIn(originals[0].resolve(), redlining._original_fingerprints)
+        self.assertIn(originals[-1].resolve(), redlining._original_fingerprints)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Content checks of a Word document.xml sharing a single traversal.
+
+Each check is a DocumentRule that names the WordprocessingML elements it
+wants to see. run_document_rules walks the parsed tree once, visiting only
+elements some rule asked for, and hands each to those rules in document
+order. A new check is a new rule, not another pass over the document.
+"""
+
+import re
+
+import lxml.etree
+
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+NAMESPACES = {"w": WORD_NAMESPACE}
+
+# Qualified tags of the elements the rules visit
+P = f"{{{WORD_NAMESPACE}}}p"
+T = f"{{{WORD_NAMESPACE}}}t"
+DEL = f"{{{WORD_NAMESPACE}}}del"
+DEL_TEXT = f"{{{WORD_NAMESPACE}}}delText"
+INS = f"{{{WORD_NAMESPACE}}}ins"
+
+# Ancestor tests, compiled once and evaluated only for candidate elements
+IN_DELETION = lxml.etree.XPath("boolean(ancestor::w:del)", namespaces=NAMESPACES)
+IN_INSERTION_ONLY = lxml.etree.XPath(
+    "boolean(ancestor::w:ins) and not(ancestor::w:del)", namespaces=NAMESPACES
+)
+
+# Text starting or ending with whitespace; the second branch is re.match's
+# r".*\s$", which does not look past a newline
+EDGE_WHITESPACE = re.compile(r"\s|.*\s$")
+
+
+class DocumentRule:
+    """A check of document.xml run during the shared traversal.
+
+    Subclasses set name (the key of their result), tags (qualified tags of
+    the elements to visit) and implement visit(). result()
+    returns JSON-serialisable data, by default the list of error lines.
+    """
+
+    name = None
+    tags = ()
+
+    def __init__(self, location):
+        """
+        Args:
+            location: Part name used in error messages
+        """
+        self.location = location
+        self.errors = []
+
+    def visit(self, elem, walk):
+        """Inspect one element; walk tells which elements were seen before it."""
+        raise NotImplementedError("Subclasses must implement visit")
+
+    def result(self):
+        return self.errors
+
+    def error(self, elem, message):
+        self.errors.append(f"  {self.location}: Line {elem.sourceline}: {message}")
+
+
+class WhitespaceRule(DocumentRule):
+    """w:t elements with leading or trailing whitespace need xml:space='preserve'."""
+
+    name = "whitespace"
+    tags = (T,)
+
+    def visit(self, elem, walk):
+        text = elem.text
+        if not text or not (text[0].isspace() or text[-1].isspace()):
+            return
+        if EDGE_WHITESPACE.match(text) and elem.get(XML_SPACE) != "preserve":
+            self.error(
+                elem,
+                "w:t element with whitespace missing xml:space='preserve': "
+                + _preview(text),
+            )
+
+
+class DeletionRule(DocumentRule):
+    """w:t must not occur within w:del; XSD validation does not catch this."""
+
+    name = "deletions"
+    tags = (T, DEL)
+
+    def visit(self, elem, walk):
+        if elem.tag != T or not elem.text:
+            return
+        # Only elements after a w:del can be inside one
+        if walk.seen(DEL) and IN_DELETION(elem):
+            self.error(elem, f"<w:t> found within <w:del>: {_preview(elem.text)}")
+
+
+class InsertionRule(DocumentRule):
+    """w:delText is only allowed in w:ins if nested within a w:del."""
+
+    name = "insertions"
+    tags = (DEL_TEXT, INS)
+
+    def visit(self, elem, walk):
+        if elem.tag != DEL_TEXT:
+            return
+        if walk.seen(INS) and IN_INSERTION_ONLY(elem):
+            self.error(
+                elem, f"<w:delText> within <w:ins>: {_preview(elem.text or '')}"
+            )
+
+
+class ParagraphCountRule(DocumentRule):
+    """Counts w:p elements."""
+
+    name = "paragraphs"
+    tags = (P,)
+
+    def __init__(self, location):
+        super().__init__(location)
+        self.count = 0
+
+    def visit(self, elem, walk):
+        self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class DocumentWalk:
+    """State of a traversal shared by the rules visiting its elements."""
+
+    def __init__(self):
+        # Qualified tags of the elements visited so far
+        self.seen_tags = set()
+
+    def seen(self, tag):
+        """Whether an element of a visited kind has occurred so far, in document order."""
+        return tag in self.seen_tags
+
+
+def run_document_rules(root, rule_classes, location):
+    """Run rules over the descendants of a document.xml root in one traversal.
+
+    Args:
+        root: Root element of the parsed document.xml
+        rule_classes: DocumentRule subclasses to run
+        location: Part name used in error messages
+
+    Returns:
+        dict: Each rule's result, keyed by its name
+    """
+    rules = [rule_class(location) for rule_class in rule_classes]
+    walk = DocumentWalk()
+    dispatch = {}
+    for rule in rules:
+        for tag in rule.tags:
+            dispatch.setdefault(tag, []).append(rule.visit)
+
+    for elem in root.iter(*dispatch):
+        if elem is root:
+            continue
+        tag = elem.tag
+        for visit in dispatch[tag]:
+            visit(elem, walk)
+        walk.seen_tags.add(tag)
+    return {rule.name: rule.result() for rule in rules}
+
+
+def _preview(text):
+    """Return the repr of text, shortened to 50 characters."""
+    preview = repr(text)
+    return preview[:50] + "..." if len(preview) > 50 else preview
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
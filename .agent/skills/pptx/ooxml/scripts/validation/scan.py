@@ -0,0 +1,134 @@
+"""
+Single streaming pass over an XML part for the lightweight validation checks.
+"""
+
+import re
+
+import lxml.etree
+
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+
+# UUID pattern: 8-4-4-4-12 hex digits with optional braces/hyphens
+UUID_PATTERN = re.compile(
+    r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
+)
+
+
+def looks_like_uuid(value):
+    """Check if a value has the general structure of a UUID."""
+    # Remove common UUID delimiters
+    clean_value = value.strip("{}()").replace("-", "")
+    # Check if it's 32 hex-like characters (could include invalid hex chars)
+    return len(clean_value) == 32 and all(c.isalnum() for c in clean_value)
+
+
+class PartScan:
+    """Facts about one XML part, gathered in a single streaming pass.
+
+    Attributes:
+        error: Exception raised while parsing (e.g. XMLSyntaxError), or None.
+            Facts gathered before the error are kept.
+        root_tag: Qualified tag of the root element
+        declared_prefixes: Namespace prefixes declared on the root element
+        ignorable: Prefixes listed in the root's Ignorable attributes
+        ids: (scope, tag, attr_name, id_value, line) for elements with ID
+            uniqueness requirements, outside mc:AlternateContent, in
+            document order
+        relationship_refs: (element_name, r_id, line) for every r:id attribute
+        invalid_uuids: (value, line) for ID attributes that look like UUIDs
+            but contain invalid hex characters
+    """
+
+    def __init__(self):
+        self.error = None
+        self.root_tag = None
+        self.declared_prefixes = set()
+        self.ignorable = []
+        self.ids = []
+        self.relationship_refs = []
+        self.invalid_uuids = []
+
+
+def scan_part(xml_file, unique_id_requirements):
+    """Scan an XML part with iterparse, clearing elements as it goes.
+
+    Memory stays bounded by the depth of the document rather than its size,
+    so even very large parts are checked without building a full tree.
+
+    Args:
+        xml_file: Path to the XML part, or a binary file object reading it
+        unique_id_requirements: Mapping of lowercase element name to
+            (attribute_name, scope), as BaseSchemaValidator.UNIQUE_ID_REQUIREMENTS
+
+    Returns:
+        PartScan: The facts gathered from the part
+    """
+    scan = PartScan()
+    mc_tag = f"{{{MC_NAMESPACE}}}AlternateContent"
+    rid_attr = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+    mc_depth = 0  # Nesting depth inside mc:AlternateContent
+
+    try:
+        source = xml_file if hasattr(xml_file, "read") else str(xml_file)
+        for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+            tag = elem.tag
+
+            if event == "end":
+                if tag == mc_tag:
+                    mc_depth -= 1
+                # Drop finished content so memory stays bounded
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+                continue
+
+            if scan.root_tag is None:
+                scan.root_tag = tag
+                scan.declared_prefixes = set(elem.nsmap.keys()) - {None}
+                for attr, value in elem.attrib.items():
+                    if attr.endswith("Ignorable"):
+                        scan.ignorable.extend(value.split())
+
+            if tag == mc_tag:
+                mc_depth += 1
+
+            local_tag = tag.split("}")[-1] if "}" in tag else tag
+            line = elem.sourceline
+
+            # Unique ID requirements, ignoring mc:AlternateContent subtrees
+            requirement = unique_id_requirements.get(local_tag.lower())
+            if requirement is not None and not mc_depth:
+                attr_name, scope = requirement
+                for attr, value in elem.attrib.items():
+                    attr_local = (
+                        attr.split("}")[-1].lower() if "}" in attr else attr.lower()
+                    )
+                    if attr_local == attr_name:
+                        scan.ids.append((scope, local_tag.lower(), attr_name, value, line))
+                        break
+
+            # Relationship references
+            r_id = elem.get(rid_attr)
+            if r_id:
+                scan.relationship_refs.append((local_tag, r_id, line))
+
+            # ID attributes that look like UUIDs must contain only hex values
+            for attr, value in elem.attrib.items():
+                attr_name = attr.split("}")[-1].lower()
+                if attr_name.endswith("id") and looks_like_uuid(value):
+                    if not UUID_PATTERN.match(value):
+                        scan.invalid_uuids.append((value, line))
+
+    except Exception as e:
+        scan.error = e
+
+    return scan
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,1302 @@
+"""
+Precompiled content models for a fast structural check of XML parts.
+
+compile_schema turns an XSD (and everything it imports) into per-type
+content-model automata, attribute tables and simple type facets that can be
+serialised as JSON. StructureModel then checks a part against them in one
+streaming pass. The check is conservative: anything it cannot confirm is
+reported as a violation, so callers fall back to full XSD validation.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+import lxml.etree
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# Bump when the compiled format or the compiler's semantics change
+MODEL_VERSION = 2
+
+# Content models larger than this (after expanding bounded repeats) are not
+# compiled; parts using them always fall back to full XSD validation
+MAX_POSITIONS = 5000
+
+# Whitespace handling of the built-in types in use by the OOXML schemas
+BUILTIN_WHITESPACE = {
+    "anySimpleType": "preserve",
+    "string": "preserve",
+    "token": "collapse",
+    "NCName": "collapse",
+    "ID": "collapse",
+    "language": "collapse",
+    "anyURI": "collapse",
+    "boolean": "collapse",
+    "decimal": "collapse",
+    "integer": "collapse",
+    "nonNegativeInteger": "collapse",
+    "positiveInteger": "collapse",
+    "long": "collapse",
+    "int": "collapse",
+    "short": "collapse",
+    "byte": "collapse",
+    "unsignedLong": "collapse",
+    "unsignedInt": "collapse",
+    "unsignedShort": "collapse",
+    "unsignedByte": "collapse",
+    "double": "collapse",
+    "float": "collapse",
+    "hexBinary": "collapse",
+    "base64Binary": "collapse",
+    "dateTime": "collapse",
+}
+
+# Value ranges of the built-in integer types (None for unbounded)
+INTEGER_RANGES = {
+    "integer": (None, None),
+    "nonNegativeInteger": (0, None),
+    "positiveInteger": (1, None),
+    "long": (-(2**63), 2**63 - 1),
+    "int": (-(2**31), 2**31 - 1),
+    "short": (-(2**15), 2**15 - 1),
+    "byte": (-128, 127),
+    "unsignedLong": (0, 2**64 - 1),
+    "unsignedInt": (0, 2**32 - 1),
+    "unsignedShort": (0, 2**16 - 1),
+    "unsignedByte": (0, 255),
+}
+
+INTEGER_PATTERN = re.compile(r"[+-]?[0-9]+")
+DECIMAL_PATTERN = re.compile(r"[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)")
+DOUBLE_PATTERN = re.compile(
+    r"[+-]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][+-]?[0-9]+)?|-?INF|NaN"
+)
+HEX_BINARY_PATTERN = re.compile(r"([0-9a-fA-F]{2})*")
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/ ]*={0,2}")
+# ASCII NCNames only; names with other characters are left to XSD validation,
+# as libxml2's Unicode name classes differ from Python's \w
+NCNAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-]*")
+LANGUAGE_PATTERN = re.compile(r"[a-zA-Z]{1,8}(-[a-zA-Z0-9]{1,8})*")
+DATETIME_PATTERN = re.compile(
+    r"(-?[0-9]{4,})-([0-9]{2})-([0-9]{2})T([0-9]{2}):([0-9]{2}):([0-9]{2})(\.[0-9]+)?"
+    r"(Z|[+-][0-9]{2}:[0-9]{2})?"
+)
+
+# Text that XSD treats as whitespace
+XML_WHITESPACE = " \t\r\n"
+XML_WHITESPACE_PATTERN = re.compile(r"[ \t\r\n]+")
+
+
+class UnsupportedSchema(Exception):
+    """Raised for schema constructs the structural model does not represent."""
+
+
+def _local(node):
+    return lxml.etree.QName(node).localname
+
+
+def _qualify(namespace, name):
+    return f"{{{namespace}}}{name}" if namespace else name
+
+
+def _xsd_children(node):
+    """Return the XSD child elements of a node, skipping annotations."""
+    return [
+        child
+        for child in node
+        if isinstance(child.tag, str)
+        and lxml.etree.QName(child).namespace == XSD_NAMESPACE
+        and _local(child) != "annotation"
+    ]
+
+
+def _resolve(node, value):
+    """Resolve a QName attribute value to a component id.
+
+    Built-in XSD types become 'xsd:<name>'; everything else '{namespace}name'.
+    """
+    prefix, _, local = value.rpartition(":")
+    # The xml prefix is bound implicitly
+    namespace = XML_NAMESPACE if prefix == "xml" else node.nsmap.get(prefix or None)
+    if prefix and namespace is None:
+        raise UnsupportedSchema(f"Undeclared prefix in {value}")
+    if namespace == XSD_NAMESPACE:
+        return f"xsd:{local}"
+    return _qualify(namespace, local)
+
+
+def _occurs(node):
+    min_occurs = int(node.get("minOccurs", "1"))
+    max_occurs = node.get("maxOccurs", "1")
+    return min_occurs, None if max_occurs == "unbounded" else int(max_occurs)
+
+
+class _SchemaInfo:
+    """Settings of the schema document a component is declared in."""
+
+    def __init__(self, root):
+        self.target_namespace = root.get("targetNamespace", "")
+        self.qualified_elements = root.get("elementFormDefault") == "qualified"
+        self.qualified_attributes = root.get("attributeFormDefault") == "qualified"
+
+
+class _SchemaSet:
+    """Global components of a schema and every schema it imports."""
+
+    KINDS = ("element", "complexType", "simpleType", "group", "attributeGroup", "attribute")
+
+    def __init__(self):
+        self.components = {kind: {} for kind in self.KINDS}
+        self.sources = {}  # resolved path -> schema document content
+
+    def load(self, path):
+        path = Path(path).resolve()
+        if path in self.sources:
+            return
+        content = path.read_bytes()
+        self.sources[path] = content
+        root = lxml.etree.fromstring(content, base_url=str(path))
+        info = _SchemaInfo(root)
+
+        for child in _xsd_children(root):
+            kind = _local(child)
+            if kind in ("import", "include"):
+                location = child.get("schemaLocation")
+                # Remote schemas are never fetched; components that need
+                # them are reported as unsupported instead
+                if location and (path.parent / location).is_file():
+                    self.load(path.parent / location)
+            elif kind == "redefine":
+                raise UnsupportedSchema("xsd:redefine")
+            elif kind in self.components:
+                name = _qualify(info.target_namespace, child.get("name"))
+                self.components[kind][name] = (child, info)
+
+    def get(self, kind, name):
+        try:
+            return self.components[kind][name]
+        except KeyError:
+            raise UnsupportedSchema(f"Unknown {kind} {name}") from None
+
+
+class _Compiler:
+    """Compile the components reachable from a schema's global elements."""
+
+    def __init__(self, schemas):
+        self.schemas = schemas
+        self.types = {}  # complex type id -> compiled entry
+        self.simple = {}  # simple type id -> compiled facets
+        self.elements = {}  # global element name -> type id
+        self._definitions = {}  # complex type id -> abstract definition
+        self._anonymous = {}  # anonymous type id -> (node, info)
+        self._pending = []
+
+    def compile(self):
+        for name in self.schemas.components["element"]:
+            try:
+                self._global_element(name)
+            except UnsupportedSchema:
+                # Parts using the element fall back to full validation
+                self.elements[name] = None
+        while self._pending:
+            type_id = self._pending.pop()
+            if type_id in self.types or type_id in self.simple:
+                continue
+            try:
+                if self._is_simple(type_id):
+                    self._simple_definition(type_id)
+                else:
+                    self.types[type_id] = self._compile_type(type_id)
+            except UnsupportedSchema as e:
+                if type_id.startswith("#") and self._is_simple(type_id) or (
+                    type_id in self.schemas.components["simpleType"]
+                ):
+                    self.simple[type_id] = {"unsupported": str(e)}
+                else:
+                    self.types[type_id] = {"unsupported": str(e)}
+
+    # Types
+
+    def _type_node(self, type_id):
+        if type_id in self._anonymous:
+            return self._anonymous[type_id]
+        if type_id in self.schemas.components["complexType"]:
+            return self.schemas.components["complexType"][type_id]
+        return self.schemas.get("simpleType", type_id)
+
+    def _is_simple(self, type_id):
+        if type_id == "xsd:anyType":
+            return False
+        if type_id.startswith("xsd:"):
+            return True
+        node, _ = self._type_node(type_id)
+        return _local(node) == "simpleType"
+
+    def _anonymous_type(self, node, info):
+        type_id = f"#{len(self._anonymous)}"
+        self._anonymous[type_id] = (node, info)
+        self._pending.append(type_id)
+        return type_id
+
+    def _reference(self, type_id):
+        """Queue a named type for compilation and return its id."""
+        if type_id not in ("xsd:anyType",) and type_id.startswith("xsd:"):
+            if type_id[4:] not in BUILTIN_WHITESPACE:
+                raise UnsupportedSchema(f"Built-in type {type_id}")
+        self._pending.append(type_id)
+        return type_id
+
+    def _element_type(self, node, info):
+        if node.get("type"):
+            return self._reference(_resolve(node, node.get("type")))
+        for child in _xsd_children(node):
+            if _local(child) in ("complexType", "simpleType"):
+                return self._anonymous_type(child, info)
+        if node.get("substitutionGroup"):
+            raise UnsupportedSchema("substitutionGroup")
+        return self._reference("xsd:anyType")
+
+    def _global_element(self, name):
+        if name not in self.elements:
+            node, info = self.schemas.get("element", name)
+            # Reserve the entry first; element types may be recursive
+            self.elements[name] = None
+            self.elements[name] = self._element_type(node, info)
+        return self.elements[name]
+
+    def _definition(self, type_id):
+        """Return the content kind, particle, simple type and attributes of a complex type."""
+        if type_id in self._definitions:
+            return self._definitions[type_id]
+
+        if type_id == "xsd:anyType":
+            definition = {
+                "content": "mixed",
+                "particle": ("any", ["any"], "lax", 0, None),
+                "simple": None,
+                "attrs": {},
+                "any_attr": True,
+            }
+            self._definitions[type_id] = definition
+            return definition
+
+        node, info = self._type_node(type_id)
+        mixed = node.get("mixed") == "true"
+        attrs = {}
+        any_attr = False
+        particle = None
+        simple = None
+        children = _xsd_children(node)
+        first = children[0] if children else None
+
+        if first is not None and _local(first) == "simpleContent":
+            derivation = _xsd_children(first)[0]
+            base = _resolve(derivation, derivation.get("base"))
+            if self._is_simple(base):
+                simple = self._reference(base)
+            else:
+                base_definition = self._definition(base)
+                simple = base_definition["simple"]
+                attrs.update(base_definition["attrs"])
+                any_attr = base_definition["any_attr"]
+            if _local(derivation) == "restriction" and any(
+                _local(c) not in ("attribute", "attributeGroup", "anyAttribute")
+                for c in _xsd_children(derivation)
+            ):
+                raise UnsupportedSchema("simpleContent restriction facets")
+            any_attr = self._attributes(derivation, info, attrs) or any_attr
+            content = "simple"
+
+        elif first is not None and _local(first) == "complexContent":
+            mixed = mixed or first.get("mixed") == "true"
+            derivation = _xsd_children(first)[0]
+            base_definition = self._definition(
+                self._reference(_resolve(derivation, derivation.get("base")))
+            )
+            attrs.update(base_definition["attrs"])
+            any_attr = base_definition["any_attr"]
+            particle = self._model_group(derivation, info)
+            if _local(derivation) == "extension":
+                mixed = mixed or base_definition["content"] == "mixed"
+                if base_definition["particle"] is not None:
+                    if particle is None:
+                        particle = base_definition["particle"]
+                    else:
+                        particle = (
+                            "sequence",
+                            [base_definition["particle"], particle],
+                            1,
+                            1,
+                        )
+            any_attr = self._attributes(derivation, info, attrs) or any_attr
+            content = "mixed" if mixed else "elements"
+
+        else:
+            particle = self._model_group(node, info)
+            any_attr = self._attributes(node, info, attrs)
+            content = "mixed" if mixed else "elements"
+
+        definition = {
+            "content": content,
+            "particle": particle,
+            "simple": simple,
+            "attrs": attrs,
+            "any_attr": any_attr,
+        }
+        self._definitions[type_id] = definition
+        return definition
+
+    def _model_group(self, node, info):
+        """Return the particle of the model group directly inside node, if any."""
+        for child in _xsd_children(node):
+            if _local(child) in ("sequence", "choice", "all", "group"):
+                return self._particle(child, info)
+        return None
+
+    def _particle(self, node, info):
+        kind = _local(node)
+        min_occurs, max_occurs = _occurs(node)
+
+        if kind == "element":
+            if node.get("ref"):
+                name = _resolve(node, node.get("ref"))
+                decl = self._global_element(name)
+            else:
+                form = node.get(
+                    "form", "qualified" if info.qualified_elements else "unqualified"
+                )
+                namespace = info.target_namespace if form == "qualified" else ""
+                name = _qualify(namespace, node.get("name"))
+                decl = self._element_type(node, info)
+            return ("element", name, decl, min_occurs, max_occurs)
+
+        if kind in ("sequence", "choice", "all"):
+            children = [self._particle(c, info) for c in _xsd_children(node)]
+            return (kind, children, min_occurs, max_occurs)
+
+        if kind == "group":
+            group, group_info = self.schemas.get(
+                "group", _resolve(node, node.get("ref"))
+            )
+            inner = self._model_group(group, group_info)
+            return ("sequence", [inner] if inner else [], min_occurs, max_occurs)
+
+        if kind == "any":
+            namespaces = node.get("namespace", "##any").split()
+            if namespaces == ["##any"]:
+                wildcard = ["any"]
+            elif namespaces == ["##other"]:
+                wildcard = ["not", info.target_namespace]
+            else:
+                wildcard = [
+                    "in",
+                    [
+                        {
+                            "##local": "",
+                            "##targetNamespace": info.target_namespace,
+                        }.get(namespace, namespace)
+                        for namespace in namespaces
+                    ],
+                ]
+            process = node.get("processContents", "strict")
+            return ("any", wildcard, process, min_occurs, max_occurs)
+
+        raise UnsupportedSchema(f"Particle {kind}")
+
+    def _attributes(self, node, info, attrs):
+        """Add the attribute uses declared directly in node; return True for anyAttribute."""
+        any_attr = False
+        for child in _xsd_children(node):
+            kind = _local(child)
+            if kind == "attribute":
+                self._attribute(child, info, attrs)
+            elif kind == "attributeGroup":
+                group, group_info = self.schemas.get(
+                    "attributeGroup", _resolve(child, child.get("ref"))
+                )
+                any_attr = self._attributes(group, group_info, attrs) or any_attr
+            elif kind == "anyAttribute":
+                any_attr = True
+        return any_attr
+
+    def _attribute(self, node, info, attrs):
+        if node.get("ref"):
+            name = _resolve(node, node.get("ref"))
+            declaration, declaration_info = self.schemas.get("attribute", name)
+        else:
+            form = node.get(
+                "form", "qualified" if info.qualified_attributes else "unqualified"
+            )
+            namespace = info.target_namespace if form == "qualified" else ""
+            name = _qualify(namespace, node.get("name"))
+            declaration, declaration_info = node, info
+
+        use = node.get("use", "optional")
+        if use == "prohibited":
+            attrs.pop(name, None)
+            return
+
+        if declaration.get("type"):
+            type_id = self._reference(_resolve(declaration, declaration.get("type")))
+        else:
+            anonymous = [
+                c for c in _xsd_children(declaration) if _local(c) == "simpleType"
+            ]
+            type_id = (
+                self._anonymous_type(anonymous[0], declaration_info)
+                if anonymous
+                else "xsd:anySimpleType"
+            )
+        fixed = node.get("fixed", declaration.get("fixed"))
+        attrs[name] = [type_id, use == "required", fixed]
+
+    # Content model automata
+
+    def _compile_type(self, type_id):
+        definition = self._definition(type_id)
+        entry = {
+            "content": definition["content"],
+            "attrs": definition["attrs"],
+            "any_attr": definition["any_attr"],
+        }
+        if definition["content"] == "simple":
+            entry["simple"] = definition["simple"]
+            return entry
+
+        particle = definition["particle"]
+        # Unwrap group references around a top-level xsd:all
+        while (
+            particle is not None
+            and particle[0] == "sequence"
+            and len(particle[1]) == 1
+            and particle[2:] == (1, 1)
+        ):
+            particle = particle[1][0]
+
+        if particle is not None and particle[0] == "all":
+            members = []
+            for child in particle[1]:
+                if child[0] != "element" or child[4] not in (0, 1):
+                    raise UnsupportedSchema("xsd:all member")
+                members.append([child[1], child[2], child[3] > 0 and particle[2] > 0])
+            entry["all"] = members
+            return entry
+
+        positions = []
+        regex = self._regex(particle, positions) if particle else ("eps",)
+        if not positions and entry["content"] == "elements":
+            entry["content"] = "empty"
+        follow = [set() for _ in positions]
+        nullable, first, last = _glushkov(regex, follow)
+
+        # State 0 is the start; state i + 1 is "just matched position i". Each
+        # state lists the states reachable by one more child element.
+        wildcards = []
+        symbols = [None]
+        for kind, symbol, _ in positions:
+            if kind == "element":
+                symbols.append(symbol)
+            else:
+                if symbol not in wildcards:
+                    wildcards.append(symbol)
+                symbols.append(wildcards.index(symbol))
+
+        entry["symbols"] = symbols
+        entry["wildcards"] = wildcards
+        entry["decls"] = [None] + [
+            decl if kind == "element" else ["*", decl]
+            for kind, _, decl in positions
+        ]
+        entry["next"] = [
+            sorted(position + 1 for position in targets)
+            for targets in [first] + follow
+        ]
+        entry["final"] = ([0] if nullable else []) + sorted(
+            position + 1 for position in last
+        )
+        return entry
+
+    def _regex(self, particle, positions):
+        """Return a regular expression tree over fresh positions for a particle."""
+        kind, min_occurs, max_occurs = particle[0], particle[-2], particle[-1]
+
+        def build():
+            if kind == "element":
+                positions.append(("element", particle[1], particle[2]))
+            elif kind == "any":
+                positions.append(("any", particle[1], particle[2]))
+            elif kind == "sequence":
+                return ("seq", [self._regex(c, positions) for c in particle[1]])
+            elif kind == "choice":
+                return ("alt", [self._regex(c, positions) for c in particle[1]])
+            else:
+                raise UnsupportedSchema(f"Nested {kind}")
+            if len(positions) > MAX_POSITIONS:
+                raise UnsupportedSchema("Content model too large")
+            return ("sym", len(positions) - 1)
+
+        if max_occurs == 0:
+            return ("eps",)
+        items = [build() for _ in range(min_occurs)]
+        if max_occurs is None:
+            items.append(("star", build()))
+        else:
+            optional = None
+            for _ in range(max_occurs - min_occurs):
+                inner = [build()] + ([optional] if optional else [])
+                optional = ("opt", ("seq", inner))
+            if optional:
+                items.append(optional)
+        return items[0] if len(items) == 1 else ("seq", items)
+
+    # Simple types
+
+    def _simple_definition(self, type_id):
+        """Return the flattened facets of a simple type, compiling it once."""
+        if type_id.startswith("xsd:"):
+            name = type_id[4:]
+            if name not in BUILTIN_WHITESPACE:
+                raise UnsupportedSchema(f"Built-in type {type_id}")
+            return {"base": name, "ws": BUILTIN_WHITESPACE[name]}
+        if type_id in self.simple:
+            return self.simple[type_id]
+
+        node, info = self._type_node(type_id)
+        derivation = _xsd_children(node)[0]
+        kind = _local(derivation)
+
+        if kind == "restriction":
+            if derivation.get("base"):
+                base = _resolve(derivation, derivation.get("base"))
+            else:
+                base = self._anonymous_type(_xsd_children(derivation)[0], info)
+            definition = json.loads(json.dumps(self._simple_definition(base)))
+            enumeration = []
+            patterns = []
+            for facet in _xsd_children(derivation):
+                name = _local(facet)
+                value = facet.get("value")
+                if name == "simpleType":
+                    continue
+                elif name == "enumeration":
+                    enumeration.append(value)
+                elif name == "pattern":
+                    patterns.append(_translate_pattern(value))
+                elif name in (
+                    "minInclusive",
+                    "maxInclusive",
+                    "minExclusive",
+                    "maxExclusive",
+                ):
+                    definition.setdefault("bounds", []).append([name, value])
+                elif name in ("length", "minLength", "maxLength"):
+                    definition.setdefault("lengths", []).append([name, int(value)])
+                elif name == "whiteSpace":
+                    definition["ws"] = value
+                else:
+                    raise UnsupportedSchema(f"Facet {name}")
+            if enumeration:
+                definition["enum"] = enumeration
+            if patterns:
+                definition.setdefault("patterns", []).append(patterns)
+
+        elif kind == "union":
+            members = [
+                _resolve(derivation, member)
+                for member in derivation.get("memberTypes", "").split()
+            ]
+            members += [
+                self._anonymous_type(child, info)
+                for child in _xsd_children(derivation)
+            ]
+            for member in members:
+                self._simple_definition(member)
+            definition = {"union": members}
+
+        elif kind == "list":
+            if derivation.get("itemType"):
+                item = _resolve(derivation, derivation.get("itemType"))
+            else:
+                item = self._anonymous_type(_xsd_children(derivation)[0], info)
+            self._simple_definition(item)
+            definition = {"list": item, "ws": "collapse"}
+
+        else:
+            raise UnsupportedSchema(f"Simple type derivation {kind}")
+
+        self.simple[type_id] = definition
+        return definition
+
+
+# Character class escapes of XSD regular expressions, as Python class ranges.
+# \s is XSD's whitespace only, not Python's Unicode whitespace
+XSD_CLASS_ESCAPES = {
+    r"\p{IsBasicLatin}": r"\x00-\x7f",
+    r"\p{IsLatin-1Supplement}": r"\x80-\xff",
+    r"\p{Cc}": r"\x00-\x1f\x7f-\x9f",
+    r"\s": r" \t\n\r",
+}
+
+# Complements of class escapes, only expressible outside a character class
+XSD_NEGATED_ESCAPES = {r"\S": r"[^ \t\n\r]"}
+
+# XSD's '.' excludes both line ends, Python's only '\n'
+XSD_WILDCARD = r"[^\n\r]"
+
+# Escaped characters of XSD single character escapes; they mean the same in
+# Python's re. Multi-character escapes such as \w, \d, \i and \c have
+# Unicode meanings that differ between the two and are not translated.
+XSD_SINGLE_ESCAPES = set("nrt\\|.?*+(){}-[]^")
+
+
+def _translate_pattern(pattern):
+    """Translate an XSD pattern into an equivalent Python regular expression.
+
+    Handles the class escapes in XSD_CLASS_ESCAPES, '.' and character class
+    subtraction ([a-[b]]) used by the OPC schemas; raises UnsupportedSchema
+    for anything else whose meaning Python's re does not share.
+    """
+    translated = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escape, i = _scan_escape(pattern, i)
+            if escape in XSD_CLASS_ESCAPES:
+                translated.append(f"[{XSD_CLASS_ESCAPES[escape]}]")
+            elif escape in XSD_NEGATED_ESCAPES:
+                translated.append(XSD_NEGATED_ESCAPES[escape])
+            else:
+                translated.append(escape)
+        elif char == ".":
+            translated.append(XSD_WILDCARD)
+            i += 1
+        elif char == "[":
+            end, base, subtracted = _scan_class(pattern, i)
+            if subtracted is None:
+                translated.append(f"[{base}]")
+            else:
+                translated.append(f"(?:(?![{subtracted}])[{base}])")
+            i = end
+        elif char in "^$":
+            translated.append("\\" + char)  # Not anchors in XSD
+            i += 1
+        else:
+            translated.append(char)
+            i += 1
+    result = "".join(translated)
+
+    try:
+        re.compile(result)
+    except re.error:
+        raise UnsupportedSchema(f"Pattern {pattern}") from None
+    return result
+
+
+def _scan_class(pattern, start):
+    """Scan a character class at pattern[start] == '['.
+
+    Returns (end index, class body, subtracted class body or None).
+    """
+    i = start + 1
+    body = []
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escape, i = _scan_escape(pattern, i)
+            if escape in XSD_NEGATED_ESCAPES:
+                raise UnsupportedSchema(f"Pattern {pattern}")
+            body.append(XSD_CLASS_ESCAPES.get(escape, escape))
+        elif char == "-" and pattern[i + 1 : i + 2] == "[":
+            end, subtracted, nested = _scan_class(pattern, i + 1)
+            if nested is not None or pattern[end : end + 1] != "]":
+                raise UnsupportedSchema(f"Pattern {pattern}")
+            return end + 1, "".join(body), subtracted
+        elif char == "[":
+            # A literal '[' inside a class is only escaped in Python syntax
+            body.append("\\[")
+            i += 1
+        elif char == "]":
+            return i + 1, "".join(body), None
+        else:
+            body.append(char)
+            i += 1
+    raise UnsupportedSchema(f"Pattern {pattern}")
+
+
+def _scan_escape(pattern, start):
+    """Scan an escape at pattern[start] == '\\'.
+
+    Returns (escape, end index). Raises UnsupportedSchema for escapes that
+    are neither single character escapes nor translatable class escapes.
+    """
+    char = pattern[start + 1 : start + 2]
+    if char in ("p", "P"):
+        end = pattern.find("}", start)
+        escape = pattern[start : end + 1] if end > 0 else pattern[start:]
+    else:
+        escape = pattern[start : start + 2]
+    if (
+        escape not in XSD_CLASS_ESCAPES
+        and escape not in XSD_NEGATED_ESCAPES
+        and not (len(escape) == 2 and char in XSD_SINGLE_ESCAPES)
+    ):
+        raise UnsupportedSchema(f"Pattern {pattern}")
+    return escape, start + len(escape)
+
+
+def _glushkov(node, follow):
+    """Return (nullable, first, last) of a regex tree, filling in follow sets."""
+    kind = node[0]
+    if kind == "sym":
+        return False, {node[1]}, {node[1]}
+    if kind == "eps":
+        return True, set(), set()
+    if kind == "seq":
+        nullable, first, last = True, set(), set()
+        for child in node[1]:
+            child_nullable, child_first, child_last = _glushkov(child, follow)
+            for position in last:
+                follow[position] |= child_first
+            if nullable:
+                first |= child_first
+            last = (last | child_last) if child_nullable else set(child_last)
+            nullable = nullable and child_nullable
+        return nullable, first, last
+    if kind == "alt":
+        nullable, first, last = not node[1], set(), set()
+        for child in node[1]:
+            child_nullable, child_first, child_last = _glushkov(child, follow)
+            nullable = nullable or child_nullable
+            first |= child_first
+            last |= child_last
+        return nullable, first, last
+    if kind == "star":
+        _, first, last = _glushkov(node[1], follow)
+        for position in last:
+            follow[position] |= first
+        return True, first, last
+    # opt
+    _, first, last = _glushkov(node[1], follow)
+    return True, first, last
+
+
+def compile_schema(schema_path):
+    """Compile an XSD and its imports into a JSON-serialisable structural model.
+
+    Args:
+        schema_path: Path to the root schema (e.g. pml.xsd)
+
+    Returns:
+        dict: The compiled model, including the content digest of every
+            schema document it was compiled from
+    """
+    schema_path = Path(schema_path).resolve()
+    schemas = _SchemaSet()
+    schemas.load(schema_path)
+    compiler = _Compiler(schemas)
+    compiler.compile()
+    return {
+        "version": MODEL_VERSION,
+        "schema": schema_path.name,
+        "sources": {
+            Path(os.path.relpath(path, schema_path.parent)).as_posix(): (
+                hashlib.sha256(content).hexdigest()
+            )
+            for path, content in sorted(schemas.sources.items())
+        },
+        "elements": compiler.elements,
+        "types": compiler.types,
+        "simple": compiler.simple,
+    }
+
+
+class StructureModel:
+    """Compiled structural model of a schema, used to check parts quickly."""
+
+    def __init__(self, data):
+        self.elements = data["elements"]
+        self.types = data["types"]
+        self.simple = data["simple"]
+        self._patterns = {}
+        self._required = {}
+        self._transitions = {}
+        # (type id, value) pairs known to be valid; values repeat heavily
+        self._valid_values = set()
+        # Final states as sets, for the end-of-element check
+        for entry in self.types.values():
+            if "final" in entry:
+                entry["final"] = set(entry["final"])
+
+    @classmethod
+    def for_schema(cls, schema_path, compiled_path=None):
+        """Load the precompiled model of a schema, compiling it if missing or stale.
+
+        Args:
+            schema_path: Path to the root schema
+            compiled_path: Optional path of a model written by compile_schema,
+                gzip-compressed if it ends in .gz
+        """
+        schema_path = Path(schema_path).resolve()
+        if compiled_path is not None:
+            compiled_path = Path(compiled_path)
+            opener = gzip.open if compiled_path.suffix == ".gz" else open
+            try:
+                with opener(compiled_path, "rt", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MODEL_VERSION and _sources_match(
+                    data.get("sources", {}), schema_path.parent
+                ):
+                    return cls(data)
+            except (OSError, ValueError):
+                pass
+        return cls(compile_schema(schema_path))
+
+    def find_violation(self, source, allowed_namespaces=None):
+        """Return a description of the first structural violation in a part, or None.
+
+        Mirrors the preprocessing of full XSD validation: template tags are
+        ignored in text outside <t> elements and mc:Ignorable is ignored on
+        the root. When allowed_namespaces is given, elements (with their
+        content and tail) and attributes in other namespaces are ignored, as
+        BaseSchemaValidator._clean_ignorable_namespaces removes them.
+
+        Args:
+            source: Path to the part, or a binary file object reading it
+
+        Returns:
+            str or None: The first violation found; None if the part conforms
+                to every constraint the model checks
+        """
+        if not hasattr(source, "read"):
+            source = str(source)
+        ignorable = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Ignorable"
+        ids = set()
+        stack = []  # [mode, entry, states, seen members] per open element
+
+        foreign_names = {}
+
+        def foreign(name):
+            result = foreign_names.get(name)
+            if result is None:
+                result = foreign_names[name] = (
+                    allowed_namespaces is not None
+                    and name.startswith("{")
+                    and name[1:].split("}", 1)[0] not in allowed_namespaces
+                )
+            return result
+
+        try:
+            for event, elem in lxml.etree.iterparse(
+                source, events=("start", "end"), remove_comments=False
+            ):
+                if event == "start":
+                    violation = self._start(elem, stack, foreign, ignorable, ids)
+                    if violation:
+                        return violation
+                    continue
+
+                frame = stack.pop()
+                violation = self._end(elem, frame, foreign)
+                if violation:
+                    return violation
+                if stack:
+                    # Earlier siblings and their tails are complete now
+                    sibling = elem.getprevious()
+                    while sibling is not None:
+                        violation = self._tail_violation(sibling, stack[-1], foreign)
+                        if violation:
+                            return violation
+                        earlier = sibling.getprevious()
+                        elem.getparent().remove(sibling)
+                        sibling = earlier
+                elem.clear(keep_tail=True)
+        except lxml.etree.XMLSyntaxError as e:
+            return f"Not well-formed: {e}"
+        return None
+
+    def _start(self, elem, stack, foreign, ignorable, ids):
+        name = elem.tag
+        parent = stack[-1] if stack else None
+
+        # The root is validated even in a foreign namespace; cleaning only
+        # removes elements below it
+        if parent is not None and (parent[0] == "skip" or foreign(name)):
+            stack.append(["skip", None, None, None, None])
+            return None
+
+        if parent is None:
+            decl = self.elements.get(name)
+            if decl is None:
+                return f"Root element {name} is not declared"
+        elif parent[0] == "lax":
+            decl = self.elements.get(name)
+            if decl is None:
+                stack.append(["lax", None, None, None, None])
+                return None
+        else:
+            decl, violation = self._transition(parent, name)
+            if violation:
+                return violation
+            if isinstance(decl, list):
+                # Wildcard: skip, or look for a global declaration
+                process = decl[1]
+                decl = self.elements.get(name)
+                if process == "skip":
+                    stack.append(["skip", None, None, None, None])
+                    return None
+                if decl is None:
+                    if process == "lax":
+                        stack.append(["lax", None, None, None, None])
+                        return None
+                    return f"No declaration for {name} matched by a strict wildcard"
+
+        entry = self.types.get(decl)
+        if entry is None:
+            if decl in self.simple or str(decl).startswith("xsd:"):
+                entry = {"content": "simple", "simple": decl, "attrs": {}}
+            else:
+                return f"{name}: Unknown type {decl}"
+        if "unsupported" in entry:
+            return f"{name}: Type not modelled ({entry['unsupported']})"
+
+        attrs = entry["attrs"]
+        present = set()
+        for attr, value in elem.attrib.items():
+            if foreign(attr) or (parent is None and attr == ignorable):
+                continue
+            use = attrs.get(attr)
+            if use is None:
+                if entry.get("any_attr"):
+                    continue
+                return f"{name}: Attribute {attr} is not allowed"
+            type_id, _, fixed = use
+            if fixed is not None and value != fixed:
+                return f"{name}: Attribute {attr} must be '{fixed}'"
+            if not self._value_valid(type_id, value, ids):
+                return f"{name}: Invalid value '{value}' for attribute {attr}"
+            present.add(attr)
+
+        required = self._required.get(decl)
+        if required is None:
+            required = self._required[decl] = [
+                attr for attr, use in attrs.items() if use[1]
+            ]
+        for attr in required:
+            if attr not in present:
+                return f"{name}: Missing required attribute {attr}"
+
+        stack.append(["check", entry, {0}, {}, decl])
+        return None
+
+    def _transition(self, frame, name):
+        """Advance a frame's automaton by one child; return (decl, violation)."""
+        entry = frame[1]
+        content = entry["content"]
+        if content in ("simple", "empty"):
+            return None, f"Element {name} is not allowed in {content} content"
+
+        if "all" in entry:
+            for member_name, decl, _ in entry["all"]:
+                if member_name == name:
+                    if name in frame[3]:
+                        return None, f"Element {name} occurs more than once"
+                    frame[3][name] = True
+                    return decl, None
+            return None, f"Element {name} is not allowed here"
+
+        namespace = name[1:].split("}", 1)[0] if name.startswith("{") else ""
+        states = self._states(frame[4], entry)
+        targets = set()
+        for state in frame[2]:
+            by_name, by_wildcard = states[state]
+            targets.update(by_name.get(name, ()))
+            for index, target in by_wildcard:
+                if _wildcard_matches(entry["wildcards"][index], namespace):
+                    targets.add(target)
+        if not targets:
+            return None, f"Element {name} is not expected here"
+
+        if len(targets) > 1:
+            decls = {json.dumps(entry["decls"][target]) for target in targets}
+            if len(decls) > 1:
+                return None, f"Element {name} matches several declarations"
+        frame[2] = targets
+        return entry["decls"][next(iter(targets))], None
+
+    def _end(self, elem, frame, foreign):
+        mode, entry = frame[0], frame[1]
+        if mode != "check":
+            return None
+        name = elem.tag
+        content = entry["content"]
+
+        if content == "simple":
+            value = (
+                _strip_templates(elem.text) if _is_template_text_owner(elem) else elem.text
+            ) or ""
+            value += "".join(child.tail or "" for child in elem)
+            if not self._value_valid(entry["simple"], value, set()):
+                return f"{name}: Invalid content '{value[:80]}'"
+            return None
+
+        violation = self._text_violation(
+            elem.text, _is_template_text_owner(elem), content, name
+        )
+        if violation:
+            return violation
+        for child in elem:
+            violation = self._tail_violation(child, frame, foreign)
+            if violation:
+                return violation
+
+        if "all" in entry:
+            for member_name, _, required in entry["all"]:
+                if required and member_name not in frame[3]:
+                    return f"{name}: Missing required element {member_name}"
+            return None
+        if frame[2].isdisjoint(entry["final"]):
+            return f"{name}: Content is incomplete"
+        return None
+
+    def _tail_violation(self, child, frame, foreign):
+        """Check the text following a child against its parent's frame."""
+        if frame[0] != "check" or not child.tail:
+            return None
+        if isinstance(child.tag, str) and foreign(child.tag):
+            return None  # Removed together with the element
+        return self._text_violation(
+            child.tail,
+            _is_template_text_owner(child),
+            frame[1]["content"],
+            child.getparent().tag,
+        )
+
+    def _text_violation(self, text, strip_templates, content, name):
+        if not text or content == "mixed":
+            return None
+        if content == "empty":
+            # Even text that template stripping empties leaves a text node
+            return f"{name}: Text is not allowed in empty content: '{text[:40]}'"
+        if strip_templates:
+            text = _strip_templates(text)
+        if content == "elements" and text.strip(XML_WHITESPACE):
+            return f"{name}: Text is not allowed in element-only content: '{text.strip()[:40]}'"
+        return None
+
+    # Simple values
+
+    def _value_valid(self, type_id, value, ids):
+        key = (type_id, value)
+        if key in self._valid_values:
+            return True
+        known_ids = len(ids)
+        if type_id.startswith("xsd:"):
+            name = type_id[4:]
+            valid = _builtin_valid(name, _normalize(value, BUILTIN_WHITESPACE[name]), ids)
+        else:
+            definition = self.simple.get(type_id)
+            if definition is None or "unsupported" in definition:
+                return False
+            valid = self._facets_valid(definition, value, ids)
+        # Values that registered an ID must be checked again for uniqueness
+        if valid and len(ids) == known_ids:
+            self._valid_values.add(key)
+        return valid
+
+    def _facets_valid(self, definition, value, ids):
+        if "union" in definition:
+            if not any(
+                self._value_valid(member, value, ids) for member in definition["union"]
+            ):
+                return False
+            value = _normalize(value, definition.get("ws", "collapse"))
+            length = len(value)
+        elif "list" in definition:
+            value = _normalize(value, "collapse")
+            items = value.split(" ") if value else []
+            if not all(self._value_valid(definition["list"], item, ids) for item in items):
+                return False
+            length = len(items)
+        else:
+            base = definition["base"]
+            value = _normalize(value, definition["ws"])
+            if not _builtin_valid(base, value, ids):
+                return False
+            if base == "hexBinary":
+                length = len(value) // 2
+            elif base == "base64Binary":
+                compact = value.replace(" ", "")
+                length = len(compact) * 3 // 4 - compact.count("=")
+            else:
+                length = len(value)
+        return _facets_apply(self, definition, value, length)
+
+    def _states(self, type_id, entry):
+        """Return per-state ({name: [targets]}, [(wildcard, target)]) transition tables."""
+        states = self._transitions.get(type_id)
+        if states is None:
+            symbols = entry["symbols"]
+            states = []
+            for targets in entry["next"]:
+                by_name = {}
+                by_wildcard = []
+                for target in targets:
+                    symbol = symbols[target]
+                    if isinstance(symbol, str):
+                        by_name.setdefault(symbol, []).append(target)
+                    else:
+                        by_wildcard.append((symbol, target))
+                states.append((by_name, by_wildcard))
+            self._transitions[type_id] = states
+        return states
+
+    def _pattern(self, pattern):
+        compiled = self._patterns.get(pattern)
+        if compiled is None:
+            compiled = self._patterns[pattern] = re.compile(pattern)
+        return compiled
+
+
+def _facets_apply(model, definition, value, length):
+    enumeration = definition.get("enum")
+    if enumeration is not None and value not in enumeration:
+        return False
+    for step in definition.get("patterns", ()):
+        if not any(model._pattern(p).fullmatch(value) for p in step):
+            return False
+    if "bounds" in definition:
+        number = _number(definition.get("base"), value)
+        if number is None:
+            return False
+        for facet, limit in definition["bounds"]:
+            limit = _number(definition.get("base"), limit)
+            if limit is None:
+                return False
+            if facet == "minInclusive" and not number >= limit:
+                return False
+            if facet == "maxInclusive" and not number <= limit:
+                return False
+            if facet == "minExclusive" and not number > limit:
+                return False
+            if facet == "maxExclusive" and not number < limit:
+                return False
+    for facet, limit in definition.get("lengths", ()):
+        if length is None:
+            return False
+        if facet == "length" and length != limit:
+            return False
+        if facet == "minLength" and length < limit:
+            return False
+        if facet == "maxLength" and length > limit:
+            return False
+    return True
+
+
+def _number(base, value):
+    try:
+        if base in ("double", "float"):
+            return float(value) if DOUBLE_PATTERN.fullmatch(value) else None
+        return Decimal(value) if DECIMAL_PATTERN.fullmatch(value) else None
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _normalize(value, whitespace):
+    if whitespace == "collapse":
+        return " ".join(part for part in XML_WHITESPACE_PATTERN.split(value) if part)
+    if whitespace == "replace":
+        return value.replace("\t", " ").replace("\n", " ").replace("\r", " ")
+    return value
+
+
+def _builtin_valid(name, value, ids):
+    if name in ("string", "token", "anySimpleType", "anyURI"):
+        return True
+    if name == "boolean":
+        return value in ("true", "false", "1", "0")
+    if name in INTEGER_RANGES:
+        if not INTEGER_PATTERN.fullmatch(value):
+            return False
+        low, high = INTEGER_RANGES[name]
+        number = int(value)
+        return (low is None or number >= low) and (high is None or number <= high)
+    if name == "decimal":
+        return bool(DECIMAL_PATTERN.fullmatch(value))
+    if name in ("double", "float"):
+        if not DOUBLE_PATTERN.fullmatch(value):
+            return False
+        return name == "double" or value in ("INF", "-INF", "NaN") or abs(
+            float(value)
+        ) <= 3.4028234663852886e38
+    if name == "hexBinary":
+        return bool(HEX_BINARY_PATTERN.fullmatch(value))
+    if name == "base64Binary":
+        compact = value.replace(" ", "")
+        return bool(BASE64_PATTERN.fullmatch(value)) and len(compact) % 4 == 0
+    if name == "NCName":
+        return bool(NCNAME_PATTERN.fullmatch(value))
+    if name == "ID":
+        if not NCNAME_PATTERN.fullmatch(value) or value in ids:
+            return False
+        ids.add(value)
+        return True
+    if name == "language":
+        return bool(LANGUAGE_PATTERN.fullmatch(value))
+    if name == "dateTime":
+        match = DATETIME_PATTERN.fullmatch(value)
+        if not match:
+            return False
+        year, month, day, hour, minute, second = (int(g) for g in match.groups()[:6])
+        try:
+            datetime.date(year, month, day)
+        except ValueError:
+            return False
+        return hour <= 23 and minute <= 59 and second <= 59
+    return False
+
+
+def _wildcard_matches(wildcard, namespace):
+    if wildcard[0] == "any":
+        return True
+    if wildcard[0] == "not":
+        return namespace not in (wildcard[1], "")
+    return namespace in wildcard[1]
+
+
+TEMPLATE_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+
+def _is_template_text_owner(elem):
+    """True if template tags are stripped from the element's text and tail."""
+    tag = elem.tag
+    return isinstance(tag, str) and not (tag.endswith("}t") or tag == "t")
+
+
+def _strip_templates(text):
+    return TEMPLATE_PATTERN.sub("", text) if text else text
+
+
+def _sources_match(sources, schema_dir):
+    """Return True if every schema a model was compiled from is unchanged."""
+    if not sources:
+        return False
+    for name, digest in sources.items():
+        try:
+            content = (schema_dir / name).read_bytes()
+        except OSError:
+            return False
+        if hashlib.sha256(content).hexdigest() != digest:
+            return False
+    return True
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,305 @@
+import io
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+import lxml.etree
+
+from validation.structure import (
+    StructureModel,
+    UnsupportedSchema,
+    _translate_pattern,
+    compile_schema,
+)
+
+SCHEMAS_DIR = Path(__file__).resolve().parents[2] / "schemas"
+
+TEST_NAMESPACE = "urn:structure-test"
+
+# Simple types restricted by patterns using the escapes XSD and Python's re
+# disagree on, and an element of each
+TEST_SCHEMA = f"""<?xml version="1.0"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+            xmlns="{TEST_NAMESPACE}" targetNamespace="{TEST_NAMESPACE}"
+            elementFormDefault="qualified">
+  <xsd:simpleType name="ST_Spaced">
+    <xsd:restriction base="xsd:string">
+      <xsd:pattern value="\\s*[0-9]*\\.[0-9]{{4}}\\s*"/>
+    </xsd:restriction>
+  </xsd:simpleType>
+  <xsd:simpleType name="ST_NoSpace">
+    <xsd:restriction base="xsd:string">
+      <xsd:pattern value="\\S+"/>
+    </xsd:restriction>
+  </xsd:simpleType>
+  <xsd:simpleType name="ST_Wildcard">
+    <xsd:restriction base="xsd:string">
+      <xsd:pattern value="a.b"/>
+    </xsd:restriction>
+  </xsd:simpleType>
+  <xsd:simpleType name="ST_Latin">
+    <xsd:restriction base="xsd:string">
+      <xsd:pattern value="[\\p{{IsBasicLatin}}-[\\p{{Cc}}\\s]]+"/>
+    </xsd:restriction>
+  </xsd:simpleType>
+  <xsd:complexType name="CT_Values">
+    <xsd:sequence>
+      <xsd:element name="spaced" type="ST_Spaced" minOccurs="0"/>
+      <xsd:element name="noSpace" type="ST_NoSpace" minOccurs="0"/>
+      <xsd:element name="wildcard" type="ST_Wildcard" minOccurs="0"/>
+      <xsd:element name="latin" type="ST_Latin" minOccurs="0"/>
+      <xsd:element name="name" type="xsd:NCName" minOccurs="0"/>
+    </xsd:sequence>
+    <xsd:attribute name="id" type="xsd:ID"/>
+  </xsd:complexType>
+  <xsd:element name="values" type="CT_Values"/>
+</xsd:schema>
+"""
+
+# Values that XSD accepts or rejects depending on which characters count as
+# whitespace, line ends or name characters
+VALUES = [
+    ("spaced", "1.2345"),
+    ("spaced", " 1.2345\t"),
+    ("spaced", "\u00a01.2345"),
+    ("spaced", "1.2345\u2003"),
+    ("noSpace", "abc"),
+    ("noSpace", "a\u00a0b"),
+    ("wildcard", "a-b"),
+    ("wildcard", "a&#13;b"),
+    ("wildcard", "a\u00a0b"),
+    ("latin", "text/plain"),
+    ("latin", "caf\u00e9"),
+    ("latin", "a&#9;b"),
+    ("name", "shape_1.a-b"),
+    ("name", "1shape"),
+    ("name", "\u00e9l\u00e8ve"),
+    ("name", "a\u00b7b"),
+    ("name", "\u0663abc"),
+]
+
+
+# Content models combining sequences, choices, bounded and unbounded
+# repeats, all groups, group references and extensions, with attributes
+MODEL_SCHEMA = f"""<?xml version="1.0"?>
+<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+            xmlns="{TEST_NAMESPACE}" targetNamespace="{TEST_NAMESPACE}"
+            elementFormDefault="qualified">
+  <xsd:simpleType name="ST_Kind">
+    <xsd:restriction base="xsd:token">
+      <xsd:enumeration value="one"/>
+      <xsd:enumeration value="two"/>
+    </xsd:restriction>
+  </xsd:simpleType>
+  <xsd:group name="EG_Tail">
+    <xsd:sequence>
+      <xsd:element name="e" type="xsd:string" maxOccurs="3"/>
+    </xsd:sequence>
+  </xsd:group>
+  <xsd:complexType name="CT_Base">
+    <xsd:sequence>
+      <xsd:element name="a" type="xsd:string"/>
+      <xsd:element name="b" type="xsd:int" minOccurs="0" maxOccurs="2"/>
+      <xsd:choice minOccurs="0" maxOccurs="unbounded">
+        <xsd:element name="c" type="xsd:string"/>
+        <xsd:element name="d" type="xsd:boolean"/>
+      </xsd:choice>
+    </xsd:sequence>
+    <xsd:attribute name="kind" type="ST_Kind" use="required"/>
+    <xsd:attribute name="count" type="xsd:unsignedByte"/>
+  </xsd:complexType>
+  <xsd:complexType name="CT_Sequence">
+    <xsd:complexContent>
+      <xsd:extension base="CT_Base">
+        <xsd:group ref="EG_Tail"/>
+        <xsd:attribute name="ref" type="xsd:ID"/>
+      </xsd:extension>
+    </xsd:complexContent>
+  </xsd:complexType>
+  <xsd:complexType name="CT_All">
+    <xsd:all>
+      <xsd:element name="x" type="xsd:string"/>
+      <xsd:element name="y" type="xsd:string" minOccurs="0"/>
+    </xsd:all>
+  </xsd:complexType>
+  <xsd:complexType name="CT_Root">
+    <xsd:sequence>
+      <xsd:element name="seq" type="CT_Sequence" minOccurs="0" maxOccurs="unbounded"/>
+      <xsd:element name="all" type="CT_All" minOccurs="0"/>
+    </xsd:sequence>
+  </xsd:complexType>
+  <xsd:element name="root" type="CT_Root"/>
+</xsd:schema>
+"""
+
+# Children and values the random documents are made of
+CHILDREN = {
+    "a": ["text"],
+    "b": ["1", "-2147483648", "2147483648", "x"],
+    "c": ["", "text"],
+    "d": ["true", "0", "yes"],
+    "e": ["text"],
+    "x": ["text"],
+    "y": ["text"],
+}
+ATTRIBUTES = {
+    "kind": [None, "one", " two ", "three"],
+    "count": [None, "0", "255", "256", "-1"],
+    "ref": [None, "r1", "r2", "1r"],
+    "other": [None, None, None, "1"],
+}
+
+
+class TestPatternTranslation(unittest.TestCase):
+    def test_whitespace_and_wildcard_follow_xsd(self):
+        self.assertEqual(_translate_pattern(r"\s"), r"[ \t\n\r]")
+        self.assertEqual(_translate_pattern(r"\S"), r"[^ \t\n\r]")
+        self.assertEqual(_translate_pattern("a.b"), r"a[^\n\r]b")
+        self.assertEqual(_translate_pattern(r"a\.b"), r"a\.b")
+        self.assertEqual(_translate_pattern(r"[.\s]"), r"[. \t\n\r]")
+
+    def test_block_escape_outside_class(self):
+        self.assertEqual(_translate_pattern(r"\p{IsBasicLatin}+"), r"[\x00-\x7f]+")
+
+    def test_unicode_class_escapes_are_unsupported(self):
+        for pattern in (r"\w+", r"\d", r"\i\c*", r"[\w.]", r"[^\S]", r"\p{Lu}", r"\W"):
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(UnsupportedSchema):
+                    _translate_pattern(pattern)
+
+    def test_anchors_are_literal(self):
+        self.assertEqual(_translate_pattern("^a$"), r"\^a\$")
+
+
+class TestStructureModelAgainstXSD(unittest.TestCase):
+    """The fast path must never accept a part that XSD validation rejects."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        schema_path = Path(cls.temp_dir.name) / "test.xsd"
+        schema_path.write_text(TEST_SCHEMA, encoding="utf-8")
+        cls.model = StructureModel(compile_schema(schema_path))
+        cls.schema = lxml.etree.XMLSchema(lxml.etree.parse(str(schema_path)))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def assert_agrees(self, model, schema, document):
+        fast_valid = model.find_violation(io.BytesIO(document)) is None
+        xsd_valid = schema.validate(lxml.etree.fromstring(document))
+        if fast_valid:
+            self.assertTrue(xsd_valid, "fast path accepted an invalid part")
+        return fast_valid, xsd_valid
+
+    def document(self, body, attributes=""):
+        return (
+            f'<values xmlns="{TEST_NAMESPACE}"{attributes}>{body}</values>'
+        ).encode("utf-8")
+
+    def test_pattern_values(self):
+        for name, value in VALUES:
+            with self.subTest(element=name, value=value):
+                document = self.document(f"<{name}>{value}</{name}>")
+                fast_valid, xsd_valid = self.assert_agrees(
+                    self.model, self.schema, document
+                )
+                # Translated patterns are exact; only non-ASCII names are
+                # left to XSD validation
+                if name != "name" or value.isascii():
+                    self.assertEqual(fast_valid, xsd_valid)
+
+    def test_id_values(self):
+        for value in ("rId1", "_x", "1x", "x y", "\u00e9"):
+            with self.subTest(value=value):
+                self.assert_agrees(
+                    self.model, self.schema, self.document("", f' id="{value}"')
+                )
+
+    def test_custom_property_currency(self):
+        """A currency value with a no-break space is invalid in docProps/custom.xml."""
+        schema_path = (
+            SCHEMAS_DIR / "ISO-IEC29500-4_2016" / "shared-documentPropertiesCustom.xsd"
+        )
+        model = StructureModel.for_schema(
+            schema_path, SCHEMAS_DIR / "compiled" / "ISO-IEC29500-4_2016"
+            / "shared-documentPropertiesCustom.json.gz",
+        )
+        schema = lxml.etree.XMLSchema(lxml.etree.parse(str(schema_path)))
+        for value in ("1.2345", " 1.2345 ", "\u00a01.2345"):
+            with self.subTest(value=value):
+                document = (
+                    '<Properties xmlns="http://schemas.openxmlformats.org/'
+                    'officeDocument/2006/custom-properties" xmlns:vt="http://'
+                    'schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">'
+                    '<property fmtid="{D5CDD505-2E9C-101B-9397-08002B2CF9AE}" '
+                    f'pid="2" name="Price"><vt:cy>{value}</vt:cy></property>'
+                    "</Properties>"
+                ).encode("utf-8")
+                fast_valid, xsd_valid = self.assert_agrees(model, schema, document)
+                self.assertEqual(fast_valid, xsd_valid)
+
+
+class TestContentModels(unittest.TestCase):
+    """Random documents get the same verdict from the automata as from XSD."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        schema_path = Path(cls.temp_dir.name) / "model.xsd"
+        schema_path.write_text(MODEL_SCHEMA, encoding="utf-8")
+        cls.model = StructureModel(compile_schema(schema_path))
+        cls.schema = lxml.etree.XMLSchema(lxml.etree.parse(str(schema_path)))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def element(self, rng, name, children, attributes=ATTRIBUTES):
+        attributes = "".join(
+            f' {attribute}="{value}"'
+            for attribute, values in attributes.items()
+            for value in [rng.choice(values)]
+            if value is not None
+        )
+        content = "".join(
+            f"<{child}>{rng.choice(CHILDREN[child])}</{child}>" for child in children
+        )
+        if rng.random() < 0.1:
+            content += "stray text"
+        return f"<{name}{attributes}>{content}</{name}>"
+
+    def test_random_documents(self):
+        rng = random.Random(11)
+        sequence_children = ["a", "b", "c", "d", "e"]
+        verdicts = []
+        for trial in range(1000):
+            body = "".join(
+                self.element(
+                    rng,
+                    "seq",
+                    # Mostly well-ordered children, sometimes shuffled
+                    sorted(rng.choices(sequence_children, k=rng.randint(0, 8)))
+                    if rng.random() < 0.7
+                    else rng.choices(sequence_children, k=rng.randint(0, 8)),
+                )
+                for _ in range(rng.randint(0, 2))
+            )
+            if rng.random() < 0.5:
+                all_children = rng.choices(["x", "y"], k=rng.randint(0, 3))
+                body += self.element(rng, "all", all_children, {})
+            document = f'<root xmlns="{TEST_NAMESPACE}">{body}</root>'.encode()
+            with self.subTest(document=document):
+                fast_valid = self.model.find_violation(io.BytesIO(document)) is None
+                xsd_valid = self.schema.validate(lxml.etree.fromstring(document))
+                self.assertEqual(fast_valid, xsd_valid)
+                verdicts.append(xsd_valid)
+        # Both outcomes were exercised often
+        self.assertGreater(verdicts.count(True), 100)
+        self.assertGreater(verdicts.count(False), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
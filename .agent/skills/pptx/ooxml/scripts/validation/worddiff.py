@@ -0,0 +1,214 @@
+"""
+In-process character diff of document text, formatted like git's word diff.
+
+Texts are compared paragraph by paragraph: paragraphs are hashed and aligned
+first, and only the paragraphs that changed are diffed character by
+character, so unchanged parts of long documents cost a hash lookup each.
+Both levels use Myers' O(ND) algorithm, which is fast when there are few
+differences; past a bound it gives up and reports whole replacements.
+"""
+
+# Edit distance beyond which a diff is reported as a whole replacement
+MAX_EDIT_DISTANCE = 1000
+
+# Character edits within a paragraph beyond which it is shown as replaced;
+# such paragraphs read better that way, and Myers' cost grows with the square
+MAX_PARAGRAPH_EDITS = 200
+
+# Changed paragraphs shown before the rest are summarised
+MAX_DIFF_LINES = 100
+
+
+def word_diff(original_text, modified_text, max_lines=MAX_DIFF_LINES):
+    """Return the changed paragraphs of two texts, marked up like git's word diff.
+
+    Each changed paragraph becomes one line in which deleted characters are
+    shown as [-...-] and inserted ones as {+...+}, as
+    git diff --word-diff=plain --word-diff-regex=. shows them.
+
+    Args:
+        original_text: Original text, paragraphs separated by newlines
+        modified_text: Modified text, paragraphs separated by newlines
+        max_lines: Number of changed paragraphs to show at most
+
+    Returns:
+        str: The marked-up paragraphs, empty if the texts are equal
+    """
+    original = original_text.split("\n") if original_text else []
+    modified = modified_text.split("\n") if modified_text else []
+
+    # Align paragraphs by their hashes, then diff characters only in
+    # paragraphs that are not equal
+    ids = {}
+    original_ids = [ids.setdefault(p, len(ids)) for p in original]
+    modified_ids = [ids.setdefault(p, len(ids)) for p in modified]
+    changes = changed_paragraphs(original_ids, modified_ids)
+    return format_changes(changes, original, modified, max_lines)
+
+
+def changed_paragraphs(original_keys, modified_keys):
+    """Return which paragraphs differ, given a hashable key (e.g. digest) per paragraph.
+
+    Returns:
+        list: (original index, modified index) pairs in document order; the
+            original index is None for inserted paragraphs and the modified
+            index None for deleted ones
+    """
+    changes = []
+    for tag, i1, i2, j1, j2 in edit_opcodes(original_keys, modified_keys):
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        changes.extend(zip(range(i1, i1 + paired), range(j1, j1 + paired)))
+        changes.extend((i, None) for i in range(i1 + paired, i2))
+        changes.extend((None, j) for j in range(j1 + paired, j2))
+    return changes
+
+
+def format_changes(changes, original, modified, max_lines=MAX_DIFF_LINES):
+    """Mark up changed paragraphs as returned by changed_paragraphs.
+
+    Args:
+        changes: (original index, modified index) pairs
+        original: Original paragraph text by index (a list, or a dict holding
+            at least the paragraphs shown)
+        modified: Modified paragraph text by index, likewise
+        max_lines: Number of changed paragraphs to show at most
+
+    Returns:
+        str: One marked-up line per shown paragraph
+    """
+    lines = [
+        _mark_up(
+            original[i] if i is not None else None,
+            modified[j] if j is not None else None,
+        )
+        for i, j in changes[:max_lines]
+    ]
+    if len(changes) > max_lines:
+        hidden = len(changes) - max_lines
+        lines.append(f"... and {hidden} more changed paragraph(s)")
+    return "\n".join(lines)
+
+
+def edit_opcodes(a, b, max_distance=MAX_EDIT_DISTANCE):
+    """Return how to turn sequence a into sequence b.
+
+    Args:
+        a: Original sequence (e.g. a string or a list of paragraph ids)
+        b: Modified sequence
+        max_distance: Edit distance beyond which the differing middle of the
+            sequences is reported as a single replacement
+
+    Returns:
+        list: (tag, i1, i2, j1, j2) tuples as difflib's get_opcodes() returns
+            them, with tags 'equal', 'replace', 'delete' and 'insert'
+    """
+    n, m = len(a), len(b)
+
+    # A common prefix and suffix are cheap to strip and usually most of both
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+
+    blocks = _matching_blocks(
+        a[prefix : n - suffix], b[prefix : m - suffix], max_distance
+    )
+    matches = [(0, 0, prefix)]
+    matches += [(i + prefix, j + prefix, size) for i, j, size in blocks]
+    matches.append((n - suffix, m - suffix, suffix))
+
+    opcodes = []
+    i = j = 0
+    for match_i, match_j, size in matches:
+        if i < match_i and j < match_j:
+            opcodes.append(("replace", i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(("delete", i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(("insert", i, i, j, match_j))
+        if size:
+            opcodes.append(("equal", match_i, match_i + size, match_j, match_j + size))
+        i, j = match_i + size, match_j + size
+    return opcodes
+
+
+def _matching_blocks(a, b, max_distance):
+    """Return (i, j, size) runs that a and b share along a shortest edit script.
+
+    Uses Myers' greedy algorithm; returns no matches when the edit distance
+    exceeds max_distance.
+    """
+    n, m = len(a), len(b)
+    if not n or not m:
+        return []
+
+    # furthest[k] is the furthest x reached on diagonal k = x - y; trace keeps
+    # it as it was before each round, for walking the path back
+    furthest = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_distance) + 1):
+        trace.append(dict(furthest))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and furthest[k - 1] < furthest[k + 1]):
+                x = furthest[k + 1]
+            else:
+                x = furthest[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            furthest[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return []
+
+
+def _backtrack(trace, x, y):
+    """Walk a Myers trace back from (x, y), collecting the diagonal runs."""
+    blocks = []
+    for d in range(len(trace) - 1, -1, -1):
+        furthest = trace[d]
+        k = x - y
+        if k == -d or (k != d and furthest[k - 1] < furthest[k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = furthest[previous_k]
+        previous_y = previous_x - previous_k
+        # The snake followed the edit made in round d
+        start_x = previous_x if previous_k == k + 1 else previous_x + 1
+        if x > start_x:
+            blocks.append((start_x, start_x - k, x - start_x))
+        x, y = previous_x, previous_y
+    blocks.reverse()
+    return blocks
+
+
+def _mark_up(original, modified):
+    """Return a changed paragraph with its deleted and inserted characters marked."""
+    if modified is None:
+        return f"[-{original}-]"
+    if original is None:
+        return f"{{+{modified}+}}"
+    pieces = []
+    for tag, i1, i2, j1, j2 in edit_opcodes(original, modified, MAX_PARAGRAPH_EDITS):
+        if tag == "equal":
+            pieces.append(original[i1:i2])
+            continue
+        if i1 < i2:
+            pieces.append(f"[-{original[i1:i2]}-]")
+        if j1 < j2:
+            pieces.append(f"{{+{modified[j1:j2]}+}}")
+    return "".join(pieces)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,99 @@
+import random
+import unittest
+
+from validation.worddiff import changed_paragraphs, edit_opcodes, word_diff
+
+
+def lcs_length(a, b):
+    """Brute-force reference: length of the longest common subsequence."""
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class TestEditOpcodes(unittest.TestCase):
+    def assert_valid_script(self, a, b, opcodes):
+        """The opcodes cover both sequences in order and turn a into b."""
+        i = j = 0
+        rebuilt = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.assertEqual((i1, j1), (i, j))
+            if tag == "equal":
+                self.assertEqual(a[i1:i2], b[j1:j2])
+            elif tag == "delete":
+                self.assertEqual(j1, j2)
+            elif tag == "insert":
+                self.assertEqual(i1, i2)
+            rebuilt.extend(b[j1:j2])
+            i, j = i2, j2
+        self.assertEqual((i, j), (len(a), len(b)))
+        self.assertEqual(rebuilt, list(b))
+
+    def test_shortest_edit_script(self):
+        rng = random.Random(3)
+        for trial in range(300):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+            with self.subTest(a=a, b=b):
+                opcodes = edit_opcodes(a, b)
+                self.assert_valid_script(a, b, opcodes)
+                matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+                self.assertEqual(matched, lcs_length(a, b))
+
+    def test_sequences_of_paragraph_ids(self):
+        a, b = [1, 2, 3, 4], [1, 5, 3, 4, 6]
+        self.assertEqual(
+            edit_opcodes(a, b),
+            [
+                ("equal", 0, 1, 0, 1),
+                ("replace", 1, 2, 1, 2),
+                ("equal", 2, 4, 2, 4),
+                ("insert", 4, 4, 4, 5),
+            ],
+        )
+
+    def test_distance_bound_reports_whole_replacement(self):
+        a, b = "xaaaay", "xbbbby"
+        self.assertEqual(
+            edit_opcodes(a, b, max_distance=2),
+            [("equal", 0, 1, 0, 1), ("replace", 1, 5, 1, 5), ("equal", 5, 6, 5, 6)],
+        )
+        self.assert_valid_script(a, b, edit_opcodes(a, b))
+
+
+class TestWordDiff(unittest.TestCase):
+    def test_equal_texts(self):
+        self.assertEqual(word_diff("one\ntwo", "one\ntwo"), "")
+        self.assertEqual(word_diff("", ""), "")
+
+    def test_changed_characters(self):
+        self.assertEqual(
+            word_diff("keep\nThe cat sat\nkeep", "keep\nThe bat sat\nkeep"),
+            "The [-c-]{+b+}at sat",
+        )
+
+    def test_inserted_and_deleted_paragraphs(self):
+        self.assertEqual(word_diff("a\nb", "a\nb\nc"), "{+c+}")
+        self.assertEqual(word_diff("a\nb\nc", "a\nc"), "[-b-]")
+        self.assertEqual(word_diff("", "new"), "{+new+}")
+
+    def test_changed_paragraphs_pairs_replacements(self):
+        self.assertEqual(
+            changed_paragraphs(["a", "b", "c"], ["a", "x", "y", "c"]),
+            [(1, 1), (None, 2)],
+        )
+
+    def test_output_is_limited(self):
+        original = "\n".join(f"line {i}" for i in range(10))
+        modified = "\n".join(f"line {i}!" for i in range(10))
+        lines = word_diff(original, modified, max_lines=3).split("\n")
+        self.assertEqual(lines[:3], ["line 0{+!+}", "line 1{+!+}", "line 2{+!+}"])
+        self.assertEqual(lines[3], "... and 7 more changed paragraph(s)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Find and load system fonts for text measurement.
+
+The platform font directories are scanned once per process, recursively, and
+every font file is indexed by the family and style in its name table, much
+as fontconfig does. Font names are then resolved against the index instead
+of the filesystem, and loaded fonts are kept in an LRU cache keyed by
+(path, size), so measuring many paragraphs costs one lookup and one load per
+distinct font.
+
+The index is persisted to a JSON file in the user's cache directory, or the
+file named by the PPTX_FONT_INDEX environment variable or passed to
+configure(), so reading name tables is paid for once rather than on every
+run. It is rebuilt when any indexed font directory changes, reading the name
+tables of new or changed font files only.
+
+TextMetrics measures and wraps text in a loaded font from memoised word
+widths, so wrapping a line costs one measurement per distinct word rather
+than one per candidate line.
+
+Usage:
+    python fonts.py <font name> [--bold] [--italic] [--index <index.json>]
+"""
+
+import argparse
+import bisect
+import json
+import os
+import platform
+import sys
+import tempfile
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import ImageFont
+
+# Environment variable naming a JSON file to persist the font index in; an
+# empty value disables persisting it
+INDEX_ENV = "PPTX_FONT_INDEX"
+
+# File name of the persisted index within the user's cache directory
+INDEX_CACHE_NAME = os.path.join("pptx-skill", "font-index.json")
+
+# Bump when the format of persisted indexes changes
+INDEX_VERSION = 2
+
+# Number of loaded (path, size) fonts kept in memory
+FONT_CACHE_SIZE = 128
+
+# Words whose widths TextMetrics remembers per font, before starting over
+WORD_CACHE_SIZE = 50000
+
+# Styles a face without bold or italic can be named by, most preferred first
+PLAIN_STYLES = ("regular", "book", "normal", "roman", "medium")
+
+# An indexed font file:
+#   path: Path of the font file
+#   family: Normalised family name (see normalize_name)
+#   style: Normalised style name, e.g. 'bold' or 'bolditalic'
+#   stem: Normalised file name without extension
+FontEntry = namedtuple("FontEntry", ["path", "family", "style", "stem"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve a font name to a font file")
+    parser.add_argument("font_name", help="Font family name, e.g. 'Arial'")
+    parser.add_argument("--bold", action="store_true", help="Prefer a bold face")
+    parser.add_argument("--italic", action="store_true", help="Prefer an italic face")
+    parser.add_argument(
+        "--index",
+        metavar="FILE",
+        help=f"Persist the font index in FILE (default: ${INDEX_ENV}, or the "
+        "user cache directory)",
+    )
+    args = parser.parse_args()
+
+    if args.index:
+        configure(args.index)
+    path = find_font(args.font_name, bold=args.bold, italic=args.italic)
+    if path is None:
+        print(f"No font found for {args.font_name}")
+        sys.exit(1)
+    print(path)
+
+
+def default_font_dirs() -> Tuple[List[str], List[str]]:
+    """Return the font directories and font file extensions of this platform."""
+    if platform.system() == "Darwin":  # macOS
+        font_dirs = [
+            "/System/Library/Fonts/",
+            "/Library/Fonts/",
+            "~/Library/Fonts/",
+        ]
+        extensions = [".ttf", ".otf", ".ttc", ".dfont"]
+    else:  # Linux
+        font_dirs = [
+            "/usr/share/fonts/truetype/",
+            "/usr/local/share/fonts/",
+            "~/.fonts/",
+        ]
+        extensions = [".ttf", ".otf"]
+    return font_dirs, extensions
+
+
+def default_index_path() -> Optional[str]:
+    """Return the file the font index is persisted in by default, or None.
+
+    This is $PPTX_FONT_INDEX if set, and otherwise a file in the user's cache
+    directory ($XDG_CACHE_HOME or ~/.cache, ~/Library/Caches on macOS).
+    """
+    if INDEX_ENV in os.environ:
+        return os.environ[INDEX_ENV] or None
+    if platform.system() == "Darwin":
+        cache_dir = os.path.expanduser("~/Library/Caches")
+    else:
+        cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(
+            "~/.cache"
+        )
+    return os.path.join(cache_dir, INDEX_CACHE_NAME)
+
+
+def normalize_name(name: str) -> str:
+    """Return a font or style name lowercased, without spaces, hyphens or underscores."""
+    return "".join(c for c in name.lower() if c not in " -_")
+
+
+class FontRegistry:
+    """Index of the font files in a list of directories, built once."""
+
+    def __init__(
+        self,
+        font_dirs: Optional[List[str]] = None,
+        extensions: Optional[List[str]] = None,
+        index_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            font_dirs: Directories to scan, in order of preference (default:
+                the platform's font directories)
+            extensions: Font file extensions to index
+            index_path: Optional JSON file to load the index from and save it to
+        """
+        default_dirs, default_extensions = default_font_dirs()
+        self.font_dirs = [
+            Path(d).expanduser() for d in (font_dirs or default_dirs)
+        ]
+        self.extensions = [e.lower() for e in (extensions or default_extensions)]
+        self.index_path = Path(index_path) if index_path else None
+        self._entries: Optional[List[FontEntry]] = None
+        # Resolved lookups: (name, bold, italic) -> path or None
+        self._matches: Dict[Tuple[str, bool, bool], Optional[str]] = {}
+
+    @property
+    def entries(self) -> List[FontEntry]:
+        """Indexed fonts, in directory order, loading or building the index on first use."""
+        if self._entries is None:
+            index = self._load_index()
+            self._entries = self._current_entries(index)
+            if self._entries is None:
+                self._entries, signatures, directories = self._scan(
+                    self._indexed_files(index)
+                )
+                self._save_index(signatures, directories)
+        return self._entries
+
+    def find(
+        self, font_name: str, bold: bool = False, italic: bool = False
+    ) -> Optional[str]:
+        """Return the path of the font file best matching a name and style.
+
+        Fonts whose family is the name come first, the face closest to the
+        requested style winning. Failing that, a file named like the font
+        (e.g. 'Arial.ttf' or 'arial-bold.otf') is used, and finally any file
+        whose name contains the font name.
+
+        Args:
+            font_name: Name of the font (e.g., 'Arial', 'Calibri')
+            bold: Whether a bold face is wanted
+            italic: Whether an italic face is wanted
+
+        Returns:
+            Path to the font file, or None if not found
+        """
+        key = (normalize_name(font_name), bool(bold), bool(italic))
+        if key not in self._matches:
+            self._matches[key] = self._match(*key)
+        return self._matches[key]
+
+    def _match(self, name: str, bold: bool, italic: bool) -> Optional[str]:
+        if not name:
+            return None
+        entries = self.entries
+
+        family = [e for e in entries if e.family == name]
+        if family:
+            return min(family, key=lambda e: _style_distance(e.style, bold, italic)).path
+
+        # Entries keep directory order, so min() prefers earlier directories
+        named = [e for e in entries if e.stem == name or e.stem.startswith(name)]
+        if named:
+            return min(
+                named,
+                key=lambda e: (
+                    e.stem != name,
+                    _style_distance(e.stem[len(name) :], bold, italic),
+                ),
+            ).path
+
+        for entry in entries:
+            if name in entry.stem:
+                return entry.path
+        return None
+
+    def _scan(
+        self, known: Optional[Dict[str, Tuple[List[int], FontEntry]]] = None
+    ) -> Tuple[List[FontEntry], List[List[int]], Dict[str, int]]:
+        """Index every font file under font_dirs.
+
+        Args:
+            known: Entries of an earlier index by path, with the signature
+                (mtime_ns, size) of the file they were read from; files with
+                the same signature are not read again
+
+        Returns:
+            tuple: (entries, signature of each entry's file, mtime_ns of each
+                scanned directory)
+        """
+        known = known or {}
+        entries = []
+        signatures = []
+        directories = {}
+        for font_dir in self.font_dirs:
+            for directory, subdirs, files in os.walk(font_dir):
+                subdirs.sort()
+                try:
+                    directories[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    continue
+                for file_name in sorted(files):
+                    path = os.path.join(directory, file_name)
+                    stem, ext = os.path.splitext(file_name)
+                    if ext.lower() not in self.extensions:
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    signature = [stat.st_mtime_ns, stat.st_size]
+                    previous = known.get(path)
+                    if previous is not None and previous[0] == signature:
+                        entries.append(previous[1])
+                    else:
+                        entries.append(_read_entry(path, stem))
+                    signatures.append(signature)
+        return entries, signatures, directories
+
+    def _load_index(self) -> Optional[dict]:
+        """Return the persisted index, or None if missing or of another version."""
+        if self.index_path is None:
+            return None
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    def _current_entries(self, index: Optional[dict]) -> Optional[List[FontEntry]]:
+        """Return the entries of a persisted index, or None if it is out of date.
+
+        An index is current if it was built for these font directories and
+        none of the directories it scanned changed since.
+        """
+        if index is None:
+            return None
+        try:
+            if index["font_dirs"] != [
+                str(d) for d in self.font_dirs
+            ] or index["extensions"] != self.extensions:
+                return None
+            for directory, mtime_ns in index["directories"].items():
+                if os.stat(directory).st_mtime_ns != mtime_ns:
+                    return None
+            # A font directory created since the index was built
+            if any(
+                d.is_dir() and str(d) not in index["directories"]
+                for d in self.font_dirs
+            ):
+                return None
+            return [FontEntry(*entry) for entry in index["entries"]]
+        except (OSError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _indexed_files(
+        index: Optional[dict],
+    ) -> Dict[str, Tuple[List[int], FontEntry]]:
+        """Return the entries of a persisted index by path, with their file signatures."""
+        if index is None:
+            return {}
+        try:
+            return {
+                entry[0]: (signature, FontEntry(*entry))
+                for entry, signature in zip(index["entries"], index["signatures"])
+            }
+        except (KeyError, TypeError, IndexError):
+            return {}
+
+    def _save_index(
+        self, signatures: List[List[int]], directories: Dict[str, int]
+    ) -> None:
+        """Persist the index; failing to write it never fails font lookup."""
+        if self.index_path is None:
+            return
+        index = {
+            "version": INDEX_VERSION,
+            "font_dirs": [str(d) for d in self.font_dirs],
+            "extensions": self.extensions,
+            "directories": directories,
+            "entries": [list(entry) for entry in self._entries],
+            "signatures": signatures,
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(temp_name, self.index_path)
+        except OSError:
+            pass
+
+
+def _read_entry(path: str, stem: str) -> FontEntry:
+    """Index a font file by the family and style in its name table."""
+    try:
+        family, style = ImageFont.truetype(path, size=12).getname()
+    except Exception:
+        # Unreadable faces are still found by file name
+        family, style = None, None
+    return FontEntry(
+        path,
+        normalize_name(family or ""),
+        normalize_name(style or ""),
+        normalize_name(stem),
+    )
+
+
+def _style_distance(style: str, bold: bool, italic: bool) -> Tuple[int, int]:
+    """Rank a style for a requested weight and slant; lower is closer."""
+    is_bold = "bold" in style or "black" in style or "heavy" in style
+    is_italic = "italic" in style or "oblique" in style
+    mismatches = (is_bold != bold) + (is_italic != italic)
+    if not style or style in PLAIN_STYLES:
+        extra = 0
+    else:
+        # Prefer 'bold' to 'semibold' or 'boldcondensed' when asked for bold
+        plain = style.replace("bold", "").replace("italic", "").replace("oblique", "")
+        extra = 1 + len(plain)
+    return mismatches, extra
+
+
+_registry: Optional[FontRegistry] = None
+
+
+def configure(index_path: Optional[str] = None) -> FontRegistry:
+    """Replace the process-wide registry, persisting its index in index_path if given."""
+    global _registry
+    _registry = FontRegistry(index_path=index_path)
+    return _registry
+
+
+def registry() -> FontRegistry:
+    """Return the process-wide registry, created on first use."""
+    if _registry is None:
+        configure(default_index_path())
+    return _registry
+
+
+def find_font(
+    font_name: str, bold: bool = False, italic: bool = False
+) -> Optional[str]:
+    """Return the path of the system font best matching a name and style, or None."""
+    return registry().find(font_name, bold=bold, italic=italic)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: Optional[str], size: int) -> ImageFont.ImageFont:
+    """Return a font loaded at a size, shared by every caller asking for it.
+
+    Falls back to PIL's default font when path is None or cannot be loaded.
+    """
+    if path:
+        try:
+            return ImageFont.truetype(path, size=size)
+        except Exception:
+            pass
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def text_metrics(path: Optional[str], size: int) -> "TextMetrics":
+    """Return the TextMetrics of the font load_font(path, size) returns."""
+    return TextMetrics(load_font(path, size))
+
+
+class TextMetrics:
+    """Memoised advance widths of text in one font, for measuring and wrapping.
+
+    The width of a line of words is the sum of the widths of its words, each
+    with its leading space, plus the kerning between the last glyph of each
+    word and the space after it. With FreeType's basic layout, whose kerning
+    is pairwise, this equals measuring the joined line.
+    """
+
+    def __init__(self, font: ImageFont.ImageFont):
+        self.font = font
+        self._widths: Dict[str, float] = {}
+        # Kerning between a glyph and a following space, by glyph
+        self._space_kerning: Dict[str, float] = {}
+
+    def width(self, text: str) -> float:
+        """Return the advance width of text, in pixels, memoised."""
+        width = self._widths.get(text)
+        if width is None:
+            if len(self._widths) >= WORD_CACHE_SIZE:
+                self._widths.clear()
+            width = self._widths[text] = self.font.getlength(text)
+        return width
+
+    def wrap(self, line: str, max_width: float) -> List[str]:
+        """Wrap a line at spaces into lines at most max_width wide.
+
+        Lines are filled greedily; a word wider than max_width gets a line of
+        its own. Each line end is found by binary search over the running
+        widths of the line's words.
+        """
+        if not line:
+            return [""]
+
+        # offsets[j] - offsets[i]: width added to a line ending in words[i]
+        # by words[i + 1] to words[j], each following a space
+        words = line.split(" ")
+        offsets = [0.0]
+        monotonic = True
+        for previous, word in zip(words, words[1:]):
+            step = self.width(" " + word) + self._kerning(previous[-1:] or " ")
+            monotonic = monotonic and step >= 0
+            offsets.append(offsets[-1] + step)
+
+        # Leading spaces have no glyph to kern with, so such lines are measured
+        if words[0]:
+            line_width = self.width(words[0]) + offsets[-1]
+        else:
+            line_width = self.font.getlength(line)
+        if line_width <= max_width:
+            return [line]
+
+        wrapped = []
+        i = 0
+        while i < len(words):
+            # Empty words only add spaces between words, never start a line
+            if not words[i]:
+                i += 1
+                continue
+            limit = max_width - self.width(words[i]) + offsets[i]
+            if monotonic:
+                end = bisect.bisect_right(offsets, limit, i + 1)
+            else:
+                end = i + 1
+                while end < len(words) and offsets[end] <= limit:
+                    end += 1
+            wrapped.append(" ".join(words[i:end]))
+            i = end
+        return wrapped
+
+    def _kerning(self, glyph: str) -> float:
+        """Return the kerning between a glyph and a following space."""
+        kerning = self._space_kerning.get(glyph)
+        if kerning is None:
+            kerning = self._space_kerning[glyph] = (
+                self.font.getlength(glyph + " ")
+                - self.width(glyph)
+                - self.width(" ")
+            )
+        return kerning
+
+
+if __name__ == "__main__":
+    main()
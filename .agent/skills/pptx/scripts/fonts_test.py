@@ -0,0 +1,165 @@
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import ImageFont
+
+import fonts
+from fonts import FontRegistry, TextMetrics, default_index_path
+
+
+def reference_wrap(font, line, max_width):
+    """Greedy wrap measuring every candidate line, as inventory.py used to."""
+    if not line:
+        return [""]
+    if font.getlength(line) <= max_width:
+        return [line]
+    wrapped = []
+    current_line = ""
+    for word in line.split(" "):
+        test_line = current_line + (" " if current_line else "") + word
+        if font.getlength(test_line) <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                wrapped.append(current_line)
+            current_line = word
+    if current_line:
+        wrapped.append(current_line)
+    return wrapped
+
+
+class TestFontRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.font_dir = self.root / "fonts"
+        (self.font_dir / "sub").mkdir(parents=True)
+        # Not real fonts: unreadable faces are indexed by file name
+        for name in (
+            "Arial.ttf",
+            "Mono-Bold.ttf",
+            "Mono-Italic.ttf",
+            "Other.otf",
+            "sub/Deep.ttf",
+            "notes.txt",
+        ):
+            (self.font_dir / name).write_bytes(b"not a font")
+        self.index_path = self.root / "cache" / "font-index.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def registry(self):
+        return FontRegistry([str(self.font_dir)], [".ttf", ".otf"], str(self.index_path))
+
+    def count_reads(self, registry):
+        with mock.patch.object(fonts, "_read_entry", wraps=fonts._read_entry) as read:
+            registry.entries
+        return read.call_count
+
+    def test_find_by_file_name(self):
+        registry = self.registry()
+        self.assertEqual(registry.find("Arial"), str(self.font_dir / "Arial.ttf"))
+        self.assertEqual(
+            registry.find("Mono", bold=True), str(self.font_dir / "Mono-Bold.ttf")
+        )
+        self.assertEqual(
+            registry.find("Mono", italic=True), str(self.font_dir / "Mono-Italic.ttf")
+        )
+        self.assertEqual(registry.find("deep"), str(self.font_dir / "sub" / "Deep.ttf"))
+        self.assertIsNone(registry.find("Missing"))
+        self.assertIsNone(registry.find("notes"))
+
+    def test_index_is_persisted(self):
+        first = self.registry()
+        self.assertEqual(self.count_reads(first), 5)
+        self.assertTrue(self.index_path.exists())
+
+        second = self.registry()
+        self.assertEqual(self.count_reads(second), 0)
+        self.assertEqual(second.entries, first.entries)
+
+    def test_changed_directory_reads_new_files_only(self):
+        self.count_reads(self.registry())
+        (self.font_dir / "New.ttf").write_bytes(b"not a font either")
+        # Make the change visible on filesystems with coarse mtimes
+        stat = os.stat(self.font_dir)
+        os.utime(self.font_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        registry = self.registry()
+        self.assertEqual(self.count_reads(registry), 1)
+        self.assertEqual(registry.find("New"), str(self.font_dir / "New.ttf"))
+        self.assertEqual(self.count_reads(self.registry()), 0)
+
+    def test_unreadable_index_is_rebuilt(self):
+        self.index_path.parent.mkdir()
+        self.index_path.write_text("{not json", encoding="utf-8")
+        registry = self.registry()
+        self.assertEqual(self.count_reads(registry), 5)
+        self.assertEqual(registry.find("Other"), str(self.font_dir / "Other.otf"))
+
+    def test_default_index_path(self):
+        with mock.patch.dict(os.environ, {fonts.INDEX_ENV: "/tmp/index.json"}):
+            self.assertEqual(default_index_path(), "/tmp/index.json")
+        with mock.patch.dict(os.environ, {fonts.INDEX_ENV: ""}):
+            self.assertIsNone(default_index_path())
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(self.root)}):
+            os.environ.pop(fonts.INDEX_ENV, None)
+            with mock.patch.object(fonts.platform, "system", return_value="Linux"):
+                self.assertEqual(
+                    default_index_path(), str(self.root / fonts.INDEX_CACHE_NAME)
+                )
+
+
+class TestTextMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # PIL's bundled FreeType font, so the tests need no system fonts
+        cls.font = ImageFont.load_default(size=14)
+
+    def test_width_is_memoised(self):
+        metrics = TextMetrics(self.font)
+        self.assertEqual(metrics.width("Hello world"), self.font.getlength("Hello world"))
+        with mock.patch.object(self.font, "getlength") as getlength:
+            metrics.width("Hello world")
+        getlength.assert_not_called()
+
+    def test_wrap_matches_measuring_every_line(self):
+        metrics = TextMetrics(self.font)
+        rng = random.Random(5)
+        vocabulary = [
+            "a", "I", "of", "the", "AV", "Wolf", "kerning", "typography",
+            "Tr", "y.", "T,", "overflowing", "internationalisation", "", "",
+        ]
+        for trial in range(300):
+            words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 25))]
+            line = " ".join(words)
+            max_width = rng.choice([0, 5, 30, 80, 150, 400, 2000])
+            with self.subTest(line=line, max_width=max_width):
+                self.assertEqual(
+                    metrics.wrap(line, max_width),
+                    reference_wrap(self.font, line, max_width),
+                )
+
+    def test_wrap_edge_cases(self):
+        metrics = TextMetrics(self.font)
+        self.assertEqual(metrics.wrap("", 100), [""])
+        self.assertEqual(metrics.wrap("short", 1000), ["short"])
+        # A word wider than the line gets a line of its own
+        self.assertEqual(
+            metrics.wrap("a internationalisation b", 20),
+            ["a", "internationalisation", "b"],
+        )
+        for line in ("  leading spaces here", "trailing spaces  ", "a  b   c"):
+            with self.subTest(line=line):
+                self.assertEqual(
+                    metrics.wrap(line, 40), reference_wrap(self.font, line, 40)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,16 +24,22 @@ Usage:
 
 import argparse
 import json
-import platform
 import sys
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+# The sweep-line overlap search is shared with the pdf skill's scripts
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "pdf" / "scripts"))
+
+from fonts import configure as configure_fonts
+from fonts import TextMetrics, find_font, text_metrics
 from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
+from pptx.text.text import Font
+from rect_sweep import find_intersection_candidates
 
 # Type aliases for cleaner signatures
 JsonValue = Union[str, int, float, bool, None]
@@ -76,8 +82,17 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--font-index",
+        metavar="FILE",
+        help="Persist the index of system fonts in FILE, so later runs skip "
+        "scanning font directories (default: $PPTX_FONT_INDEX, or the user "
+        "cache directory)",
+    )
 
     args = parser.parse_args()
+    if args.font_index:
+        configure_fonts(args.font_index)
 
     input_path = Path(args.input)
     if not input_path.exists():
@@ -135,15 +150,45 @@ class ShapeWithPosition:
 
 
 class ParagraphData:
-    """Data structure for paragraph properties extracted from a PowerPoint paragraph."""
+    """Data structure for paragraph properties extracted from a PowerPoint paragraph.
+
+    Extracted once per paragraph by ShapeData and shared by all its consumers,
+    so instances are kept compact with __slots__.
+    """
 
-    def __init__(self, paragraph: Any):
+    __slots__ = (
+        "text",
+        "index",
+        "lines",
+        "bullet",
+        "level",
+        "alignment",
+        "space_before",
+        "space_after",
+        "font_name",
+        "font_size",
+        "bold",
+        "italic",
+        "underline",
+        "color",
+        "theme_color",
+        "line_spacing",
+    )
+
+    def __init__(self, paragraph: Any, index: int = 0, text: Optional[str] = None):
         """Initialize from a PowerPoint paragraph object.
 
         Args:
             paragraph: The PowerPoint paragraph object
+            index: Position of the paragraph in its text frame
+            text: The paragraph's text, if already read
         """
-        self.text: str = paragraph.text.strip()
+        if text is None:
+            text = paragraph.text
+        self.text: str = text.strip()
+        # Position and unstripped lines, for estimating the paragraph's height
+        self.index: int = index
+        self.lines: List[str] = text.split("\n")
         self.bullet: bool = False
         self.level: Optional[int] = None
         self.alignment: Optional[str] = None
@@ -174,15 +219,18 @@ class ParagraphData:
                 if hasattr(paragraph, "level"):
                     self.level = paragraph.level
 
-        # Add alignment if not LEFT (default)
-        if hasattr(paragraph, "alignment") and paragraph.alignment is not None:
+        # Add alignment if not LEFT (default), read from pPr directly because
+        # paragraph.alignment adds an empty pPr when there is none
+        pPr = paragraph._p.pPr if hasattr(paragraph, "_p") else None
+        alignment = pPr.algn if pPr is not None else None
+        if alignment is not None:
             alignment_map = {
                 PP_ALIGN.CENTER: "CENTER",
                 PP_ALIGN.RIGHT: "RIGHT",
                 PP_ALIGN.JUSTIFY: "JUSTIFY",
             }
-            if paragraph.alignment in alignment_map:
-                self.alignment = alignment_map[paragraph.alignment]
+            if alignment in alignment_map:
+                self.alignment = alignment_map[alignment]
 
         # Add spacing properties if set
         if hasattr(paragraph, "space_before") and paragraph.space_before:
@@ -190,11 +238,13 @@ class ParagraphData:
         if hasattr(paragraph, "space_after") and paragraph.space_after:
             self.space_after = paragraph.space_after.pt
 
-        # Extract font properties from first run
+        # Extract font properties from first run. Its rPr is read directly and
+        # only when present, as run.font adds one, so reading never changes
+        # the presentation.
         if paragraph.runs:
-            first_run = paragraph.runs[0]
-            if hasattr(first_run, "font"):
-                font = first_run.font
+            rPr = paragraph.runs[0]._r.rPr
+            if rPr is not None:
+                font = Font(rPr)
                 if font.name:
                     self.font_name = font.name
                 if font.size:
@@ -206,18 +256,22 @@ class ParagraphData:
                 if font.underline is not None:
                     self.underline = font.underline
 
-                # Handle color - both RGB and theme colors
-                try:
-                    # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
-                except (AttributeError, TypeError):
-                    # Fall back to theme color
+                # Handle color - both RGB and theme colors. font.color would
+                # replace any other fill with an empty solid fill; only solid
+                # fills have a color.
+                if font.fill.type == MSO_FILL.SOLID:
+                    color = font.fill.fore_color
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
+                        # Try RGB color first
+                        if color.rgb:
+                            self.color = str(color.rgb)
                     except (AttributeError, TypeError):
-                        pass
+                        # Fall back to theme color
+                        try:
+                            if color.theme_color:
+                                self.theme_color = color.theme_color.name
+                        except (AttributeError, TypeError):
+                            pass
 
         # Add line spacing if set
         if hasattr(paragraph, "line_spacing") and paragraph.line_spacing is not None:
@@ -228,6 +282,20 @@ class ParagraphData:
                 font_size = self.font_size if self.font_size else 12.0
                 self.line_spacing = round(paragraph.line_spacing * font_size, 2)
 
+    def measure_key(self) -> Tuple[Any, ...]:
+        """Return the properties the paragraph's estimated height depends on."""
+        return (
+            self.index,
+            tuple(self.lines),
+            self.font_name,
+            self.font_size,
+            self.bold,
+            self.italic,
+            self.space_before,
+            self.space_after,
+            self.line_spacing,
+        )
+
     def to_dict(self) -> ParagraphDict:
         """Convert to dictionary for JSON serialization, excluding None values."""
         result: ParagraphDict = {"text": self.text}
@@ -277,70 +345,23 @@ class ShapeData:
         return int(inches * dpi)
 
     @staticmethod
-    def get_font_path(font_name: str) -> Optional[str]:
+    def get_font_path(
+        font_name: str, bold: bool = False, italic: bool = False
+    ) -> Optional[str]:
         """Get the font file path for a given font name.
 
+        Fonts are resolved against the process-wide font index, which scans
+        the system font directories once and is persisted (see fonts.py).
+
         Args:
             font_name: Name of the font (e.g., 'Arial', 'Calibri')
+            bold: Whether a bold face is wanted
+            italic: Whether an italic face is wanted
 
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return find_font(font_name, bold=bold, italic=italic)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -391,6 +412,7 @@ class ShapeData:
         absolute_left: Optional[int] = None,
         absolute_top: Optional[int] = None,
         slide: Optional[Any] = None,
+        previous: Optional["ShapeData"] = None,
     ):
         """Initialize from a PowerPoint shape object.
 
@@ -399,6 +421,8 @@ class ShapeData:
             absolute_left: Absolute left position in EMUs (for shapes in groups)
             absolute_top: Absolute top position in EMUs (for shapes in groups)
             slide: Optional slide object to get dimensions and layout information
+            previous: Optional earlier ShapeData of the same shape, whose frame
+                overflow estimate is reused if nothing it depends on changed
         """
         self.shape = shape  # Store reference to original shape
         self.shape_id: str = ""  # Will be set after sorting
@@ -455,26 +479,37 @@ class ShapeData:
 
         # Calculate overflow status
         self.frame_overflow_bottom: Optional[float] = None
+        # Inputs of the frame overflow estimate, for reusing it later
+        self._overflow_key: Optional[Tuple[Any, ...]] = None
         self.slide_overflow_right: Optional[float] = None
         self.slide_overflow_bottom: Optional[float] = None
         self.overlapping_shapes: Dict[
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
         self.warnings: List[str] = []
-        self._estimate_frame_overflow()
+
+        # Paragraphs with text, extracted once for every consumer
+        self._paragraphs: List[ParagraphData] = self._extract_paragraphs()
+
+        self._estimate_frame_overflow(previous)
         self._calculate_slide_overflow()
         self._detect_bullet_issues()
 
     @property
     def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
+        """Paragraphs with text in the shape's text frame, as extracted at creation."""
+        return self._paragraphs
+
+    def _extract_paragraphs(self) -> List[ParagraphData]:
+        """Extract the paragraphs with text from the shape's text frame."""
         if not self.shape or not hasattr(self.shape, "text_frame"):
             return []
 
         paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
+        for index, paragraph in enumerate(self.shape.text_frame.paragraphs):  # type: ignore
+            text = paragraph.text
+            if text.strip():
+                paragraphs.append(ParagraphData(paragraph, index, text))
         return paragraphs
 
     def _get_default_font_size(self) -> int:
@@ -531,36 +566,18 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
+    def _wrap_text_line(
+        self, line: str, max_width_px: int, metrics: TextMetrics
+    ) -> List[str]:
         """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
-
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
+        return metrics.wrap(line, max_width_px)
 
-        if current_line:
-            wrapped.append(current_line)
+    def _estimate_frame_overflow(self, previous: Optional["ShapeData"] = None) -> None:
+        """Estimate if text overflows the shape bounds using PIL text measurement.
 
-        return wrapped
-
-    def _estimate_frame_overflow(self) -> None:
-        """Estimate if text overflows the shape bounds using PIL text measurement."""
+        The estimate of previous is taken over instead when it was made for
+        the same usable area, default font size and paragraphs.
+        """
         if not self.shape or not hasattr(self.shape, "text_frame"):
             return
 
@@ -573,40 +590,36 @@ class ShapeData:
         if usable_width_px <= 0 or usable_height_px <= 0:
             return
 
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
 
+        self._overflow_key = (
+            usable_width_px,
+            usable_height_px,
+            default_font_size,
+            tuple(para_data.measure_key() for para_data in self._paragraphs),
+        )
+        if previous is not None and previous._overflow_key == self._overflow_key:
+            self.frame_overflow_bottom = previous.frame_overflow_bottom
+            return
+
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
-
+        for para_data in self._paragraphs:
             # Load font for this paragraph
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            font_path = self.get_font_path(
+                font_name, bold=bool(para_data.bold), italic=bool(para_data.italic)
+            )
+            metrics = text_metrics(font_path, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
-            for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+            for line in para_data.lines:
+                wrapped = self._wrap_text_line(line, usable_width_px, metrics)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -619,7 +632,7 @@ class ShapeData:
                     line_height_px = font_size * 96 / 72
 
                 # Add space_before (except first paragraph)
-                if para_idx > 0 and para_data.space_before:
+                if para_data.index > 0 and para_data.space_before:
                     total_height_px += para_data.space_before * 96 / 72
 
                 # Add paragraph text height
@@ -662,15 +675,11 @@ class ShapeData:
         if not self.shape or not hasattr(self.shape, "text_frame"):
             return
 
-        text_frame = self.shape.text_frame  # type: ignore
-        if not text_frame or not text_frame.paragraphs:
-            return
-
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
 
-        for paragraph in text_frame.paragraphs:
-            text = paragraph.text.strip()
+        for para_data in self._paragraphs:
+            text = para_data.text
             # Check for manual bullet symbols
             if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
                 self.warnings.append(
@@ -741,8 +750,11 @@ class ShapeData:
 
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
-    # Must have a text frame with content
-    if not hasattr(shape, "text_frame") or not shape.text_frame:  # type: ignore
+    # Must have a text frame with content; shape.text_frame would add an empty
+    # one to a shape without text
+    if not getattr(shape, "has_text_frame", False):
+        return False
+    if getattr(shape.element, "txBody", None) is None:
         return False
 
     text = shape.text_frame.text.strip()  # type: ignore
@@ -884,42 +896,49 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
 
     This function requires each ShapeData to have its shape_id already set.
     It modifies the shapes in-place, adding shape IDs with overlap areas in square inches.
+    Only pairs found by rect_sweep.find_intersection_candidates are measured.
 
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    rects = [(shape.left, shape.top, shape.width, shape.height) for shape in shapes]
+    boxes = [(left, top, left + w, top + h) for left, top, w, h in rects]
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
+    # Overlapping shapes of each shape, by index, with the overlap area
+    found: List[List[Tuple[int, float]]] = [[] for _ in shapes]
+    for i, j in find_intersection_candidates(boxes, tolerance=0.05):
+        overlaps, overlap_area = calculate_overlap(rects[i], rects[j])
+        if overlaps:
+            found[i].append((j, overlap_area))
+            found[j].append((i, overlap_area))
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
-
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    # Add shape IDs with overlap area in square inches, in shape order
+    for shape, overlapping in zip(shapes, found):
+        for k, overlap_area in sorted(overlapping):
+            shape.overlapping_shapes[shapes[k].shape_id] = overlap_area
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    previous: Optional[InventoryData] = None,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
+    Extraction only reads the presentation, so an inventory can be taken of
+    a Presentation that is still being edited and saved afterwards.
+
     Args:
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        previous: Optional earlier inventory of the same Presentation object;
+            text of shapes that did not change since is not measured again
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
@@ -930,6 +949,13 @@ def extract_text_inventory(
         prs = Presentation(str(pptx_path))
     inventory: InventoryData = {}
 
+    # Earlier ShapeData by shape element, which outlives python-pptx's proxies
+    previous_shapes = {
+        shape_data.shape.element: shape_data
+        for shapes in (previous or {}).values()
+        for shape_data in shapes.values()
+    }
+
     for slide_idx, slide in enumerate(prs.slides):
         # Collect all valid shapes from this slide with absolute positions
         shapes_with_positions = []
@@ -946,6 +972,7 @@ def extract_text_inventory(
                 swp.absolute_left,
                 swp.absolute_top,
                 slide,
+                previous_shapes.get(swp.shape.element),
             )
             for swp in shapes_with_positions
         ]
@@ -0,0 +1,83 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+from inventory import calculate_overlap, detect_overlaps
+
+
+def make_shapes(boxes):
+    return [
+        SimpleNamespace(
+            shape_id=f"shape-{i}",
+            left=left,
+            top=top,
+            width=width,
+            height=height,
+            overlapping_shapes={},
+        )
+        for i, (left, top, width, height) in enumerate(boxes)
+    ]
+
+
+def reference_overlaps(shapes):
+    """Compare every pair, as detect_overlaps used to."""
+    overlapping = [{} for _ in shapes]
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            rect1 = (shapes[i].left, shapes[i].top, shapes[i].width, shapes[i].height)
+            rect2 = (shapes[j].left, shapes[j].top, shapes[j].width, shapes[j].height)
+            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+            if overlaps:
+                overlapping[i][shapes[j].shape_id] = overlap_area
+                overlapping[j][shapes[i].shape_id] = overlap_area
+    return overlapping
+
+
+class TestDetectOverlaps(unittest.TestCase):
+    def assert_matches_pairwise(self, boxes):
+        shapes = make_shapes(boxes)
+        detect_overlaps(shapes)
+        expected = reference_overlaps(make_shapes(boxes))
+        # Same entries in the same order, not just equal dicts
+        self.assertEqual(
+            [list(shape.overlapping_shapes.items()) for shape in shapes],
+            [list(overlapping.items()) for overlapping in expected],
+        )
+
+    def test_matches_comparing_every_pair(self):
+        rng = random.Random(23)
+        for trial in range(200):
+            # Dashboard-like grids of boxes in inches, some touching or nearly
+            boxes = []
+            for _ in range(rng.randint(0, 80)):
+                width = rng.choice([0, 0.04, 0.05, 0.3, 1.5, 13.33]) * rng.random()
+                height = rng.choice([0, 0.04, 0.05, 0.3, 1.5, 7.5]) * rng.random()
+                left = round(rng.uniform(0, 13.33), rng.choice([1, 2, 6]))
+                top = round(rng.uniform(0, 7.5), rng.choice([1, 2, 6]))
+                boxes.append((left, top, width, height))
+            with self.subTest(trial=trial):
+                self.assert_matches_pairwise(boxes)
+
+    def test_tolerance_boundary(self):
+        # Overlaps of exactly, just under and just over 0.05"
+        self.assert_matches_pairwise(
+            [
+                (0, 0, 1, 1),
+                (0.95, 0, 1, 1),
+                (0.96, 0.96, 1, 1),
+                (0.94, 0.94, 1, 1),
+                (0, 0, 1, 1),
+                (0.5, 0.5, 0, 0),
+            ]
+        )
+
+    def test_hundreds_of_boxes(self):
+        # A table of cells on a slide, each slightly overlapping its neighbours
+        boxes = [
+            (col * 0.5, row * 0.25, 0.58, 0.33) for row in range(30) for col in range(25)
+        ]
+        self.assert_matches_pairwise(boxes)
+
+
+if __name__ == "__main__":
+    unittest.main()
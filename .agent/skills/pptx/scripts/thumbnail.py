@@ -46,6 +46,10 @@ import sys
 import tempfile
 from pathlib import Path
 
+# soffice_service.py lives with the other OOXML tools of this skill
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+
+import soffice_service
 from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
@@ -56,6 +60,7 @@ CONVERSION_DPI = 100  # DPI for PDF to image conversion
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
+CONVERSION_TIMEOUT = 120  # Seconds a conversion may take in soffice_service.py
 
 # Grid layout constants
 GRID_PADDING = 20  # Padding between thumbnails
@@ -214,22 +219,36 @@ def convert_to_images(pptx_path, temp_dir, dpi):
 
     pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
 
-    # Convert to PDF
+    # Convert to PDF, with a warm LibreOffice if soffice_service.py is running
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
+    reply = soffice_service.submit(
+        {
+            "type": "convert",
+            "input": str(pptx_path.absolute()),
+            "output_dir": str(temp_dir.absolute()),
+            "convert_to": "pdf",
+        },
+        timeout=CONVERSION_TIMEOUT,
     )
-    if result.returncode != 0 or not pdf_path.exists():
+    if reply is None:
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(pptx_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("PDF conversion failed")
+    elif not reply["ok"]:
+        raise RuntimeError(f"PDF conversion failed: {reply['error']}")
+    if not pdf_path.exists():
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
@@ -9,9 +9,14 @@ import sys
 import subprocess
 import os
 import platform
+import socket
+import tempfile
 from pathlib import Path
 from openpyxl import load_workbook
 
+# STARTUP_TIMEOUT of soffice_service.py, the slack a job may wait for an instance
+SERVICE_STARTUP_TIMEOUT = 60
+
 
 def setup_libreoffice_macro():
     """Setup LibreOffice macro for recalculation if not already configured"""
@@ -66,6 +71,13 @@ def recalc(filename, timeout=30):
     
     abs_path = str(Path(filename).absolute())
     
+    # A running soffice_service.py recalculates without starting LibreOffice
+    reply = submit_to_soffice_service({'type': 'recalc', 'input': abs_path}, timeout)
+    if reply is not None:
+        if not reply['ok']:
+            return {'error': reply['error']}
+        return check_errors(filename)
+    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +110,57 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return check_errors(filename)
+
+
+def submit_to_soffice_service(job, timeout):
+    """
+    Run a job on pptx/ooxml/scripts/soffice_service.py if it is running
+    
+    A copy of soffice_service.submit, kept here so that this skill does not
+    depend on the pptx skill being installed; keep the two in step.
+    
+    Returns:
+        The service's reply dict, or None if no service is listening
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = os.environ.get('SOFFICE_SERVICE_SOCKET')
+    if not path and os.environ.get('XDG_RUNTIME_DIR'):
+        path = os.path.join(os.environ['XDG_RUNTIME_DIR'], 'soffice-service.sock')
+    if not path:
+        path = os.path.join(
+            tempfile.gettempdir(), f'soffice-service-{os.getuid()}', 'service.sock')
+    try:
+        owner = os.stat(path).st_uid
+    except OSError:
+        return None
+    if owner != os.getuid():
+        return None  # Not our service: never send it jobs or trust its replies
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            # Jobs wait for a free instance first, so allow some slack
+            sock.settimeout(timeout * 2 + SERVICE_STARTUP_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(json.dumps({**job, 'timeout': timeout}).encode() + b'\n')
+            with sock.makefile('rb') as reply:
+                line = reply.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None  # Stale socket left behind by a service that is gone
+    except OSError as e:
+        return {'ok': False, 'error': f'Conversion service failed: {e}'}
+    if not line:
+        return {'ok': False, 'error': 'Conversion service closed the connection'}
+    return json.loads(line)
+
+
+def check_errors(filename):
+    """
+    Report Excel errors and the formula count of a recalculated file
+    
+    Returns:
+        dict with error locations and counts
+    """
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)